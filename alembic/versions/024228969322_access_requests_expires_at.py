@@ -0,0 +1,49 @@
+"""access_requests: expires_at, CANCELLED/EXPIRED statuses
+
+Revision ID: 024228969322
+Revises: e63e6bb0f4ca
+Create Date: 2026-10-19 15:02:36.118427
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '024228969322'
+down_revision: Union[str, None] = 'e63e6bb0f4ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OPEN_STATUSES = "status IN ('PENDING', 'APPROVED')"
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # New enum labels cannot be used in the transaction that adds them.
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE request_status ADD VALUE IF NOT EXISTS 'CANCELLED'")
+            op.execute("ALTER TYPE request_status ADD VALUE IF NOT EXISTS 'EXPIRED'")
+
+    op.add_column('access_requests', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('access_requests_archive', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_access_requests_expires_at_open',
+        'access_requests',
+        ['expires_at'],
+        unique=False,
+        postgresql_where=sa.text(OPEN_STATUSES),
+        sqlite_where=sa.text(OPEN_STATUSES),
+    )
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum labels; CANCELLED/EXPIRED stay in request_status.
+    op.drop_index('ix_access_requests_expires_at_open', table_name='access_requests')
+    with op.batch_alter_table('access_requests_archive') as batch_op:
+        batch_op.drop_column('expires_at')
+    with op.batch_alter_table('access_requests') as batch_op:
+        batch_op.drop_column('expires_at')
@@ -0,0 +1,235 @@
+"""intern resource/action names into catalog tables
+
+Revision ID: 1218bc3b694b
+Revises: 2ef89ea4075d
+Create Date: 2026-10-19 17:48:30.914265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1218bc3b694b'
+down_revision: Union[str, None] = '2ef89ea4075d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 5000
+
+# table -> primary key column
+NORMALIZED = {"access_requests": "id", "grants": "request_id"}
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE FUNCTION access_requests_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector(
+        'simple',
+        coalesce((SELECT name FROM catalog_resources WHERE id = NEW.resource_id), '') || ' ' ||
+        coalesce((SELECT name FROM catalog_actions WHERE id = NEW.action_id), '') || ' ' ||
+        coalesce(NEW.justification, '')
+    );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SQLITE_FTS_VALUES = (
+    "(SELECT name FROM catalog_resources WHERE id = {row}.resource_id), "
+    "(SELECT name FROM catalog_actions WHERE id = {row}.action_id), "
+    "{row}.justification"
+)
+
+SQLITE_FTS_TRIGGERS = (
+    f"""
+    CREATE TRIGGER access_requests_fts_ai AFTER INSERT ON access_requests BEGIN
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, {SQLITE_FTS_VALUES.format(row="new")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER access_requests_fts_ad AFTER DELETE ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, {SQLITE_FTS_VALUES.format(row="old")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER access_requests_fts_au AFTER UPDATE OF resource_id, action_id, justification ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, {SQLITE_FTS_VALUES.format(row="old")});
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, {SQLITE_FTS_VALUES.format(row="new")});
+    END
+    """,
+)
+
+SQLITE_OLD_FTS = (
+    """
+    CREATE VIRTUAL TABLE access_requests_fts USING fts5(
+        resource, action, justification, content='access_requests', content_rowid='rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER access_requests_fts_ai AFTER INSERT ON access_requests BEGIN
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, new.resource, new.action, new.justification);
+    END
+    """,
+    """
+    CREATE TRIGGER access_requests_fts_ad AFTER DELETE ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, old.resource, old.action, old.justification);
+    END
+    """,
+    """
+    CREATE TRIGGER access_requests_fts_au AFTER UPDATE OF resource, action, justification ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, old.resource, old.action, old.justification);
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, new.resource, new.action, new.justification);
+    END
+    """,
+    "INSERT INTO access_requests_fts (access_requests_fts) VALUES ('rebuild')",
+)
+
+
+def _drop_search(dialect: str) -> None:
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_access_requests_resource_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_access_requests_search_vector")
+        op.execute("DROP TRIGGER IF EXISTS access_requests_search_vector ON access_requests")
+        op.execute("DROP FUNCTION IF EXISTS access_requests_search_vector()")
+        op.execute("ALTER TABLE access_requests DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("access_requests_fts_ai", "access_requests_fts_ad", "access_requests_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS access_requests_fts")
+
+
+def _chunked(statement: str) -> None:
+    """Run an UPDATE ... LIMIT :n style statement until it touches no rows, committing each chunk."""
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while bind.execute(sa.text(statement), {"n": BATCH_SIZE}).rowcount:
+            pass
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    op.create_table('catalog_resources',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('catalog_actions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX ix_catalog_resources_name_trgm ON catalog_resources USING gin (name gin_trgm_ops)")
+
+    for column, catalog in (("resource", "catalog_resources"), ("action", "catalog_actions")):
+        op.execute(
+            f"INSERT INTO {catalog} (name) "
+            f"SELECT {column} FROM access_requests UNION "
+            f"SELECT {column} FROM access_requests_archive UNION "
+            f"SELECT {column} FROM grants"
+        )
+
+    _drop_search(dialect)
+    for table in NORMALIZED:
+        op.add_column(table, sa.Column('resource_id', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('action_id', sa.Integer(), nullable=True))
+    if dialect == "postgresql":
+        # Created before the backfill so the same UPDATE fills search_vector.
+        op.execute("ALTER TABLE access_requests ADD COLUMN search_vector tsvector")
+        op.execute(SEARCH_VECTOR_FUNCTION)
+        op.execute(
+            "CREATE TRIGGER access_requests_search_vector "
+            "BEFORE INSERT OR UPDATE OF resource_id, action_id, justification ON access_requests "
+            "FOR EACH ROW EXECUTE FUNCTION access_requests_search_vector()"
+        )
+
+    for table, pk in NORMALIZED.items():
+        _chunked(
+            f"UPDATE {table} SET "
+            f"resource_id = (SELECT id FROM catalog_resources WHERE name = {table}.resource), "
+            f"action_id = (SELECT id FROM catalog_actions WHERE name = {table}.action) "
+            f"WHERE {pk} IN (SELECT {pk} FROM {table} WHERE resource_id IS NULL LIMIT :n)"
+        )
+
+    op.drop_index('ix_grants_resource_action_user_id', table_name='grants')
+    op.drop_index('ix_grants_user_id_resource_action', table_name='grants')
+    for table in NORMALIZED:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('resource_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column('action_id', existing_type=sa.Integer(), nullable=False)
+            batch_op.create_foreign_key(f'{table}_resource_id_fkey', 'catalog_resources', ['resource_id'], ['id'])
+            batch_op.create_foreign_key(f'{table}_action_id_fkey', 'catalog_actions', ['action_id'], ['id'])
+            batch_op.drop_column('resource')
+            batch_op.drop_column('action')
+    op.create_index('ix_grants_resource_id_action_id_user_id', 'grants', ['resource_id', 'action_id', 'user_id', 'request_id'], unique=False)
+    op.create_index('ix_grants_user_id_resource_id_action_id', 'grants', ['user_id', 'resource_id', 'action_id', 'request_id'], unique=False)
+
+    if dialect == "postgresql":
+        op.execute("CREATE INDEX ix_access_requests_search_vector ON access_requests USING gin (search_vector)")
+    elif dialect == "sqlite":
+        # After the batch rebuild above, which may renumber rowids.
+        op.execute("CREATE VIRTUAL TABLE access_requests_fts USING fts5(resource, action, justification, content='')")
+        for stmt in SQLITE_FTS_TRIGGERS:
+            op.execute(stmt)
+        op.execute(
+            "INSERT INTO access_requests_fts (rowid, resource, action, justification) "
+            f"SELECT rowid, {SQLITE_FTS_VALUES.format(row='access_requests')} FROM access_requests"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    _drop_search(dialect)
+
+    op.drop_index('ix_grants_user_id_resource_id_action_id', table_name='grants')
+    op.drop_index('ix_grants_resource_id_action_id_user_id', table_name='grants')
+    for table in NORMALIZED:
+        op.add_column(table, sa.Column('resource', sa.String(length=255), nullable=True))
+        op.add_column(table, sa.Column('action', sa.String(length=64), nullable=True))
+    for table, pk in NORMALIZED.items():
+        _chunked(
+            f"UPDATE {table} SET "
+            f"resource = (SELECT name FROM catalog_resources WHERE id = {table}.resource_id), "
+            f"action = (SELECT name FROM catalog_actions WHERE id = {table}.action_id) "
+            f"WHERE {pk} IN (SELECT {pk} FROM {table} WHERE resource IS NULL LIMIT :n)"
+        )
+    for table in NORMALIZED:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('resource', existing_type=sa.String(length=255), nullable=False)
+            batch_op.alter_column('action', existing_type=sa.String(length=64), nullable=False)
+            batch_op.drop_constraint(f'{table}_action_id_fkey', type_='foreignkey')
+            batch_op.drop_constraint(f'{table}_resource_id_fkey', type_='foreignkey')
+            batch_op.drop_column('action_id')
+            batch_op.drop_column('resource_id')
+    op.create_index('ix_grants_resource_action_user_id', 'grants', ['resource', 'action', 'user_id', 'request_id'], unique=False)
+    op.create_index('ix_grants_user_id_resource_action', 'grants', ['user_id', 'resource', 'action', 'request_id'], unique=False)
+
+    if dialect == "postgresql":
+        op.execute(
+            "ALTER TABLE access_requests ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "to_tsvector('simple', coalesce(resource, '') || ' ' || coalesce(action, '') || ' ' || coalesce(justification, ''))"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_access_requests_search_vector ON access_requests USING gin (search_vector)")
+        op.execute("CREATE INDEX ix_access_requests_resource_trgm ON access_requests USING gin (resource gin_trgm_ops)")
+    elif dialect == "sqlite":
+        for stmt in SQLITE_OLD_FTS:
+            op.execute(stmt)
+
+    op.drop_table('catalog_actions')
+    op.drop_table('catalog_resources')
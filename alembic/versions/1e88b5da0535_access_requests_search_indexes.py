@@ -0,0 +1,87 @@
+"""access_requests: full-text search and keyset indexes
+
+Revision ID: 1e88b5da0535
+Revises: 976bf6c2256b
+Create Date: 2026-10-19 10:03:17.284410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1e88b5da0535'
+down_revision: Union[str, None] = '976bf6c2256b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+POSTGRES_UPGRADE = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE access_requests ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', coalesce(resource, '') || ' ' || coalesce(action, '') || ' ' || coalesce(justification, ''))
+    ) STORED
+    """,
+    "CREATE INDEX ix_access_requests_search_vector ON access_requests USING gin (search_vector)",
+    "CREATE INDEX ix_access_requests_resource_trgm ON access_requests USING gin (resource gin_trgm_ops)",
+)
+
+SQLITE_UPGRADE = (
+    """
+    CREATE VIRTUAL TABLE access_requests_fts USING fts5(
+        resource, action, justification, content='access_requests', content_rowid='rowid'
+    )
+    """,
+    """
+    CREATE TRIGGER access_requests_fts_ai AFTER INSERT ON access_requests BEGIN
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, new.resource, new.action, new.justification);
+    END
+    """,
+    """
+    CREATE TRIGGER access_requests_fts_ad AFTER DELETE ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, old.resource, old.action, old.justification);
+    END
+    """,
+    """
+    CREATE TRIGGER access_requests_fts_au AFTER UPDATE OF resource, action, justification ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, old.resource, old.action, old.justification);
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, new.resource, new.action, new.justification);
+    END
+    """,
+    "INSERT INTO access_requests_fts (access_requests_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    op.create_index('ix_access_requests_status_created_at_id', 'access_requests', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_access_requests_requester_id_created_at_id', 'access_requests', ['requester_id', 'created_at', 'id'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for stmt in POSTGRES_UPGRADE:
+            op.execute(stmt)
+    elif dialect == "sqlite":
+        for stmt in SQLITE_UPGRADE:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_access_requests_resource_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_access_requests_search_vector")
+        op.execute("ALTER TABLE access_requests DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for trigger in ("access_requests_fts_ai", "access_requests_fts_ad", "access_requests_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS access_requests_fts")
+
+    op.drop_index('ix_access_requests_requester_id_created_at_id', table_name='access_requests')
+    op.drop_index('ix_access_requests_status_created_at_id', table_name='access_requests')
@@ -0,0 +1,64 @@
+"""add access review campaigns, items and decisions
+
+Revision ID: 287c77962968
+Revises: ef046b54dffc
+Create Date: 2026-10-19 21:12:08.340927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '287c77962968'
+down_revision: Union[str, None] = 'ef046b54dffc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('review_campaigns',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('tenant_id', sa.String(length=64), server_default='default', nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('created_by', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('due_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('closed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('generated_through', sa.UUID(), nullable=True),
+    sa.Column('item_count', sa.BigInteger(), nullable=False),
+    sa.Column('certified_count', sa.BigInteger(), nullable=False),
+    sa.Column('revoked_count', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_review_campaigns_tenant_id_created_at', 'review_campaigns', ['tenant_id', 'created_at'], unique=False)
+    op.create_table('review_items',
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('action_id', sa.Integer(), nullable=False),
+    sa.Column('granted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['review_campaigns.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('campaign_id', 'request_id')
+    )
+    op.create_table('review_decisions',
+    sa.Column('campaign_id', sa.Integer(), nullable=False),
+    sa.Column('request_id', sa.UUID(), nullable=False),
+    sa.Column('decision', sa.String(length=16), nullable=False),
+    sa.Column('decided_by', sa.UUID(), nullable=False),
+    sa.Column('decided_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('comment', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id', 'request_id'], ['review_items.campaign_id', 'review_items.request_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('campaign_id', 'request_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('review_decisions')
+    op.drop_table('review_items')
+    op.drop_index('ix_review_campaigns_tenant_id_created_at', table_name='review_campaigns')
+    op.drop_table('review_campaigns')
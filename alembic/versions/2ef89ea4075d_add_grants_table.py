@@ -0,0 +1,61 @@
+"""add grants table, REVOKED status
+
+Revision ID: 2ef89ea4075d
+Revises: 1bd57aac12a1
+Create Date: 2026-10-19 17:04:12.508817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ef89ea4075d'
+down_revision: Union[str, None] = '1bd57aac12a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO grants (request_id, user_id, resource, action, granted_by, granted_at, expires_at)
+SELECT src.id, src.requester_id, src.resource, src.action, src.decided_by, src.decided_at, src.expires_at
+FROM (
+    SELECT id, requester_id, resource, action, decided_by, decided_at, expires_at
+    FROM access_requests WHERE status = 'APPROVED'
+    UNION ALL
+    SELECT id, requester_id, resource, action, decided_by, decided_at, expires_at
+    FROM access_requests_archive WHERE status = 'APPROVED'
+) AS src
+JOIN users ON users.id = src.requester_id
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE request_status ADD VALUE IF NOT EXISTS 'REVOKED'")
+
+    op.create_table('grants',
+    sa.Column('request_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('resource', sa.String(length=255), nullable=False),
+    sa.Column('action', sa.String(length=64), nullable=False),
+    sa.Column('granted_by', sa.UUID(), nullable=True),
+    sa.Column('granted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('request_id')
+    )
+    op.create_index('ix_grants_resource_action_user_id', 'grants', ['resource', 'action', 'user_id', 'request_id'], unique=False)
+    op.create_index('ix_grants_user_id_resource_action', 'grants', ['user_id', 'resource', 'action', 'request_id'], unique=False)
+
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    # Postgres cannot drop enum labels; REVOKED stays in request_status.
+    op.drop_index('ix_grants_user_id_resource_action', table_name='grants')
+    op.drop_index('ix_grants_resource_action_user_id', table_name='grants')
+    op.drop_table('grants')
@@ -0,0 +1,66 @@
+"""add approver groups, routing rules and request assignments
+
+Revision ID: 8cdda8e60c67
+Revises: afa01432ca3e
+Create Date: 2026-10-19 19:05:52.617004
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8cdda8e60c67'
+down_revision: Union[str, None] = 'afa01432ca3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('approver_groups',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('approver_group_members',
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['approver_groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_id', 'user_id')
+    )
+    op.create_index(op.f('ix_approver_group_members_user_id'), 'approver_group_members', ['user_id'], unique=False)
+    op.create_table('routing_rules',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resource_prefix', sa.String(length=255), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['approver_groups.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('resource_prefix')
+    )
+    op.create_table('request_assignments',
+    sa.Column('request_id', sa.UUID(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('claimed_by', sa.UUID(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['approver_groups.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['request_id'], ['access_requests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('request_id')
+    )
+    op.create_index('ix_request_assignments_group_id_status_created_at', 'request_assignments', ['group_id', 'status', 'created_at', 'request_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_request_assignments_group_id_status_created_at', table_name='request_assignments')
+    op.drop_table('request_assignments')
+    op.drop_table('routing_rules')
+    op.drop_index(op.f('ix_approver_group_members_user_id'), table_name='approver_group_members')
+    op.drop_table('approver_group_members')
+    op.drop_table('approver_groups')
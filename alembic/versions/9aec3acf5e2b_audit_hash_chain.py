@@ -0,0 +1,88 @@
+"""audit_events hash chain and Merkle checkpoints
+
+Revision ID: 9aec3acf5e2b
+Revises: 8cdda8e60c67
+Create Date: 2026-10-19 19:52:08.143927
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9aec3acf5e2b'
+down_revision: Union[str, None] = '8cdda8e60c67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UNSEALED = "seq IS NULL"
+
+
+def _drop_actor_fk() -> None:
+    # actor_id is hashed into the chain, so deleting a user must not rewrite it (ON DELETE SET NULL did).
+    # The constraint was created unnamed; find whatever name the database gave it.
+    fks = sa.inspect(op.get_bind()).get_foreign_keys('audit_events')
+    name = next((fk['name'] for fk in fks if fk['constrained_columns'] == ['actor_id']), None)
+    if op.get_bind().dialect.name == 'sqlite':
+        naming = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+        with op.batch_alter_table('audit_events', naming_convention=naming) as batch_op:
+            batch_op.drop_constraint(name or 'fk_audit_events_actor_id_users', type_='foreignkey')
+    else:
+        op.drop_constraint(name, 'audit_events', type_='foreignkey')
+
+
+def upgrade() -> None:
+    _drop_actor_fk()
+    # Existing events start unsealed; the sealer chains them on its first run.
+    for table in ('audit_events', 'audit_events_archive'):
+        op.add_column(table, sa.Column('seq', sa.BigInteger(), nullable=True))
+        op.add_column(table, sa.Column('prev_hash', sa.String(length=64), nullable=True))
+        op.add_column(table, sa.Column('hash', sa.String(length=64), nullable=True))
+    op.create_index('ux_audit_events_seq', 'audit_events', ['seq'], unique=True)
+    op.create_index('ux_audit_events_archive_seq', 'audit_events_archive', ['seq'], unique=True)
+    op.create_index(
+        'ix_audit_events_unsealed',
+        'audit_events',
+        ['created_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text(UNSEALED),
+        sqlite_where=sa.text(UNSEALED),
+    )
+
+    op.create_table('audit_chain_head',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('last_seq', sa.BigInteger(), nullable=False),
+    sa.Column('last_hash', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(f"INSERT INTO audit_chain_head (id, last_seq, last_hash) VALUES (1, 0, '{'0' * 64}')")
+
+    op.create_table('audit_checkpoints',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('first_seq', sa.BigInteger(), nullable=False),
+    sa.Column('last_seq', sa.BigInteger(), nullable=False),
+    sa.Column('root', sa.String(length=64), nullable=False),
+    sa.Column('last_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('last_seq')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('audit_checkpoints')
+    op.drop_table('audit_chain_head')
+    op.drop_index('ix_audit_events_unsealed', table_name='audit_events')
+    op.drop_index('ux_audit_events_archive_seq', table_name='audit_events_archive')
+    op.drop_index('ux_audit_events_seq', table_name='audit_events')
+    for table in ('audit_events_archive', 'audit_events'):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('hash')
+            batch_op.drop_column('prev_hash')
+            batch_op.drop_column('seq')
+    with op.batch_alter_table('audit_events') as batch_op:
+        batch_op.create_foreign_key('fk_audit_events_actor_id_users', 'users', ['actor_id'], ['id'], ondelete='SET NULL')
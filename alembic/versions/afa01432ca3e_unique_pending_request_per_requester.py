@@ -0,0 +1,111 @@
+"""access_requests: at most one PENDING request per requester/resource/action
+
+Revision ID: afa01432ca3e
+Revises: 1218bc3b694b
+Create Date: 2026-10-19 18:26:41.370158
+
+"""
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'afa01432ca3e'
+down_revision: Union[str, None] = '1218bc3b694b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PENDING = "status = 'PENDING'"
+
+# Every PENDING request that has an older PENDING twin.
+DUPLICATES = """
+SELECT r.id, r.requester_id, c.name AS resource, a.name AS action
+FROM access_requests r
+JOIN catalog_resources c ON c.id = r.resource_id
+JOIN catalog_actions a ON a.id = r.action_id
+WHERE r.status = 'PENDING' AND EXISTS (
+    SELECT 1 FROM access_requests o
+    WHERE o.status = 'PENDING'
+      AND o.requester_id = r.requester_id
+      AND o.resource_id = r.resource_id
+      AND o.action_id = r.action_id
+      AND (o.created_at < r.created_at OR (o.created_at = r.created_at AND o.id < r.id))
+)
+"""
+
+MOVE_STATS = """
+INSERT INTO request_stats (resource, status, total) VALUES (:resource, :status, :delta)
+ON CONFLICT (resource, status) DO UPDATE SET total = request_stats.total + excluded.total
+"""
+
+# audit_events as of this revision.
+audit_events = sa.table(
+    "audit_events",
+    sa.column("id", sa.Uuid),
+    sa.column("actor_id", sa.Uuid),
+    sa.column("action", sa.String),
+    sa.column("entity_type", sa.String),
+    sa.column("entity_id", sa.Uuid),
+    sa.column("details", sa.JSON),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # Existing duplicates would block the index: keep the oldest, cancel the rest.
+    duplicates = sa.text(DUPLICATES).columns(id=sa.Uuid, requester_id=sa.Uuid, resource=sa.String, action=sa.String)
+    rows = bind.execute(duplicates).all()
+    per_resource: dict[str, int] = {}
+    for row in rows:
+        per_resource[row.resource] = per_resource.get(row.resource, 0) + 1
+    ids = [row.id for row in rows]
+    for i in range(0, len(ids), 1000):
+        bind.execute(
+            sa.text(
+                "UPDATE access_requests SET status = 'CANCELLED', decided_at = CURRENT_TIMESTAMP WHERE id IN :ids"
+            ).bindparams(sa.bindparam("ids", expanding=True, type_=sa.Uuid)),
+            {"ids": ids[i:i + 1000]},
+        )
+    # Recorded like the expiry scheduler's cancellations: no actor, same details.
+    events = [
+        {
+            "id": uuid.uuid4(),
+            "actor_id": None,
+            "action": "access_request.cancelled",
+            "entity_type": "access_request",
+            "entity_id": row.id,
+            "details": {
+                "requester_id": str(row.requester_id),
+                "resource": row.resource,
+                "action": row.action,
+                "previous_status": "PENDING",
+                "new_status": "CANCELLED",
+                "reason": "duplicate pending request",
+            },
+        }
+        for row in rows
+    ]
+    for i in range(0, len(events), 1000):
+        bind.execute(audit_events.insert(), events[i:i + 1000])
+    for resource, n in per_resource.items():
+        bind.execute(sa.text(MOVE_STATS), {"resource": resource, "status": "PENDING", "delta": -n})
+        bind.execute(sa.text(MOVE_STATS), {"resource": resource, "status": "CANCELLED", "delta": n})
+
+    op.create_index(
+        'ux_access_requests_pending_requester_resource_action',
+        'access_requests',
+        ['requester_id', 'resource_id', 'action_id'],
+        unique=True,
+        postgresql_where=sa.text(PENDING),
+        sqlite_where=sa.text(PENDING),
+    )
+
+
+def downgrade() -> None:
+    # Requests cancelled as duplicates stay cancelled.
+    op.drop_index('ux_access_requests_pending_requester_resource_action', table_name='access_requests')
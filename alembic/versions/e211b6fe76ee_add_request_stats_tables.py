@@ -0,0 +1,79 @@
+"""add request_stats and request_decision_latency tables
+
+Revision ID: e211b6fe76ee
+Revises: 1e88b5da0535
+Create Date: 2026-10-19 11:26:52.917334
+
+"""
+import math
+from datetime import timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e211b6fe76ee'
+down_revision: Union[str, None] = '1e88b5da0535'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _bucket(seconds: float) -> int:
+    # Mirrors app.services.stats_service.latency_bucket at the time of writing.
+    if seconds < 1:
+        return 0
+    return int(math.floor(2 * math.log2(seconds))) + 1
+
+
+def _utc(value):
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def upgrade() -> None:
+    op.create_table('request_stats',
+    sa.Column('resource', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resource', 'status')
+    )
+    op.create_table('request_decision_latency',
+    sa.Column('resource', sa.String(length=255), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resource', 'bucket')
+    )
+
+    # Backfill from existing requests.
+    op.execute(
+        """
+        INSERT INTO request_stats (resource, status, total)
+        SELECT resource, CAST(status AS VARCHAR(16)), COUNT(*)
+        FROM access_requests
+        GROUP BY resource, status
+        """
+    )
+
+    conn = op.get_bind()
+    histogram: dict[tuple[str, int], int] = {}
+    rows = conn.execution_options(stream_results=True, yield_per=10_000).execute(
+        sa.text("SELECT resource, created_at, decided_at FROM access_requests WHERE decided_at IS NOT NULL").columns(
+            sa.column('resource', sa.String()),
+            sa.column('created_at', sa.DateTime(timezone=True)),
+            sa.column('decided_at', sa.DateTime(timezone=True)),
+        )
+    )
+    for resource, created_at, decided_at in rows:
+        seconds = max((_utc(decided_at) - _utc(created_at)).total_seconds(), 0.0)
+        key = (resource, _bucket(seconds))
+        histogram[key] = histogram.get(key, 0) + 1
+
+    if histogram:
+        latency = sa.table('request_decision_latency', sa.column('resource'), sa.column('bucket'), sa.column('total'))
+        op.bulk_insert(latency, [{"resource": r, "bucket": b, "total": n} for (r, b), n in histogram.items()])
+
+
+def downgrade() -> None:
+    op.drop_table('request_decision_latency')
+    op.drop_table('request_stats')
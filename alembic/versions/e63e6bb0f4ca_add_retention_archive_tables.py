@@ -0,0 +1,72 @@
+"""add retention archive tables and scan indexes
+
+Revision ID: e63e6bb0f4ca
+Revises: e211b6fe76ee
+Create Date: 2026-10-19 13:40:08.662190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e63e6bb0f4ca'
+down_revision: Union[str, None] = 'e211b6fe76ee'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('access_requests_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('requester_id', sa.UUID(), nullable=False),
+    sa.Column('resource', sa.String(length=255), nullable=False),
+    sa.Column('action', sa.String(length=64), nullable=False),
+    sa.Column('justification', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('decided_by', sa.UUID(), nullable=True),
+    sa.Column('decided_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_access_requests_archive_requester_id'), 'access_requests_archive', ['requester_id'], unique=False)
+
+    op.create_table('audit_events_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('actor_id', sa.UUID(), nullable=True),
+    sa.Column('action', sa.String(), nullable=False),
+    sa.Column('entity_type', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('details', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_events_archive_entity', 'audit_events_archive', ['entity_type', 'entity_id'], unique=False)
+
+    op.create_table('retention_checkpoints',
+    sa.Column('job', sa.String(length=64), nullable=False),
+    sa.Column('last_ts', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_id', sa.UUID(), nullable=True),
+    sa.Column('rows_moved', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('job')
+    )
+
+    op.create_index('ix_access_requests_decided_at_id', 'access_requests', ['decided_at', 'id'], unique=False)
+    op.create_index('ix_audit_events_created_at_id', 'audit_events', ['created_at', 'id'], unique=False)
+    op.create_index('ix_audit_events_entity', 'audit_events', ['entity_type', 'entity_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_events_entity', table_name='audit_events')
+    op.drop_index('ix_audit_events_created_at_id', table_name='audit_events')
+    op.drop_index('ix_access_requests_decided_at_id', table_name='access_requests')
+    op.drop_table('retention_checkpoints')
+    op.drop_index('ix_audit_events_archive_entity', table_name='audit_events_archive')
+    op.drop_table('audit_events_archive')
+    op.drop_index(op.f('ix_access_requests_archive_requester_id'), table_name='access_requests_archive')
+    op.drop_table('access_requests_archive')
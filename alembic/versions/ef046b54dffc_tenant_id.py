@@ -0,0 +1,158 @@
+"""tenant_id on tenant-owned tables, tenant-led indexes
+
+Revision ID: ef046b54dffc
+Revises: 9aec3acf5e2b
+Create Date: 2026-10-19 20:31:44.502118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ef046b54dffc'
+down_revision: Union[str, None] = '9aec3acf5e2b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Everything that exists today belongs to the default tenant.
+DEFAULT_TENANT = 'default'
+
+TENANT_TABLES = (
+    'users',
+    'access_requests',
+    'access_requests_archive',
+    'audit_events',
+    'audit_events_archive',
+    'grants',
+    'approver_groups',
+    'routing_rules',
+)
+
+# (table, old primary key, new primary key)
+COUNTER_TABLES = (
+    ('request_stats', ['resource', 'status'], ['tenant_id', 'resource', 'status']),
+    ('request_decision_latency', ['resource', 'bucket'], ['tenant_id', 'resource', 'bucket']),
+)
+
+# (table, column) whose single-column UNIQUE constraint becomes unique per tenant.
+UNIQUE_PER_TENANT = (
+    ('approver_groups', 'name'),
+    ('routing_rules', 'resource_prefix'),
+)
+
+PENDING = "status = 'PENDING'"
+
+
+def _tenant_column() -> sa.Column:
+    return sa.Column('tenant_id', sa.String(length=64), server_default=DEFAULT_TENANT, nullable=False)
+
+
+def _replace_primary_key(table: str, columns: list[str]) -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        # SQLite cannot alter a primary key; batch mode copies the table.
+        with op.batch_alter_table(table, recreate='always') as batch_op:
+            batch_op.create_primary_key(f'pk_{table}', columns)
+    else:
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
+        op.create_primary_key(f'{table}_pkey', table, columns)
+
+
+def _drop_unique(table: str, column: str) -> None:
+    # The constraint was created unnamed; find whatever name the database gave it.
+    uniques = sa.inspect(op.get_bind()).get_unique_constraints(table)
+    name = next((uq['name'] for uq in uniques if uq['column_names'] == [column]), None)
+    if op.get_bind().dialect.name == 'sqlite':
+        naming = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+        with op.batch_alter_table(table, naming_convention=naming) as batch_op:
+            batch_op.drop_constraint(name or f'uq_{table}_{column}', type_='unique')
+    else:
+        op.drop_constraint(name, table, type_='unique')
+
+
+def upgrade() -> None:
+    for table in TENANT_TABLES:
+        op.add_column(table, _tenant_column())
+    for table, _, new_key in COUNTER_TABLES:
+        op.add_column(table, _tenant_column())
+        _replace_primary_key(table, new_key)
+
+    op.drop_index('ix_users_email', table_name='users')
+    op.create_index('ux_users_tenant_id_email', 'users', ['tenant_id', 'email'], unique=True)
+
+    op.drop_index('ix_access_requests_status_created_at_id', table_name='access_requests')
+    op.drop_index('ix_access_requests_requester_id_created_at_id', table_name='access_requests')
+    op.drop_index('ux_access_requests_pending_requester_resource_action', table_name='access_requests')
+    op.create_index('ix_access_requests_tenant_id_created_at_id', 'access_requests', ['tenant_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_access_requests_tenant_id_status_created_at_id', 'access_requests', ['tenant_id', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_access_requests_tenant_id_requester_id_created_at_id', 'access_requests', ['tenant_id', 'requester_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ux_access_requests_pending_tenant_id_requester_resource_action',
+        'access_requests',
+        ['tenant_id', 'requester_id', 'resource_id', 'action_id'],
+        unique=True,
+        postgresql_where=sa.text(PENDING),
+        sqlite_where=sa.text(PENDING),
+    )
+
+    op.drop_index('ix_audit_events_entity', table_name='audit_events')
+    op.create_index('ix_audit_events_tenant_id_entity', 'audit_events', ['tenant_id', 'entity_type', 'entity_id'], unique=False)
+    op.drop_index('ix_audit_events_archive_entity', table_name='audit_events_archive')
+    op.create_index('ix_audit_events_archive_tenant_id_entity', 'audit_events_archive', ['tenant_id', 'entity_type', 'entity_id'], unique=False)
+
+    op.drop_index('ix_grants_resource_id_action_id_user_id', table_name='grants')
+    op.drop_index('ix_grants_user_id_resource_id_action_id', table_name='grants')
+    op.create_index('ix_grants_tenant_id_resource_id_action_id_user_id', 'grants', ['tenant_id', 'resource_id', 'action_id', 'user_id', 'request_id'], unique=False)
+    op.create_index('ix_grants_tenant_id_user_id_resource_id_action_id', 'grants', ['tenant_id', 'user_id', 'resource_id', 'action_id', 'request_id'], unique=False)
+
+    for table, column in UNIQUE_PER_TENANT:
+        _drop_unique(table, column)
+        op.create_index(f'ux_{table}_tenant_id_{column}', table, ['tenant_id', column], unique=True)
+
+
+def downgrade() -> None:
+    for table, column in UNIQUE_PER_TENANT:
+        op.drop_index(f'ux_{table}_tenant_id_{column}', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_unique_constraint(f'{table}_{column}_key', [column])
+
+    op.drop_index('ix_grants_tenant_id_user_id_resource_id_action_id', table_name='grants')
+    op.drop_index('ix_grants_tenant_id_resource_id_action_id_user_id', table_name='grants')
+    op.create_index('ix_grants_user_id_resource_id_action_id', 'grants', ['user_id', 'resource_id', 'action_id', 'request_id'], unique=False)
+    op.create_index('ix_grants_resource_id_action_id_user_id', 'grants', ['resource_id', 'action_id', 'user_id', 'request_id'], unique=False)
+
+    op.drop_index('ix_audit_events_archive_tenant_id_entity', table_name='audit_events_archive')
+    op.create_index('ix_audit_events_archive_entity', 'audit_events_archive', ['entity_type', 'entity_id'], unique=False)
+    op.drop_index('ix_audit_events_tenant_id_entity', table_name='audit_events')
+    op.create_index('ix_audit_events_entity', 'audit_events', ['entity_type', 'entity_id'], unique=False)
+
+    op.drop_index('ux_access_requests_pending_tenant_id_requester_resource_action', table_name='access_requests')
+    op.drop_index('ix_access_requests_tenant_id_requester_id_created_at_id', table_name='access_requests')
+    op.drop_index('ix_access_requests_tenant_id_status_created_at_id', table_name='access_requests')
+    op.drop_index('ix_access_requests_tenant_id_created_at_id', table_name='access_requests')
+    op.create_index(
+        'ux_access_requests_pending_requester_resource_action',
+        'access_requests',
+        ['requester_id', 'resource_id', 'action_id'],
+        unique=True,
+        postgresql_where=sa.text(PENDING),
+        sqlite_where=sa.text(PENDING),
+    )
+    op.create_index('ix_access_requests_requester_id_created_at_id', 'access_requests', ['requester_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_access_requests_status_created_at_id', 'access_requests', ['status', 'created_at', 'id'], unique=False)
+
+    op.drop_index('ux_users_tenant_id_email', table_name='users')
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    # Counters of other tenants have nowhere to go in a single-tenant schema.
+    for table, old_key, _ in COUNTER_TABLES:
+        op.execute(sa.text(f"DELETE FROM {table} WHERE tenant_id <> '{DEFAULT_TENANT}'"))
+        _replace_primary_key(table, old_key)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('tenant_id')
+    for table in reversed(TENANT_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('tenant_id')
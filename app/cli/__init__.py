@@ -0,0 +1,19 @@
+"""AccessOps maintenance commands: `python -m app.cli <command> ...`."""
+
+from __future__ import annotations
+
+from typing import Callable, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.db.session import databases, sessions_for
+
+
+def per_database() -> Iterator[tuple[str, Callable[..., Session], str | None]]:
+    """
+    (output prefix, session factory, routing tenant) for every database the
+    deployment uses; the prefix is empty when DATABASE_URL is the only one.
+    """
+    found = databases()
+    for label, tenant in found:
+        yield (f"[{label}] " if len(found) > 1 else ""), sessions_for(tenant), tenant
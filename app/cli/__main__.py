@@ -0,0 +1,24 @@
+"""AccessOps maintenance commands: `python -m app.cli <command> ...`."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from app.cli import audit, expiry, grants, policy, retention, reviews, snapshot
+
+COMMANDS = (retention, expiry, grants, audit, policy, snapshot, reviews)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="accessops")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for module in COMMANDS:
+        module.register(sub)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+from app.cli import per_database
+from app.core.clock import as_utc
+from app.core.config import audit_checkpoint_size
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.session import SessionLocal
+from app.services import audit_chain_service
+
+
+def _seal(args: argparse.Namespace) -> int:
+    while True:
+        # Each database has its own chain.
+        for prefix, sessions, _ in per_database():
+            with sessions() as db:
+                sealed, checkpoints = audit_chain_service.seal(
+                    db, batch_size=args.batch_size, checkpoint_size=args.checkpoint_size
+                )
+            if sealed or checkpoints or not args.every:
+                print(f"{prefix}audit_events: sealed {sealed} events, wrote {checkpoints} checkpoints")
+        if not args.every:
+            return 0
+        time.sleep(args.every)
+
+
+def _verify(args: argparse.Namespace) -> int:
+    since = as_utc(datetime.fromisoformat(args.since)) if args.since else None
+    ok = True
+    for prefix, sessions, tenant in per_database():
+        started = time.monotonic()
+        report = audit_chain_service.verify(sessions, workers=args.workers, since=since, tenant_id=tenant)
+        elapsed = time.monotonic() - started
+
+        for problem in report.problems:
+            print(f"  {prefix}{problem}")
+        state = "OK" if report.ok else f"{len(report.problems)} problems"
+        print(
+            f"{prefix}audit_events: verified {report.events} events in {report.partitions} partitions "
+            f"({elapsed:.2f}s): {state}"
+        )
+        ok = ok and report.ok
+    return 0 if ok else 1
+
+
+def _prove(args: argparse.Namespace) -> int:
+    with SessionLocal(info={"tenant_id": args.tenant}) as db:
+        proof = audit_chain_service.inclusion_proof(db, args.event_id)
+    if proof is None:
+        print("not sealed into a checkpoint yet")
+        return 1
+    if "problem" in proof:
+        print(proof["problem"])
+        return 1
+    print(json.dumps(proof, indent=2))
+    return 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("audit", help="seal and verify the audit hash chain")
+    cmds = p.add_subparsers(dest="audit_command", required=True)
+
+    seal = cmds.add_parser("seal", help="chain new audit events and write Merkle checkpoints")
+    seal.add_argument("--batch-size", type=int, default=1000)
+    seal.add_argument("--checkpoint-size", type=int, default=audit_checkpoint_size())
+    seal.add_argument("--every", type=float, default=None, help="keep running, once every N seconds")
+    seal.set_defaults(func=_seal)
+
+    verify = cmds.add_parser("verify", help="recompute the chain and checkpoint roots")
+    verify.add_argument("--since", default=None, help="only partitions with events at or after this ISO timestamp")
+    verify.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel verifier processes")
+    verify.set_defaults(func=_verify)
+
+    prove = cmds.add_parser("prove", help="print the Merkle inclusion proof for one event")
+    prove.add_argument("event_id", type=uuid.UUID)
+    prove.add_argument("--tenant", default=DEFAULT_TENANT, help="tenant whose database holds the event")
+    prove.set_defaults(func=_prove)
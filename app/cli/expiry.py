@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timedelta
+
+from app.cli import per_database
+from app.services.expiry_service import ExpiryScheduler
+
+
+def _run(args: argparse.Namespace) -> int:
+    schedulers = [
+        (
+            prefix,
+            ExpiryScheduler(
+                session_factory=sessions,
+                batch_size=args.batch_size,
+                horizon=timedelta(seconds=args.horizon),
+                max_sleep=args.max_sleep,
+            ),
+        )
+        for prefix, sessions, _ in per_database()
+    ]
+    if args.once:
+        for prefix, scheduler in schedulers:
+            print(f"{prefix}expired or cancelled {scheduler.tick()} requests")
+        return 0
+    # ExpiryScheduler.run_forever across databases: sleep until the earliest deadline of any.
+    while True:
+        for _, scheduler in schedulers:
+            scheduler.tick()
+        time.sleep(min(scheduler.seconds_until_next() for _, scheduler in schedulers))
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("expiry", help="expire time-bound grants and cancel stale pending requests")
+    cmds = p.add_subparsers(dest="expiry_command", required=True)
+
+    run = cmds.add_parser("run", help="run the expiry scheduler")
+    run.add_argument("--once", action="store_true", help="process what is due now and exit")
+    run.add_argument("--batch-size", type=int, default=500)
+    run.add_argument("--horizon", type=float, default=600, help="seconds of upcoming deadlines kept in memory")
+    run.add_argument("--max-sleep", type=float, default=30, help="upper bound between ticks, in seconds")
+    run.set_defaults(func=_run)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import argparse
+
+from app.cli import per_database
+from app.services import grants_service
+
+
+def _rebuild(args: argparse.Namespace) -> int:
+    verb = "found" if args.dry_run else "repaired"
+    differences = 0
+    for prefix, sessions, _ in per_database():
+        with sessions() as db:
+            report = grants_service.rebuild(db, batch_size=args.batch_size, dry_run=args.dry_run)
+
+        print(
+            f"{prefix}grants: scanned {report.scanned} approved requests, {verb} "
+            f"{report.missing} missing, {report.stale} stale, {report.changed} changed"
+        )
+        for kind, request_id in report.samples:
+            print(f"  {kind} {request_id}")
+        if report.differences > len(report.samples):
+            print(f"  ... and {report.differences - len(report.samples)} more")
+        differences += report.differences
+    return 1 if args.dry_run and differences else 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("grants", help="maintain the effective-access (grants) table")
+    cmds = p.add_subparsers(dest="grants_command", required=True)
+
+    rebuild = cmds.add_parser("rebuild", help="recompute grants from approved requests and report differences")
+    rebuild.add_argument("--batch-size", type=int, default=1000)
+    rebuild.add_argument("--dry-run", action="store_true", help="report differences without fixing them (exit 1 if any)")
+    rebuild.set_defaults(func=_rebuild)
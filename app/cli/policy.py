@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from contextlib import ExitStack
+from itertools import chain
+
+from app.cli import per_database
+from app.services import replay_service
+
+
+def _replay(args: argparse.Namespace) -> int:
+    started = time.monotonic()
+    out = open(args.deltas, "w", encoding="utf-8") if args.deltas else None
+
+    def _write(delta: dict) -> None:
+        out.write(json.dumps(delta) + "\n")
+
+    try:
+        with ExitStack() as stack:
+            if args.source == "db":
+                # Decisions from every database, one after the other.
+                batches = chain.from_iterable(
+                    replay_service.db_batches(stack.enter_context(sessions()), chunk_size=args.chunk_size)
+                    for _, sessions, _ in per_database()
+                )
+            else:
+                batches = replay_service.file_batches(args.source, chunk_size=args.chunk_size)
+            report = replay_service.replay(
+                batches,
+                baseline=args.baseline,
+                candidate=args.candidate,
+                workers=args.workers,
+                on_delta=_write if out else None,
+            )
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.monotonic() - started
+
+    print(f"policy replay: {report.rows} decisions in {elapsed:.2f}s, {report.changed} would change")
+    for (old, new), n in report.transitions.most_common():
+        marker = " " if old == new else "*"
+        print(f" {marker} {n:>10}  {old} -> {new}")
+    return 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("policy", help="evaluate policy changes against history")
+    cmds = p.add_subparsers(dest="policy_command", required=True)
+
+    replay = cmds.add_parser("replay", help="replay past decisions through two policy versions and diff them")
+    replay.add_argument("--candidate", required=True, help="policy module or .py file to compare")
+    replay.add_argument("--baseline", default="app.core.policy", help="policy module or .py file to compare against")
+    replay.add_argument("--source", default="db", help="'db' or an NDJSON file of decisions")
+    replay.add_argument("--chunk-size", type=int, default=50_000)
+    replay.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel evaluator processes")
+    replay.add_argument("--deltas", default=None, help="write one NDJSON line per changed decision to this file")
+    replay.set_defaults(func=_replay)
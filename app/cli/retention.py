@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+from datetime import timedelta
+
+from app.cli import per_database
+from app.core.clock import utcnow
+from app.core.config import retention_audit_days, retention_batch_size, retention_request_days
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.session import SessionLocal
+from app.services import idempotency_service, retention_service, revocation_service
+
+
+def _run_once(args: argparse.Namespace) -> None:
+    now = utcnow()
+    jobs = [
+        (retention_service.REQUESTS_JOB, now - timedelta(days=args.request_days)),
+        (retention_service.AUDIT_JOB, now - timedelta(days=args.audit_days)),
+    ]
+    for prefix, sessions, tenant in per_database():
+        with sessions() as db:
+            for job, cutoff in jobs:
+                if args.restart:
+                    retention_service.reset_checkpoint(db, job)
+                res = retention_service.run_job(
+                    db,
+                    job,
+                    cutoff=cutoff,
+                    batch_size=args.batch_size,
+                    max_batches=args.max_batches,
+                    pause_seconds=args.pause,
+                )
+                state = "done" if res.done else "paused (batch limit)"
+                print(f"{prefix}{res.job}: moved {res.rows_moved} rows in {res.batches} batches, {state}")
+
+            purged = idempotency_service.purge_expired(db)
+            db.commit()
+            print(f"{prefix}idempotency_keys: purged {purged} expired keys")
+
+            # revoked_tokens is deployment-wide (SHARED_TABLES): purge it once.
+            if tenant is None:
+                purged = revocation_service.purge_expired(db)
+                db.commit()
+                print(f"{prefix}revoked_tokens: purged {purged} entries past token expiry")
+
+
+def _run(args: argparse.Namespace) -> int:
+    if not args.every:
+        _run_once(args)
+        return 0
+    while True:
+        _run_once(args)
+        args.restart = False
+        time.sleep(args.every)
+
+
+def _lookup(args: argparse.Namespace) -> int:
+    with SessionLocal(info={"tenant_id": args.tenant}) as db:
+        found = retention_service.find_request(db, args.request_id, tenant_id=args.tenant)
+        if found is None:
+            print("not found")
+            return 1
+        req, archived = found
+        where = "archive" if archived else "live"
+        print(f"{req.id} [{where}] {req.resource} {req.action} status={req.status} decided_at={req.decided_at}")
+        for e in retention_service.audit_trail(
+            db, tenant_id=args.tenant, entity_type="access_request", entity_id=args.request_id
+        ):
+            print(f"  {e.created_at} {e.action} actor={e.actor_id}")
+    return 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("retention", help="archive decided requests and old audit events")
+    cmds = p.add_subparsers(dest="retention_command", required=True)
+
+    run = cmds.add_parser("run", help="move rows older than the policy window into the archive tables")
+    run.add_argument("--request-days", type=int, default=retention_request_days())
+    run.add_argument("--audit-days", type=int, default=retention_audit_days())
+    run.add_argument("--batch-size", type=int, default=retention_batch_size())
+    run.add_argument("--max-batches", type=int, default=None, help="stop after N batches per job (resume next run)")
+    run.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    run.add_argument("--restart", action="store_true", help="ignore stored checkpoints and rescan from the start")
+    run.add_argument("--every", type=float, default=None, help="keep running, once every N seconds")
+    run.set_defaults(func=_run)
+
+    lookup = cmds.add_parser("lookup", help="find a request in the live or archive tables")
+    lookup.add_argument("request_id", type=uuid.UUID)
+    lookup.add_argument("--tenant", default=DEFAULT_TENANT)
+    lookup.set_defaults(func=_lookup)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.cli import per_database
+from app.core.config import review_chunk_size
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.session import sessions_for
+from app.services import review_service
+
+
+def _generate(args: argparse.Namespace) -> int:
+    # Campaign ids are per database, so --campaign is looked up where --tenant's data lives.
+    targets = [("", sessions_for(args.tenant), None)] if args.campaign is not None else per_database()
+    while True:
+        for prefix, sessions, _ in targets:
+            with sessions() as db:
+                ids = [args.campaign] if args.campaign is not None else review_service.pending_generation(db)
+                for campaign_id in ids:
+                    started = time.monotonic()
+                    added = review_service.generate(db, campaign_id, chunk_size=args.chunk_size)
+                    elapsed = time.monotonic() - started
+                    print(f"{prefix}review campaign {campaign_id}: added {added} items ({elapsed:.2f}s)")
+        if not args.every:
+            return 0
+        time.sleep(args.every)
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("reviews", help="access review (recertification) campaigns")
+    cmds = p.add_subparsers(dest="reviews_command", required=True)
+
+    generate = cmds.add_parser("generate", help="copy current grants into the items of GENERATING campaigns")
+    generate.add_argument("--campaign", type=int, default=None, help="only this campaign")
+    generate.add_argument("--tenant", default=DEFAULT_TENANT, help="tenant that owns --campaign")
+    generate.add_argument("--chunk-size", type=int, default=review_chunk_size(), help="grants per INSERT ... SELECT")
+    generate.add_argument("--every", type=float, default=None, help="keep running, once every N seconds")
+    generate.set_defaults(func=_generate)
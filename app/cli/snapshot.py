@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import Engine
+
+from app.core.config import tenant_databases
+from app.db.session import databases, get_engine, tenant_engine
+from app.services import snapshot_service
+
+
+def _archives(path: str) -> Iterator[tuple[str, Engine, str]]:
+    """
+    (output prefix, engine, archive path) for every database: DATABASE_URL
+    uses `path` itself, each routed database `<stem>.<label><suffix>` beside it.
+    """
+    found = databases()
+    base = Path(path)
+    for label, tenant in found:
+        if tenant is None:
+            yield ("[shared] " if len(found) > 1 else ""), get_engine(), path
+        else:
+            archive = base.with_name(f"{base.stem}.{label}{base.suffix}")
+            yield f"[{label}] ", tenant_engine(tenant_databases()[tenant]), str(archive)
+
+
+def _dump(args: argparse.Namespace) -> int:
+    for prefix, engine, path in _archives(args.path):
+        started = time.monotonic()
+        manifest = snapshot_service.dump(engine, path, chunk_bytes=args.chunk_mb << 20, compresslevel=args.level)
+        for entry in manifest["tables"]:
+            print(f"{prefix}{entry['name']}: {entry['rows']} rows in {len(entry['chunks'])} chunks")
+        print(f"{prefix}wrote {path} ({time.monotonic() - started:.2f}s)")
+    return 0
+
+
+def _load(args: argparse.Namespace) -> int:
+    ok = True
+    for prefix, engine, path in _archives(args.path):
+        started = time.monotonic()
+        try:
+            report = snapshot_service.load(
+                engine, path, workers=args.workers, truncate=args.truncate, check=not args.no_verify
+            )
+        except snapshot_service.SnapshotError as e:
+            print(f"{prefix}error: {e}")
+            ok = False
+            continue
+        for problem in report.problems:
+            print(f"  {prefix}{problem}")
+        state = "verified" if not args.no_verify else "not verified"
+        if not report.ok:
+            state = f"{len(report.problems)} problems"
+        print(
+            f"{prefix}loaded {report.rows} rows into {report.tables} tables "
+            f"({time.monotonic() - started:.2f}s): {state}"
+        )
+        ok = ok and report.ok
+    return 0 if ok else 1
+
+
+def _verify(args: argparse.Namespace) -> int:
+    ok = True
+    for prefix, engine, path in _archives(args.path):
+        try:
+            manifest = snapshot_service.read_manifest(path)
+        except snapshot_service.SnapshotError as e:
+            print(f"{prefix}error: {e}")
+            ok = False
+            continue
+        problems = snapshot_service.verify(engine, manifest, workers=args.workers)
+        for problem in problems:
+            print(f"  {prefix}{problem}")
+        print(f"{prefix}{len(manifest['tables'])} tables: {'OK' if not problems else f'{len(problems)} problems'}")
+        ok = ok and not problems
+    return 0 if ok else 1
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser(
+        "snapshot", help="dump every database to snapshot archives (one per routed database) or restore them"
+    )
+    cmds = p.add_subparsers(dest="snapshot_command", required=True)
+
+    dump = cmds.add_parser("dump", help="stream every table into a chunked, compressed archive")
+    dump.add_argument("path")
+    dump.add_argument("--chunk-mb", type=int, default=snapshot_service.CHUNK_BYTES >> 20)
+    dump.add_argument("--level", type=int, default=1, help="deflate level, 0-9")
+    dump.set_defaults(func=_dump)
+
+    load = cmds.add_parser("load", help="restore an archive into a migrated database (stop the API first)")
+    load.add_argument("path")
+    load.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="tables loaded concurrently")
+    load.add_argument("--truncate", action="store_true", help="replace existing rows instead of refusing")
+    load.add_argument("--no-verify", action="store_true", help="skip the row count and checksum comparison")
+    load.set_defaults(func=_load)
+
+    verify = cmds.add_parser("verify", help="compare the database with an archive's counts and checksums")
+    verify.add_argument("path")
+    verify.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    verify.set_defaults(func=_verify)
@@ -1,22 +1,43 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from jose import JWTError, jwt
 
+from app.core import keys, profiling
+from app.core.tenancy import DEFAULT_TENANT
 from app.core.config import jwt_algorithm, jwt_expires_minutes, jwt_secret
 
 
-def create_access_token(*, sub: str, role: str) -> str:
+def create_access_token(*, sub: str, role: str, tenant_id: str = DEFAULT_TENANT) -> str:
     now = datetime.now(timezone.utc)
     exp = now + timedelta(minutes=jwt_expires_minutes())
-    payload: dict[str, Any] = {"sub": sub, "role": role, "iat": int(now.timestamp()), "exp": exp}
-    return jwt.encode(payload, jwt_secret(), algorithm=jwt_algorithm())
+    payload: dict[str, Any] = {
+        "sub": sub,
+        "role": role,
+        "tenant_id": tenant_id,
+        "iat": int(now.timestamp()),
+        "exp": exp,
+        "jti": uuid.uuid4().hex,
+    }
+    ring = keys.keyring()
+    with profiling.span("jwt"):
+        if ring is None:
+            return jwt.encode(payload, jwt_secret(), algorithm=jwt_algorithm())
+        return jwt.encode(payload, ring.signing_key, algorithm=ring.algorithm, headers={"kid": ring.active_kid})
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
-    try:
-        return jwt.decode(token, jwt_secret(), algorithms=[jwt_algorithm()])
-    except JWTError as e:
-        raise ValueError("Invalid token") from e
+    ring = keys.keyring()
+    with profiling.span("jwt"):
+        try:
+            if ring is None:
+                return jwt.decode(token, jwt_secret(), algorithms=[jwt_algorithm()])
+            key = ring.verifying_keys.get(jwt.get_unverified_header(token).get("kid"))
+            if key is None:
+                raise ValueError("Invalid token")
+            return jwt.decode(token, key, algorithms=[ring.algorithm])
+        except JWTError as e:
+            raise ValueError("Invalid token") from e
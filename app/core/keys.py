@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import jwt_active_kid, jwt_algorithm, jwt_keys_dir
+
+_EMPTY_JWKS = b'{"keys":[]}'
+
+
+@dataclass(frozen=True)
+class KeyRing:
+    algorithm: str
+    active_kid: str
+    signing_key: Key
+    verifying_keys: dict[str, Key]
+    jwks: bytes
+    etag: str
+
+
+def _kid(path: Path) -> str:
+    return path.name.split(".", 1)[0]
+
+
+@lru_cache(maxsize=4)
+def _load(directory: str, active_kid: str, algorithm: str) -> KeyRing:
+    if algorithm.startswith("HS"):
+        raise RuntimeError("JWT_ALGORITHM must be asymmetric (ES256, RS256, ...) when JWT_KEYS_DIR is set")
+
+    private: dict[str, Key] = {}
+    public: dict[str, Key] = {}
+    for path in sorted(Path(directory).glob("*.pem")):
+        key = jwk.construct(path.read_text(), algorithm)
+        if path.name.endswith(".pub.pem"):
+            public[_kid(path)] = key
+        else:
+            private[_kid(path)] = key
+            public[_kid(path)] = key.public_key()
+
+    if not private:
+        raise RuntimeError(f"JWT_KEYS_DIR {directory} has no <kid>.pem signing key")
+    # kids are names, not dates: with several signing keys the active one must be named.
+    if not active_kid and len(private) > 1:
+        raise RuntimeError(f"JWT_KEYS_DIR {directory} has {len(private)} signing keys; set JWT_ACTIVE_KID to pick one")
+    active = active_kid or next(iter(private))
+    if active not in private:
+        raise RuntimeError(f"JWT_ACTIVE_KID {active} has no private key in {directory}")
+
+    keys = [{**key.to_dict(), "kid": kid, "use": "sig", "alg": algorithm} for kid, key in sorted(public.items())]
+    body = json.dumps({"keys": keys}, separators=(",", ":")).encode("utf-8")
+    return KeyRing(
+        algorithm=algorithm,
+        active_kid=active,
+        signing_key=private[active],
+        verifying_keys=public,
+        jwks=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    )
+
+
+def keyring() -> KeyRing | None:
+    """
+    Signing and verification keys parsed once per process and looked up by
+    `kid`. Rotation: add the new key file, point JWT_ACTIVE_KID at it and keep
+    the old one (as <kid>.pub.pem if you like) until its tokens have expired.
+    Returns None in shared-secret mode.
+    """
+    directory = jwt_keys_dir()
+    if not directory:
+        return None
+    return _load(directory, jwt_active_kid(), jwt_algorithm())
+
+
+def reload() -> None:
+    """Re-read JWT_KEYS_DIR on next use (after a key file was added or removed)."""
+    _load.cache_clear()
+
+
+def jwks() -> tuple[bytes, str]:
+    """The public JWK Set as pre-serialized JSON, plus its ETag."""
+    ring = keyring()
+    if ring is None:
+        return _EMPTY_JWKS, f'"{hashlib.sha256(_EMPTY_JWKS).hexdigest()[:32]}"'
+    return ring.jwks, ring.etag
@@ -9,14 +9,29 @@ class RequestStatus(StrEnum):
     APPROVED = "APPROVED"
     REJECTED = "REJECTED"
     CANCELLED = "CANCELLED"
+    EXPIRED = "EXPIRED"
+    REVOKED = "REVOKED"
 
 
 # Allowed state transitions (source of truth)
 ALLOWED_TRANSITIONS: Final[dict[RequestStatus, set[RequestStatus]]] = {
     RequestStatus.PENDING: {RequestStatus.APPROVED, RequestStatus.REJECTED, RequestStatus.CANCELLED},
-    RequestStatus.APPROVED: set(),
+    RequestStatus.APPROVED: {RequestStatus.EXPIRED, RequestStatus.REVOKED},
     RequestStatus.REJECTED: set(),
     RequestStatus.CANCELLED: set(),
+    RequestStatus.EXPIRED: set(),
+    RequestStatus.REVOKED: set(),
+}
+
+# States a request never leaves.
+TERMINAL_STATUSES: Final[frozenset[RequestStatus]] = frozenset(
+    s for s, targets in ALLOWED_TRANSITIONS.items() if not targets
+)
+
+# States that end when `expires_at` passes, and what they become.
+EXPIRY_TRANSITIONS: Final[dict[RequestStatus, RequestStatus]] = {
+    RequestStatus.PENDING: RequestStatus.CANCELLED,
+    RequestStatus.APPROVED: RequestStatus.EXPIRED,
 }
 
 
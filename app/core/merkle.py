@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+
+GENESIS = "0" * 64
+
+
+def _h(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def chain(prev_hash: str, content: bytes) -> str:
+    """hash_n = sha256(hash_{n-1} || sha256(event_n)); the first event chains from GENESIS."""
+    return _h(bytes.fromhex(prev_hash) + _h(content)).hex()
+
+
+def _parent(left: bytes, right: bytes) -> bytes:
+    return _h(b"\x01" + left + right)
+
+
+def _leaf(value: str) -> bytes:
+    return _h(b"\x00" + bytes.fromhex(value))
+
+
+def root(leaves: list[str]) -> str:
+    """
+    Merkle root over hex leaf hashes. Leaves and inner nodes are domain
+    separated; an odd node at the end of a level is promoted unchanged.
+    """
+    if not leaves:
+        return GENESIS
+    level = [_leaf(v) for v in leaves]
+    while len(level) > 1:
+        nxt = [_parent(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0].hex()
+
+
+def proof(leaves: list[str], index: int) -> list[tuple[str, str]]:
+    """Sibling path for leaves[index] as (side, hash) pairs, side being "L" or "R"."""
+    level = [_leaf(v) for v in leaves]
+    path: list[tuple[str, str]] = []
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(("L" if sibling < index else "R", level[sibling].hex()))
+        nxt = [_parent(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level, index = nxt, index // 2
+    return path
+
+
+def verify_proof(leaf: str, path: list[tuple[str, str]], expected_root: str) -> bool:
+    """Check one leaf against a root with O(log n) hashes."""
+    node = _leaf(leaf)
+    for side, sibling in path:
+        node = _parent(bytes.fromhex(sibling), node) if side == "L" else _parent(node, bytes.fromhex(sibling))
+    return node.hex() == expected_root
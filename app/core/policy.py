@@ -23,6 +23,8 @@ def can_decide_request(
     actor_id: str,
     requester_id: str,
     current_status: str,
+    expired: bool = False,
+    claimed_by_other: bool = False,
 ) -> PolicyResult:
     role = (actor_role or "").strip().upper()
 
@@ -32,7 +34,35 @@ def can_decide_request(
     if (current_status or "").strip().upper() != "PENDING":
         return PolicyResult(False, 400, "Request not pending")
 
+    if expired:
+        return PolicyResult(False, 400, "Request expired")
+
+    if claimed_by_other:
+        return PolicyResult(False, 409, "Request claimed by another approver")
+
     if actor_id == requester_id:
         return PolicyResult(False, 403, "Self-approval is not allowed")
 
     return PolicyResult(True)
+
+
+def can_revoke_grant(*, actor_role: str | None, current_status: str) -> PolicyResult:
+    role = (actor_role or "").strip().upper()
+
+    if role not in {"APPROVER", "ADMIN"}:
+        return PolicyResult(False, 403, "Forbidden")
+
+    if (current_status or "").strip().upper() != "APPROVED":
+        return PolicyResult(False, 400, "Request not approved")
+
+    return PolicyResult(True)
+
+
+def can_view_grants(*, actor_role: str | None, actor_id: str, user_id: str | None = None) -> PolicyResult:
+    """Approvers and admins see every grant; anyone may list their own."""
+    role = (actor_role or "").strip().upper()
+    if role in {"APPROVER", "ADMIN"}:
+        return PolicyResult(True)
+    if user_id is not None and user_id == actor_id:
+        return PolicyResult(True)
+    return PolicyResult(False, 403, "Forbidden")
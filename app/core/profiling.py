@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import contextvars
+import hmac
+import logging
+import random
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, event
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import profile_sample_rate, profile_token, slow_query_explain, slow_query_ms
+
+log = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+# Listener pair per instrumented engine, so instrument() can be repeated and undone.
+_installed: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+_current: contextvars.ContextVar[Profile | None] = contextvars.ContextVar("profile", default=None)
+
+
+@dataclass
+class Profile:
+    trigger: str
+    started: float = field(default_factory=time.perf_counter)
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    spans: dict[str, float] = field(default_factory=dict)
+
+    def breakdown(self) -> dict[str, float | int]:
+        total = time.perf_counter() - self.started
+        out: dict[str, float | int] = {"total_ms": round(total * 1000, 2), "sql_ms": round(self.sql_seconds * 1000, 2)}
+        out["sql_count"] = self.sql_count
+        for name, seconds in sorted(self.spans.items()):
+            out[f"{name}_ms"] = round(seconds * 1000, 2)
+        # Handler code and response serialization.
+        out["other_ms"] = round((total - self.sql_seconds - sum(self.spans.values())) * 1000, 2)
+        return out
+
+    def server_timing(self, b: dict[str, float | int]) -> str:
+        parts = [f'sql;dur={b["sql_ms"]};desc="{self.sql_count} queries"']
+        parts += [f"{name};dur={b[f'{name}_ms']}" for name in sorted(self.spans)]
+        parts += [f"other;dur={b['other_ms']}", f"total;dur={b['total_ms']}"]
+        return ", ".join(parts)
+
+
+def is_instrumented(engine: Engine) -> bool:
+    return engine in _installed
+
+
+def profiling_enabled() -> bool:
+    return profile_sample_rate() > 0 or bool(profile_token())
+
+
+@contextmanager
+def _timed(profile: Profile, name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.spans[name] = profile.spans.get(name, 0.0) + time.perf_counter() - started
+
+
+class _NoSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Time a block into the current profile; a shared no-op when the request is not profiled."""
+    profile = _current.get()
+    if profile is None:
+        return _NO_SPAN
+    return _timed(profile, name)
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    # Savepoint-wrapped so a failing EXPLAIN cannot abort the caller's transaction.
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            plan = f"EXPLAIN failed: {e}"
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    finally:
+        cursor.close()
+
+
+def instrument(engine: Engine, *, slow_ms: float | None = None, explain: bool | None = None) -> None:
+    """
+    Time every cursor execution on `engine`: into the current profile, and to
+    the log when it takes `slow_ms` or longer. Only installed when profiling or
+    slow-query logging is configured, so a disabled setup adds no listeners.
+    """
+    slow_ms = slow_query_ms() if slow_ms is None else slow_ms
+    explain = slow_query_explain() if explain is None else explain
+    can_explain = explain and engine.dialect.name == "postgresql"
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["profile_query_start"].pop()
+        profile = _current.get()
+        if profile is not None:
+            profile.sql_count += 1
+            profile.sql_seconds += elapsed
+        if slow_ms and elapsed * 1000 >= slow_ms:
+            plan = None
+            if can_explain and not executemany and statement.lstrip()[:6].upper() == "SELECT":
+                plan = _explain(conn, statement, parameters)
+            log.warning(
+                "slow query %.1fms: %s params=%r%s",
+                elapsed * 1000,
+                statement,
+                parameters,
+                f"\n{plan}" if plan else "",
+            )
+
+    uninstrument(engine)
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    _installed[engine] = (before, after)
+
+
+def uninstrument(engine: Engine) -> None:
+    listeners = _installed.pop(engine, None)
+    if listeners is not None:
+        event.remove(engine, "before_cursor_execute", listeners[0])
+        event.remove(engine, "after_cursor_execute", listeners[1])
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when it carries `X-Profile: <PROFILE_TOKEN>` (the
+    breakdown is returned as a Server-Timing header and logged) or when it is
+    picked by PROFILE_SAMPLE_RATE (logged only). Everything else passes
+    straight through.
+    """
+
+    def __init__(self, app: ASGIApp, *, sample_rate: float = 0.0, token: str = "") -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token.encode("utf-8")
+
+    def _trigger(self, scope: Scope) -> str | None:
+        if self.token:
+            offered = Headers(scope=scope).get(PROFILE_HEADER)
+            if offered is not None and hmac.compare_digest(offered.encode("utf-8"), self.token):
+                return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(trigger)
+        token = _current.set(profile)
+        breakdown: dict | None = None
+
+        async def _send(message: Message) -> None:
+            nonlocal breakdown
+            if message["type"] == "http.response.start":
+                breakdown = profile.breakdown()
+                if trigger == "header":
+                    MutableHeaders(raw=message["headers"]).append("Server-Timing", profile.server_timing(breakdown))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _current.reset(token)
+            log.info("profile %s %s %s %s", trigger, scope["method"], scope["path"], breakdown or profile.breakdown())
@@ -1,20 +1,41 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.orm import Session
 
+from app.core import revocation
 from app.core.jwt import decode_access_token
+from app.core.tenancy import tenant_of
+from app.db.deps import get_db
 
 bearer = HTTPBearer(auto_error=False)
 
 
 def get_current_claims(
     creds: HTTPAuthorizationCredentials | None = Depends(bearer),
+    db: Session = Depends(get_db),
 ) -> dict:
     if creds is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing token")
     try:
-        return decode_access_token(creds.credentials)
+        claims = decode_access_token(creds.credentials)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    # In-memory check only; the index is kept current by a background sync.
+    if revocation.index.is_revoked(claims):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+    # The request's session (shared through the dependency cache) binds to the tenant's database.
+    db.info["tenant_id"] = tenant_of(claims)
+    return claims
+
+
+def get_optional_claims(
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
+    db: Session = Depends(get_db),
+) -> dict | None:
+    """The caller's claims when a token is sent, for endpoints that also serve anonymous callers."""
+    if creds is None:
+        return None
+    return get_current_claims(creds, db)
 
 
 def require_role(*roles: str):
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from dataclasses import dataclass
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; answers "definitely not present" cheaply."""
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001) -> None:
+        bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._size = bits
+        self._hashes = max(1, round(bits / capacity * math.log(2)))
+        self._bits = bytearray((bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+@dataclass(frozen=True)
+class Revocation:
+    version: int
+    jti: str | None
+    subject_id: str | None
+    revoked_at: int  # epoch seconds; subject revocations cover tokens issued at or before this
+
+
+class RevocationIndex:
+    """
+    In-process view of revoked tokens. Lookups never touch the database:
+    a Bloom filter rejects almost every live jti before the set is consulted,
+    and whole-user revocations are a dict lookup on `sub`.
+    """
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self.replace([])
+
+    def replace(self, revocations: list[Revocation]) -> None:
+        """Swap in a freshly built index (used for the initial load and periodic compaction)."""
+        bloom = BloomFilter(max(self._capacity, 2 * len(revocations)))
+        jtis: set[str] = set()
+        subjects: dict[str, int] = {}
+        version = self._fill(bloom, jtis, subjects, 0, revocations)
+        with self._lock:
+            self._bloom, self._jtis, self._subjects, self.version = bloom, jtis, subjects, version
+
+    def apply(self, revocations: list[Revocation], *, advance_version: bool = True) -> None:
+        """
+        Add revocations. Pass advance_version=False for rows this process just
+        wrote itself: other workers' rows with lower ids may not be synced yet.
+        """
+        with self._lock:
+            version = self._fill(self._bloom, self._jtis, self._subjects, self.version, revocations)
+            if advance_version:
+                self.version = version
+
+    @staticmethod
+    def _fill(bloom: BloomFilter, jtis: set[str], subjects: dict[str, int], version: int, revocations) -> int:
+        for r in revocations:
+            if r.jti:
+                bloom.add(r.jti)
+                jtis.add(r.jti)
+            if r.subject_id:
+                subjects[r.subject_id] = max(subjects.get(r.subject_id, 0), r.revoked_at)
+            version = max(version, r.version)
+        return version
+
+    def is_revoked(self, claims: dict) -> bool:
+        jti = claims.get("jti")
+        if jti and jti in self._bloom and jti in self._jtis:
+            return True
+        cutoff = self._subjects.get(str(claims.get("sub")))
+        return cutoff is not None and int(claims.get("iat", 0)) <= cutoff
+
+
+index = RevocationIndex()
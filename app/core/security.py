@@ -1,11 +1,27 @@
-from passlib.context import CryptContext
+from __future__ import annotations
 
-_pwd = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core import profiling
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+@lru_cache(maxsize=1)
+def _pwd() -> "CryptContext":
+    # Built on first use: importing passlib loads the bcrypt backend.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return _pwd.hash(password)
+    with profiling.span("bcrypt"):
+        return _pwd().hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return _pwd.verify(password, password_hash)
+    with profiling.span("bcrypt"):
+        return _pwd().verify(password, password_hash)
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+DEFAULT_TENANT = "default"
+
+# Tenant ids are short slugs: they lead every tenant-scoped index and key the database routing map.
+TENANT_PATTERN = r"^[a-z0-9][a-z0-9_-]{0,63}$"
+
+
+def tenant_of(claims: dict) -> str:
+    """The caller's tenant; tokens issued before tenancy belong to the default tenant."""
+    return str(claims.get("tenant_id") or DEFAULT_TENANT)
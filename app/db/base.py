@@ -1,5 +1,4 @@
 from sqlalchemy.orm import declarative_base
 
+# Models register themselves on this Base; import `app.models` to load them all.
 Base = declarative_base()
-
-from app.models.audit import AuditEvent  # noqa
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.sql import ColumnElement
+
+
+def _comparable(ts_col, ts: datetime, dialect: str):
+    if dialect == "sqlite":
+        # SQLite stores timestamps as text in more than one format (server
+        # defaults vs. bound parameters); compare them numerically instead.
+        return func.julianday(ts_col), func.julianday(ts.strftime("%Y-%m-%d %H:%M:%S.%f"))
+    return ts_col, ts
+
+
+def before(ts_col, id_col, ts: datetime, row_id, dialect: str) -> ColumnElement[bool]:
+    """(ts_col, id_col) < (ts, row_id), for newest-first scans."""
+    col, bound = _comparable(ts_col, ts, dialect)
+    return or_(col < bound, and_(col == bound, id_col < row_id))
+
+
+def after(ts_col, id_col, ts: datetime, row_id, dialect: str) -> ColumnElement[bool]:
+    """(ts_col, id_col) > (ts, row_id), for oldest-first scans."""
+    col, bound = _comparable(ts_col, ts, dialect)
+    return or_(col > bound, and_(col == bound, id_col > row_id))
@@ -1,8 +1,190 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from __future__ import annotations
 
-from app.core.config import database_url
+import threading
+from functools import partial
+from typing import Callable
 
-engine = create_engine(database_url(), pool_pre_ping=True)
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.core.config import (
+    database_url,
+    profile_sample_rate,
+    profile_token,
+    slow_query_ms,
+    sqlite_busy_timeout_ms,
+    sqlite_group_commit_max,
+    sqlite_read_pool_size,
+    sqlite_single_writer,
+    tenant_databases,
+)
+from app.db import sqlite_writer
+
+# The engine (and with it the DB driver import) is built on first use rather
+# than at import time, so importing the app stays cheap and a pre-fork master
+# never opens a pool its workers would inherit.
+_engine: Engine | None = None
+_tenant_engines: dict[str, Engine] = {}
+_writers: dict[Engine, sqlite_writer.Writer] = {}
+_lock = threading.Lock()
+
+# Deployment-wide tables: always in the shared database, whichever tenant a session serves.
+SHARED_TABLES = frozenset({"revoked_tokens"})
+
+
+def _instrument(engine: Engine) -> None:
+    if slow_query_ms() > 0 or profile_sample_rate() > 0 or profile_token():
+        from app.core import profiling
+
+        profiling.instrument(engine)
+
+
+def _build(url: str) -> Engine:
+    if url.startswith("sqlite"):
+        engine = create_engine(url, pool_size=sqlite_read_pool_size(), max_overflow=0)
+        sqlite_writer.configure(engine, busy_timeout_ms=sqlite_busy_timeout_ms())
+        if sqlite_single_writer() and sqlite_writer.is_file(engine):
+            writer = _writers[engine] = sqlite_writer.Writer(
+                engine.url, busy_timeout_ms=sqlite_busy_timeout_ms(), max_group=sqlite_group_commit_max()
+            )
+            # Every write runs on the writer's own engine.
+            _instrument(writer.engine)
+    else:
+        engine = create_engine(url, pool_pre_ping=True)
+    _instrument(engine)
+    return engine
+
+
+def _is_write(session: Session, clause) -> bool:
+    if session._flushing:
+        return True
+    if clause is None:
+        return False
+    return bool(getattr(clause, "is_dml", False)) or getattr(clause, "_for_update_arg", None) is not None
+
+
+class TenantSession(Session):
+    """
+    A session whose `info["tenant_id"]` names a tenant routed to its own
+    database (TENANT_DATABASES) binds there; every other session uses the
+    shared engine. Set the tenant before the first query. SHARED_TABLES stay
+    on the shared engine so that, e.g., one revocation index covers everyone.
+
+    On a SQLite file, reads use the pooled read connections until the first
+    write or locking read; from then until the transaction ends, everything
+    goes through the database's single writer (see sqlite_writer.Writer).
+    """
+
+    _writer: sqlite_writer.Writer | None = None
+
+    def _engine_for(self, mapper) -> Engine:
+        tenant = self.info.get("tenant_id")
+        if tenant is not None and not (mapper is not None and mapper.local_table.name in SHARED_TABLES):
+            url = tenant_databases().get(tenant)
+            if url:
+                return tenant_engine(url)
+        return super().get_bind(mapper=mapper)
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        engine = self._engine_for(mapper)
+        writer = _writers.get(engine)
+        if writer is None or (mapper is None and clause is None and not self._flushing):
+            return engine
+        # A session holds at most one writer; writes to a second file go through its pool.
+        if self._writer is writer or (self._writer is None and _is_write(self, clause)):
+            conn = writer.acquire(self)
+            self._writer = writer
+            return conn
+        return engine
+
+    def _release_writer(self, *, committed: bool) -> None:
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.release(self, committed=committed)
+
+    def commit(self) -> None:
+        super().commit()
+        self._release_writer(committed=True)
+
+    def rollback(self) -> None:
+        try:
+            super().rollback()
+        finally:
+            self._release_writer(committed=False)
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._release_writer(committed=False)
+
+
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw) -> Session:
+        if "bind" not in local_kw and self.kw.get("bind") is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+# Sessions joining the SQLite writer's open transaction work in a SAVEPOINT of it.
+SessionLocal = _LazySessionmaker(
+    class_=TenantSession, autocommit=False, autoflush=False, join_transaction_mode="create_savepoint"
+)
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _build(database_url())
+                SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def tenant_engine(url: str) -> Engine:
+    engine = _tenant_engines.get(url)
+    if engine is None:
+        with _lock:
+            engine = _tenant_engines.get(url)
+            if engine is None:
+                engine = _tenant_engines[url] = _build(url)
+    return engine
+
+
+def sessions_for(tenant_id: str | None) -> Callable[..., Session]:
+    """A session factory routed the way `tenant_id`'s requests are; None means DATABASE_URL."""
+    if tenant_id is None:
+        return SessionLocal
+    return partial(SessionLocal, info={"tenant_id": tenant_id})
+
+
+def databases() -> list[tuple[str, str | None]]:
+    """
+    Every database holding tenant data, as (label, routing tenant) for
+    `sessions_for`: DATABASE_URL first, then each distinct TENANT_DATABASES
+    URL. Maintenance commands (expiry, retention, audit sealing, reviews)
+    run once per entry.
+    """
+    tenants_by_url: dict[str, list[str]] = {}
+    for tenant, url in sorted(tenant_databases().items()):
+        if url != database_url():
+            tenants_by_url.setdefault(url, []).append(tenant)
+    return [("shared", None), *((",".join(tenants), tenants[0]) for tenants in tenants_by_url.values())]
+
+
+def dispose_engine(*, close: bool = True) -> None:
+    """Drop pooled connections, if an engine has been built at all."""
+    if _engine is not None:
+        _engine.dispose(close=close)
+    for engine in list(_tenant_engines.values()):
+        engine.dispose(close=close)
+    for writer in list(_writers.values()):
+        writer.dispose(close=close)
+
+
+def __getattr__(name: str):
+    # Keeps `from app.db.session import engine` working.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import Connection, Engine, create_engine, event
+from sqlalchemy.exc import OperationalError
+
+# Applied to every connection. WAL lets readers run alongside the writer;
+# synchronous=NORMAL only syncs at checkpoints, which WAL keeps crash-safe.
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA mmap_size = 268435456",
+)
+
+_FAILURES_KEPT = 256
+
+
+def is_file(engine: Engine) -> bool:
+    database = engine.url.database or ""
+    return engine.dialect.name == "sqlite" and database not in ("", ":memory:") and "mode=memory" not in str(engine.url)
+
+
+def configure(engine: Engine, *, busy_timeout_ms: int, immediate: bool = False) -> None:
+    """
+    Tune a SQLite engine and take over transaction control from pysqlite,
+    whose implicit BEGIN breaks SAVEPOINTs. `immediate` engines take the
+    write lock at BEGIN, so a write transaction never fails half-way with
+    "database is locked" when it upgrades from reading.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, _record) -> None:
+        dbapi_conn.isolation_level = None
+        cur = dbapi_conn.cursor()
+        cur.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        for pragma in PRAGMAS:
+            cur.execute(pragma)
+        cur.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn: Connection) -> None:
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+
+class Writer:
+    """
+    The single connection that writes to one SQLite file. A session takes it
+    at its first write or locking read and hands it back when its
+    transaction ends. Each session's work is a SAVEPOINT inside a transaction
+    that stays open while other sessions are queued for the writer, and is
+    committed once nobody is waiting or `max_group` sessions have gone
+    through: a burst of writes costs one commit (group commit). A session's
+    commit() returns only after the group holding its work has committed.
+    Waiting for the writer is bounded by the busy timeout, like SQLite's own
+    lock; a thread that already holds it through another session would
+    otherwise wait for itself forever.
+    """
+
+    def __init__(self, url, *, busy_timeout_ms: int, max_group: int) -> None:
+        self.engine = create_engine(url, pool_size=1, max_overflow=0, connect_args={"check_same_thread": False})
+        configure(self.engine, busy_timeout_ms=busy_timeout_ms, immediate=True)
+        self.max_group = max(1, max_group)
+        self.timeout = busy_timeout_ms / 1000
+        self._conn: Connection | None = None
+        self._cond = threading.Condition()
+        self._owner: object | None = None
+        self._waiting = 0
+        self._pending = 0  # committed sessions in the open transaction
+        self._group = 0  # transactions ended so far
+        self._failed: dict[int, BaseException] = {}
+
+    def acquire(self, owner: object) -> Connection:
+        with self._cond:
+            if self._owner is owner:
+                return self._conn
+            deadline = time.monotonic() + self.timeout
+            self._waiting += 1
+            try:
+                while self._owner is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise OperationalError(
+                            None, None, sqlite3.OperationalError("database is locked (timed out waiting for the writer)")
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._owner = owner
+        try:
+            if self._conn is None:
+                self._conn = self.engine.connect()
+            if not self._conn.in_transaction():
+                self._conn.begin()
+        except BaseException:
+            self.release(owner, committed=False)
+            raise
+        return self._conn
+
+    def release(self, owner: object, *, committed: bool) -> None:
+        """Give the writer back; after a commit, wait until that work is durable."""
+        with self._cond:
+            if self._owner is not owner:
+                return
+            group = self._group
+            if committed:
+                self._pending += 1
+            if self._waiting == 0 or self._pending >= self.max_group:
+                self._end_group()
+            self._owner = None
+            self._cond.notify_all()
+            if not committed:
+                return
+            while self._group <= group:
+                self._cond.wait()
+            error = self._failed.get(group)
+        if error is not None:
+            raise error
+
+    def _end_group(self) -> None:
+        conn = self._conn
+        try:
+            if conn is not None and conn.in_transaction():
+                conn.commit()
+        except Exception as e:
+            self._failed[self._group] = e
+            if len(self._failed) > _FAILURES_KEPT:
+                del self._failed[min(self._failed)]
+            self._conn = None
+            conn.invalidate()
+        finally:
+            self._group += 1
+            self._pending = 0
+
+    def dispose(self, *, close: bool = True) -> None:
+        with self._cond:
+            if self._conn is not None and close:
+                self._conn.close()
+            self._conn = None
+        self.engine.dispose(close=close)
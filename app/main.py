@@ -1,12 +1,38 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
+from app.core.compression import CompressionMiddleware
+from app.core.config import compression_min_bytes, profile_sample_rate, profile_token, revocation_sync_seconds
+from app.core.profiling import ProfilingMiddleware, profiling_enabled
+from app.db.session import SessionLocal, dispose_engine, get_engine
+from app.services.revocation_service import RevocationSync
+
 from app.routers.auth import router as auth_router
+from app.routers.jwks import router as jwks_router
 
 from app.routers.requests import router as requests_router
+from app.routers.archive import router as archive_router
+from app.routers.grants import router as grants_router
+from app.routers.routing import router as routing_router
+from app.routers.reviews import router as reviews_router
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Runs per worker, after any fork: build the pool here, release it on exit.
+    get_engine()
+    revocations = RevocationSync(SessionLocal, revocation_sync_seconds())
+    revocations.start()
+    yield
+    revocations.stop()
+    dispose_engine()
+
 
-app = FastAPI(title="AccessOps API")
+app = FastAPI(title="AccessOps API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -14,9 +40,17 @@ app.add_middleware(
     allow_methods=["*"],  # includes OPTIONS, PATCH, etc.
     allow_headers=["*"],  # includes Authorization, Content-Type
 )
+app.add_middleware(CompressionMiddleware, minimum_size=compression_min_bytes())
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware, sample_rate=profile_sample_rate(), token=profile_token())
 app.include_router(auth_router)
+app.include_router(jwks_router)
 
 app.include_router(requests_router)
+app.include_router(archive_router)
+app.include_router(grants_router)
+app.include_router(routing_router)
+app.include_router(reviews_router)
 
 
 @app.get("/health")
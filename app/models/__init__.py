@@ -3,4 +3,12 @@
 from .user import User  # noqa: F401
 from .access_request import AccessRequest  # noqa: F401
 
-from app.models.audit import AuditEvent  # noqa
+from app.models.audit import AuditChainHead, AuditCheckpoint, AuditEvent  # noqa
+from app.models.idempotency import IdempotencyKey  # noqa
+from app.models.request_stats import RequestDecisionLatency, RequestStat  # noqa
+from app.models.archive import AccessRequestArchive, AuditEventArchive, RetentionCheckpoint  # noqa
+from app.models.revocation import RevokedToken  # noqa
+from app.models.grant import Grant  # noqa
+from app.models.catalog import CatalogAction, CatalogResource  # noqa
+from app.models.routing import ApproverGroup, ApproverGroupMember, RequestAssignment, RoutingRule  # noqa
+from app.models.review import ReviewCampaign, ReviewDecision, ReviewItem  # noqa
@@ -1,28 +1,58 @@
-import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import DDL, DateTime, Enum, ForeignKey, Index, Integer, String, Text, event, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.lifecycle import RequestStatus
+from app.core.tenancy import DEFAULT_TENANT
 from app.db.base import Base
+from app.models.catalog import CatalogAction, CatalogResource
 
-
-class RequestStatus(str, enum.Enum):
-    PENDING = "PENDING"
-    APPROVED = "APPROVED"
-    REJECTED = "REJECTED"
+__all__ = ["AccessRequest", "RequestStatus"]
 
 
 class AccessRequest(Base):
     __tablename__ = "access_requests"
+    __table_args__ = (
+        # Keyset pagination (created_at DESC, id DESC) under the common filters. Every
+        # request-facing query is scoped to one tenant, so each index leads with it.
+        Index("ix_access_requests_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_access_requests_tenant_id_status_created_at_id", "tenant_id", "status", "created_at", "id"),
+        Index(
+            "ix_access_requests_tenant_id_requester_id_created_at_id", "tenant_id", "requester_id", "created_at", "id"
+        ),
+        # Oldest-first scans by the retention job.
+        Index("ix_access_requests_decided_at_id", "decided_at", "id"),
+        # Only rows that can still expire; the expiry scheduler walks this in deadline order.
+        Index(
+            "ix_access_requests_expires_at_open",
+            "expires_at",
+            postgresql_where=text("status IN ('PENDING', 'APPROVED')"),
+            sqlite_where=text("status IN ('PENDING', 'APPROVED')"),
+        ),
+        # At most one open request per (requester, resource, action); create_request
+        # targets this with INSERT ... ON CONFLICT to coalesce re-submissions.
+        Index(
+            "ux_access_requests_pending_tenant_id_requester_resource_action",
+            "tenant_id",
+            "requester_id",
+            "resource_id",
+            "action_id",
+            unique=True,
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id: Mapped[str] = mapped_column(String(64), nullable=False, server_default=DEFAULT_TENANT)
 
     requester_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    resource: Mapped[str] = mapped_column(String(255), nullable=False)
-    action: Mapped[str] = mapped_column(String(64), nullable=False)
+    # Interned through app.services.catalog_service; the names below are read-only.
+    resource_id: Mapped[int] = mapped_column(Integer, ForeignKey("catalog_resources.id"), nullable=False)
+    action_id: Mapped[int] = mapped_column(Integer, ForeignKey("catalog_actions.id"), nullable=False)
     justification: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     status: Mapped[RequestStatus] = mapped_column(Enum(RequestStatus, name="request_status"), nullable=False, default=RequestStatus.PENDING)
@@ -30,7 +60,97 @@ class AccessRequest(Base):
     decided_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     decided_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # PENDING requests are cancelled and APPROVED grants expire once this passes.
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # Names come from the catalog in one IN query per page of rows; queries
+    # that filter or project by name join catalog_resources/catalog_actions.
+    catalog_resource: Mapped[CatalogResource] = relationship(lazy="selectin", viewonly=True)
+    catalog_action: Mapped[CatalogAction] = relationship(lazy="selectin", viewonly=True)
+
     requester = relationship("User", foreign_keys=[requester_id], passive_deletes=True)
     decider = relationship("User", foreign_keys=[decided_by], passive_deletes=True)
+
+    @property
+    def resource(self) -> str:
+        return self.catalog_resource.name
+
+    @property
+    def action(self) -> str:
+        return self.catalog_action.name
+
+
+# Full-text search support lives outside the mapped columns because it is
+# dialect-specific. Alembic creates the same objects in production; these
+# listeners cover `Base.metadata.create_all` (tests, local dev). Both variants
+# resolve resource/action names from the catalog when a row is written.
+POSTGRES_SEARCH_DDL = (
+    "ALTER TABLE access_requests ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION access_requests_search_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector(
+            'simple',
+            coalesce((SELECT name FROM catalog_resources WHERE id = NEW.resource_id), '') || ' ' ||
+            coalesce((SELECT name FROM catalog_actions WHERE id = NEW.action_id), '') || ' ' ||
+            coalesce(NEW.justification, '')
+        );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER access_requests_search_vector
+    BEFORE INSERT OR UPDATE OF resource_id, action_id, justification ON access_requests
+    FOR EACH ROW EXECUTE FUNCTION access_requests_search_vector()
+    """,
+    "CREATE INDEX ix_access_requests_search_vector ON access_requests USING gin (search_vector)",
+)
+
+_SQLITE_FTS_VALUES = (
+    "(SELECT name FROM catalog_resources WHERE id = {row}.resource_id), "
+    "(SELECT name FROM catalog_actions WHERE id = {row}.action_id), "
+    "{row}.justification"
+)
+
+SQLITE_SEARCH_DDL = (
+    # Contentless: the names are not columns of access_requests any more.
+    "CREATE VIRTUAL TABLE access_requests_fts USING fts5(resource, action, justification, content='')",
+    f"""
+    CREATE TRIGGER access_requests_fts_ai AFTER INSERT ON access_requests BEGIN
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, {_SQLITE_FTS_VALUES.format(row="new")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER access_requests_fts_ad AFTER DELETE ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, {_SQLITE_FTS_VALUES.format(row="old")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER access_requests_fts_au AFTER UPDATE OF resource_id, action_id, justification ON access_requests BEGIN
+        INSERT INTO access_requests_fts (access_requests_fts, rowid, resource, action, justification)
+        VALUES ('delete', old.rowid, {_SQLITE_FTS_VALUES.format(row="old")});
+        INSERT INTO access_requests_fts (rowid, resource, action, justification)
+        VALUES (new.rowid, {_SQLITE_FTS_VALUES.format(row="new")});
+    END
+    """,
+)
+
+for _stmt in POSTGRES_SEARCH_DDL:
+    event.listen(AccessRequest.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in SQLITE_SEARCH_DDL:
+    event.listen(AccessRequest.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+event.listen(
+    AccessRequest.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS access_requests_fts").execute_if(dialect="sqlite"),
+)
+event.listen(
+    AccessRequest.__table__,
+    "after_drop",
+    DDL("DROP FUNCTION IF EXISTS access_requests_search_vector()").execute_if(dialect="postgresql"),
+)
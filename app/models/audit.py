@@ -1,18 +1,34 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, text
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 
+from app.core.tenancy import DEFAULT_TENANT
 from app.db.base import Base
 from sqlalchemy.types import JSON
 
 
 class AuditEvent(Base):
     __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_created_at_id", "created_at", "id"),
+        Index("ix_audit_events_tenant_id_entity", "tenant_id", "entity_type", "entity_id"),
+        Index("ux_audit_events_seq", "seq", unique=True),
+        # What the sealer still has to chain.
+        Index(
+            "ix_audit_events_unsealed",
+            "created_at",
+            "id",
+            postgresql_where=text("seq IS NULL"),
+            sqlite_where=text("seq IS NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
-    actor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    tenant_id = Column(String(64), nullable=False, server_default=DEFAULT_TENANT)
+    # No foreign key: the id is part of the sealed hash, so deleting the user must leave it as it was.
+    actor_id = Column(UUID(as_uuid=True), nullable=True)
 
     action = Column(String, nullable=False)
     entity_type = Column(String, nullable=False)
@@ -25,3 +41,33 @@ class AuditEvent(Base):
     )
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    # Filled in by the sealer (audit_chain_service.seal_batch), never by writers.
+    seq = Column(BigInteger, nullable=True)
+    prev_hash = Column(String(64), nullable=True)
+    hash = Column(String(64), nullable=True)
+
+
+class AuditChainHead(Base):
+    """Single row holding the end of the chain; sealers lock it, writers never touch it."""
+
+    __tablename__ = "audit_chain_head"
+
+    id = Column(Integer, primary_key=True, default=1)
+    last_seq = Column(BigInteger, nullable=False, default=0)
+    last_hash = Column(String(64), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class AuditCheckpoint(Base):
+    """Merkle root over the chain hashes of events first_seq..last_seq."""
+
+    __tablename__ = "audit_checkpoints"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    first_seq = Column(BigInteger, nullable=False)
+    last_seq = Column(BigInteger, nullable=False, unique=True)
+    root = Column(String(64), nullable=False)
+    # Chain hash of the event at last_seq; the next range must chain from it.
+    last_hash = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
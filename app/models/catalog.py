@@ -0,0 +1,30 @@
+from sqlalchemy import DDL, Integer, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CatalogResource(Base):
+    """Interned resource names; a name keeps its id forever and is never deleted, so ids can be cached."""
+
+    __tablename__ = "catalog_resources"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+
+
+class CatalogAction(Base):
+    """Interned action names; see CatalogResource."""
+
+    __tablename__ = "catalog_actions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+
+
+# resource_prefix filters match names here and then join by id.
+for _stmt in (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_catalog_resources_name_trgm ON catalog_resources USING gin (name gin_trgm_ops)",
+):
+    event.listen(CatalogResource.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
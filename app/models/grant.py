@@ -0,0 +1,63 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.base import Base
+from app.models.catalog import CatalogAction, CatalogResource
+
+
+class Grant(Base):
+    """
+    Effective access: one row per APPROVED request that has not expired or
+    been revoked. Maintained in the same transaction as the status change;
+    `python -m app.cli grants rebuild` recomputes it from the requests.
+    """
+
+    __tablename__ = "grants"
+    __table_args__ = (
+        # Who has access to a resource (optionally for one action).
+        Index(
+            "ix_grants_tenant_id_resource_id_action_id_user_id",
+            "tenant_id",
+            "resource_id",
+            "action_id",
+            "user_id",
+            "request_id",
+        ),
+        # What a user can access.
+        Index(
+            "ix_grants_tenant_id_user_id_resource_id_action_id",
+            "tenant_id",
+            "user_id",
+            "resource_id",
+            "action_id",
+            "request_id",
+        ),
+    )
+
+    # No FK: retention may archive a permanent grant's request while the grant stays live.
+    request_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(64), nullable=False, server_default=DEFAULT_TENANT)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    resource_id: Mapped[int] = mapped_column(Integer, ForeignKey("catalog_resources.id"), nullable=False)
+    action_id: Mapped[int] = mapped_column(Integer, ForeignKey("catalog_actions.id"), nullable=False)
+
+    granted_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    granted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    catalog_resource: Mapped[CatalogResource] = relationship(lazy="selectin", viewonly=True)
+    catalog_action: Mapped[CatalogAction] = relationship(lazy="selectin", viewonly=True)
+
+    @property
+    def resource(self) -> str:
+        return self.catalog_resource.name
+
+    @property
+    def action(self) -> str:
+        return self.catalog_action.name
@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.base import Base
+
+
+class RequestStat(Base):
+    """Running count of access requests per (tenant, resource, status)."""
+
+    __tablename__ = "request_stats"
+
+    tenant_id: Mapped[str] = mapped_column(String(64), primary_key=True, server_default=DEFAULT_TENANT)
+    resource: Mapped[str] = mapped_column(String(255), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class RequestDecisionLatency(Base):
+    """Histogram of time-to-decision per resource, in half-power-of-two second buckets."""
+
+    __tablename__ = "request_decision_latency"
+
+    tenant_id: Mapped[str] = mapped_column(String(64), primary_key=True, server_default=DEFAULT_TENANT)
+    resource: Mapped[str] = mapped_column(String(255), primary_key=True)
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    total: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.base import Base
+
+
+class ReviewCampaign(Base):
+    """
+    A recertification of every grant a tenant had when it was generated.
+    The counters are kept in the transactions that add items and record
+    decisions, so progress is a primary-key read.
+    """
+
+    __tablename__ = "review_campaigns"
+    __table_args__ = (Index("ix_review_campaigns_tenant_id_created_at", "tenant_id", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[str] = mapped_column(String(64), nullable=False, server_default=DEFAULT_TENANT)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    # GENERATING -> OPEN -> CLOSED
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    created_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    due_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Last grant copied into items; generation resumes after it.
+    generated_through: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    item_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    certified_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    revoked_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    @property
+    def pending_count(self) -> int:
+        return self.item_count - self.certified_count - self.revoked_count
+
+
+class ReviewItem(Base):
+    """One grant to recertify, copied from `grants` when the campaign was generated."""
+
+    __tablename__ = "review_items"
+
+    campaign_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("review_campaigns.id", ondelete="CASCADE"), primary_key=True
+    )
+    request_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+
+    # No FKs: items are a point-in-time copy and must not slow the bulk insert down.
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    resource_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    action_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    granted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
+class ReviewDecision(Base):
+    """A reviewer's CERTIFY or REVOKE for one item; an item without a row is still pending."""
+
+    __tablename__ = "review_decisions"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["campaign_id", "request_id"],
+            ["review_items.campaign_id", "review_items.request_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+    campaign_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    request_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    decision: Mapped[str] = mapped_column(String(16), nullable=False)
+    decided_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    decided_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    comment: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,67 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.tenancy import DEFAULT_TENANT
+from app.db.base import Base
+
+
+class ApproverGroup(Base):
+    __tablename__ = "approver_groups"
+    __table_args__ = (Index("ux_approver_groups_tenant_id_name", "tenant_id", "name", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[str] = mapped_column(String(64), nullable=False, server_default=DEFAULT_TENANT)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ApproverGroupMember(Base):
+    __tablename__ = "approver_group_members"
+
+    group_id: Mapped[int] = mapped_column(Integer, ForeignKey("approver_groups.id", ondelete="CASCADE"), primary_key=True)
+    # "My groups" is looked up by user.
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+class RoutingRule(Base):
+    """Resources whose name starts with `resource_prefix` are owned by `group_id`; the longest prefix wins."""
+
+    __tablename__ = "routing_rules"
+    __table_args__ = (
+        Index("ux_routing_rules_tenant_id_resource_prefix", "tenant_id", "resource_prefix", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    tenant_id: Mapped[str] = mapped_column(String(64), nullable=False, server_default=DEFAULT_TENANT)
+    resource_prefix: Mapped[str] = mapped_column(String(255), nullable=False)
+    group_id: Mapped[int] = mapped_column(Integer, ForeignKey("approver_groups.id", ondelete="CASCADE"), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class RequestAssignment(Base):
+    """
+    Which group a request was routed to when it was created. `status` mirrors
+    the request so a group's open queue is one index range; `claimed_by` and
+    `lease_expires_at` hold a work claim until it is decided or the lease runs out.
+    """
+
+    __tablename__ = "request_assignments"
+    __table_args__ = (
+        Index("ix_request_assignments_group_id_status_created_at", "group_id", "status", "created_at", "request_id"),
+    )
+
+    request_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("access_requests.id", ondelete="CASCADE"), primary_key=True
+    )
+    group_id: Mapped[int] = mapped_column(Integer, ForeignKey("approver_groups.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    claimed_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
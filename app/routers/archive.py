@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.rbac import require_role
+from app.core.tenancy import tenant_of
+from app.db.deps import get_db
+from app.schemas.access_request import AccessRequestOut
+from app.schemas.audit import AuditEventOut, ComplianceRecordOut
+from app.services import retention_service
+
+router = APIRouter(prefix="/archive", tags=["archive"])
+
+
+@router.get("/requests/{request_id}", response_model=ComplianceRecordOut)
+def get_request_record(
+    request_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> ComplianceRecordOut:
+    tenant_id = tenant_of(claims)
+    found = retention_service.find_request(db, request_id, tenant_id=tenant_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    req, archived = found
+
+    events = retention_service.audit_trail(
+        db, tenant_id=tenant_id, entity_type="access_request", entity_id=request_id
+    )
+    return ComplianceRecordOut(
+        request=AccessRequestOut.model_validate(req),
+        archived=archived,
+        audit_events=[AuditEventOut.model_validate(e) for e in events],
+    )
@@ -1,22 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.jwt import create_access_token
+from app.core.rbac import get_current_claims, get_optional_claims, require_role
 from app.core.security import hash_password, verify_password
+from app.core.tenancy import DEFAULT_TENANT, tenant_of
 from app.db.deps import get_db
 from app.models.user import User
 from app.schemas.auth import LoginIn, RegisterIn, RegisterOut, TokenOut
+from app.services import audit_service, revocation_service
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=RegisterOut, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterIn, db: Session = Depends(get_db)) -> RegisterOut:
-    existing = db.query(User).filter(User.email == payload.email).first()
+def register(
+    payload: RegisterIn,
+    db: Session = Depends(get_db),
+    claims: dict | None = Depends(get_optional_claims),
+) -> RegisterOut:
+    db.info["tenant_id"] = payload.tenant_id
+    # Anyone may found a new tenant by registering its first user; after that only its admins add users.
+    invited = claims is not None and claims.get("role") == "ADMIN" and tenant_of(claims) == payload.tenant_id
+    if not invited and payload.tenant_id != DEFAULT_TENANT:
+        if db.query(User.id).filter(User.tenant_id == payload.tenant_id).first() is not None:
+            raise HTTPException(status_code=403, detail="Tenant already exists; ask one of its admins to add you")
+
+    existing = db.query(User).filter(User.tenant_id == payload.tenant_id, User.email == payload.email).first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     u = User(
+        tenant_id=payload.tenant_id,
         email=str(payload.email),
         password_hash=hash_password(payload.password),
         display_name=payload.display_name,
@@ -26,14 +44,61 @@ def register(payload: RegisterIn, db: Session = Depends(get_db)) -> RegisterOut:
     db.commit()
     db.refresh(u)
 
-    return RegisterOut(id=str(u.id), email=u.email, role=u.role)
+    return RegisterOut(id=str(u.id), email=u.email, role=u.role, tenant_id=u.tenant_id)
 
 
 @router.post("/login", response_model=TokenOut)
 def login(payload: LoginIn, db: Session = Depends(get_db)) -> TokenOut:
-    u = db.query(User).filter(User.email == payload.email).first()
+    db.info["tenant_id"] = payload.tenant_id
+    u = db.query(User).filter(User.tenant_id == payload.tenant_id, User.email == payload.email).first()
     if not u or not verify_password(payload.password, u.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    token = create_access_token(sub=str(u.id), role=u.role)
+    token = create_access_token(sub=str(u.id), role=u.role, tenant_id=u.tenant_id)
     return TokenOut(access_token=token)
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_current_token(
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> Response:
+    jti = claims.get("jti")
+    if not jti:
+        raise HTTPException(status_code=400, detail="Token cannot be revoked individually")
+
+    row = revocation_service.revoke_token(
+        db,
+        jti=str(jti),
+        subject_id=uuid.UUID(str(claims["sub"])),
+        expires_at=datetime.fromtimestamp(int(claims["exp"]), tz=timezone.utc),
+        reason="logout",
+    )
+    db.commit()
+    revocation_service.publish_local(row)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/users/{user_id}/revoke", status_code=status.HTTP_204_NO_CONTENT)
+def revoke_user_tokens(
+    user_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> Response:
+    user = db.get(User, user_id)
+    if user is None or user.tenant_id != tenant_of(claims):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    row = revocation_service.revoke_subject(db, subject_id=user_id, reason="revoked by admin")
+    audit_service.emit(
+        db,
+        tenant_id=user.tenant_id,
+        actor_id=uuid.UUID(str(claims["sub"])),
+        action="user.tokens_revoked",
+        entity_type="user",
+        entity_id=user_id,
+        details={"revoked_at": row.revoked_at.isoformat()},
+    )
+    db.commit()
+    revocation_service.publish_local(row)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from app.core import policy
+from app.core.rbac import get_current_claims
+from app.core.tenancy import tenant_of
+from app.db.deps import get_db
+from app.models.grant import Grant
+from app.schemas.grant import GrantOut
+from app.services import grants_service
+
+router = APIRouter(prefix="/grants", tags=["grants"])
+
+LimitQuery = Query(default=100, ge=1, le=500)
+
+
+def _check(claims: dict, user_id: uuid.UUID | None = None) -> None:
+    res = policy.can_view_grants(
+        actor_role=claims.get("role"),
+        actor_id=str(claims["sub"]),
+        user_id=str(user_id) if user_id is not None else None,
+    )
+    if not res.allowed:
+        raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
+
+
+@router.get("", response_model=list[GrantOut])
+def who_has_access(
+    response: Response,
+    resource: str = Query(min_length=1, max_length=255),
+    action: str | None = Query(default=None, max_length=64),
+    limit: int = LimitQuery,
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> list[Grant]:
+    _check(claims)
+    try:
+        rows, next_cursor = grants_service.who_has_access(
+            db, tenant_id=tenant_of(claims), resource=resource, action=action, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+
+@router.get("/users/{user_id}", response_model=list[GrantOut])
+def user_access(
+    user_id: uuid.UUID,
+    response: Response,
+    limit: int = LimitQuery,
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> list[Grant]:
+    _check(claims, user_id)
+    try:
+        rows, next_cursor = grants_service.user_access(
+            db, tenant_id=tenant_of(claims), user_id=user_id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
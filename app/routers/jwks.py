@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Request, Response, status
+
+from app.core import keys
+from app.core.config import jwks_max_age_seconds
+
+router = APIRouter(tags=["auth"])
+
+
+@router.get("/.well-known/jwks.json")
+def jwks(request: Request) -> Response:
+    body, etag = keys.jwks()
+    headers = {"Cache-Control": f"public, max-age={jwks_max_age_seconds()}", "ETag": etag}
+    # Weak comparison: the compression middleware may have served the tag as W/"...".
+    offered = {tag.strip().removeprefix("W/") for tag in request.headers.get("if-none-match", "").split(",")}
+    if etag in offered or "*" in offered:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -3,55 +3,227 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.core import policy
+from app.core.clock import as_utc, utcnow
+from app.core.config import claim_lease_seconds, stats_max_age_seconds
 from app.core.rbac import get_current_claims, require_role
+from app.core.tenancy import tenant_of
 from app.db.deps import get_db
 from app.models.access_request import AccessRequest, RequestStatus
-from app.schemas.access_request import AccessRequestCreate, AccessRequestOut
-from app.services import audit_service
+from app.models.archive import AccessRequestArchive
+from app.models.catalog import CatalogAction, CatalogResource
+from app.models.idempotency import IdempotencyKey
+from app.schemas.access_request import AccessRequestCreate, AccessRequestOut, RequestStatsOut
+from app.services import (
+    audit_service,
+    catalog_service,
+    grants_service,
+    idempotency_service,
+    request_service,
+    retention_service,
+    routing_service,
+    search_service,
+    stats_service,
+)
 
 router = APIRouter(prefix="/requests", tags=["requests"])
 
+IdempotencyKeyHeader = Header(default=None, alias="Idempotency-Key", max_length=255)
+
+
+def _claim_idempotency(
+    db: Session,
+    key: str | None,
+    claims: dict,
+    scope: str,
+    payload: dict,
+) -> IdempotencyKey | None:
+    try:
+        return idempotency_service.claim(
+            db,
+            key=key,
+            actor_id=uuid.UUID(str(claims["sub"])),
+            scope=scope,
+            payload=payload,
+        )
+    except idempotency_service.IdempotencyKeyReused as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+
+def _replay(record: IdempotencyKey) -> JSONResponse:
+    return JSONResponse(
+        status_code=record.status_code or status.HTTP_200_OK,
+        content=record.response_body,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def _complete_idempotency(
+    db: Session, record: IdempotencyKey | None, status_code: int, req: AccessRequest | AccessRequestArchive
+) -> None:
+    if record is None:
+        return
+    db.flush()
+    db.refresh(req)
+    body = AccessRequestOut.model_validate(req).model_dump(mode="json")
+    idempotency_service.complete(db, record, status_code=status_code, body=body)
+
+
+FieldsQuery = Query(
+    default=None,
+    max_length=500,
+    description="Comma-separated subset of AccessRequestOut fields, e.g. id,status,resource",
+)
+
+
+def _parse_fields(fields: str | None) -> set[str] | None:
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(AccessRequestOut.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested or None
+
+
+# Names live in the catalog; a projection that asks for them joins it.
+_CATALOG_FIELDS = {
+    "resource": (CatalogResource, CatalogResource.id == AccessRequest.resource_id),
+    "action": (CatalogAction, CatalogAction.id == AccessRequest.action_id),
+}
+
+
+def _project(query, columns: set[str]):
+    # Narrow the SELECT list itself, not just the serialized output.
+    query = query.with_entities(
+        *(
+            _CATALOG_FIELDS[name][0].name.label(name) if name in _CATALOG_FIELDS else getattr(AccessRequest, name)
+            for name in sorted(columns)
+        )
+    )
+    for name in sorted(columns & _CATALOG_FIELDS.keys()):
+        target, onclause = _CATALOG_FIELDS[name]
+        query = query.join(target, onclause)
+    return query
+
+
+def _sparse_response(rows, projection: set[str], headers: dict[str, str] | None = None) -> JSONResponse:
+    ordered = [name for name in AccessRequestOut.model_fields if name in projection]
+    content = jsonable_encoder([{name: row._mapping[name] for name in ordered} for row in rows])
+    return JSONResponse(content=content, headers=headers)
+
 
 @router.post("", response_model=AccessRequestOut, status_code=status.HTTP_201_CREATED)
 def create_request(
     payload: AccessRequestCreate,
+    response: Response,
     db: Session = Depends(get_db),
     claims: dict = Depends(require_role("REQUESTER", "APPROVER", "ADMIN")),
-) -> AccessRequest:
-    req = AccessRequest(
+    idempotency_key: str | None = IdempotencyKeyHeader,
+) -> AccessRequestOut:
+    idem = _claim_idempotency(db, idempotency_key, claims, "POST /requests", payload.model_dump(mode="json"))
+    if idem is not None and idem.status_code is not None:
+        return _replay(idem)
+
+    # A re-submission while the same request is still PENDING returns that request (200).
+    tenant_id = tenant_of(claims)
+    row, created = request_service.create_pending(
+        db,
+        tenant_id=tenant_id,
         requester_id=uuid.UUID(str(claims["sub"])),
-        resource=payload.resource,
-        action=payload.action,
+        resource_id=catalog_service.resource_id(db, payload.resource),
+        action_id=catalog_service.action_id(db, payload.action),
         justification=payload.justification,
-        status=RequestStatus.PENDING,
+        expires_at=payload.expires_at,
     )
-    db.add(req)
+    out = AccessRequestOut.model_validate({**row._mapping, "resource": payload.resource, "action": payload.action})
+    status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+
+    if created:
+        stats_service.record_created(db, tenant_id=tenant_id, resource=payload.resource)
+        routing_service.assign(
+            db, tenant_id=tenant_id, request_id=row.id, resource=payload.resource, created_at=row.created_at
+        )
+    if idem is not None:
+        idempotency_service.complete(db, idem, status_code=status_code, body=out.model_dump(mode="json"))
     db.commit()
-    db.refresh(req)
-    return req
+
+    response.status_code = status_code
+    return out
 
 
 @router.get("", response_model=list[AccessRequestOut])
 def list_requests(
+    response: Response,
+    q: str | None = Query(default=None, max_length=200, description="Prefix-matched terms over resource, action and justification"),
+    resource_prefix: str | None = Query(default=None, max_length=255),
+    status_filter: RequestStatus | None = Query(default=None, alias="status"),
+    requester_id: uuid.UUID | None = None,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
+    fields: str | None = FieldsQuery,
     db: Session = Depends(get_db),
     claims: dict = Depends(get_current_claims),
 ) -> list[AccessRequest]:
     role = (claims.get("role") or "").strip().upper()
     user_id = uuid.UUID(str(claims["sub"]))
+    dialect = db.get_bind().dialect.name
 
-    q = db.query(AccessRequest)
+    query = db.query(AccessRequest).filter(AccessRequest.tenant_id == tenant_of(claims))
     if role == "REQUESTER":
-        q = q.filter(AccessRequest.requester_id == user_id)
+        query = query.filter(AccessRequest.requester_id == user_id)
+    elif requester_id is not None:
+        query = query.filter(AccessRequest.requester_id == requester_id)
+    if status_filter is not None:
+        query = query.filter(AccessRequest.status == status_filter)
+
+    query = search_service.apply_text_search(query, dialect, q)
+    query = search_service.apply_resource_prefix(query, resource_prefix)
+    try:
+        query = search_service.apply_keyset(query, dialect, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    projection = _parse_fields(fields)
+    if projection is not None:
+        # Cursor columns are always selected; they are dropped again on output.
+        query = _project(query, projection | {"id", "created_at"})
+
+    rows = query.all() if limit is None else query.limit(limit + 1).all()
+    headers: dict[str, str] = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = search_service.encode_cursor(rows[-1])
+
+    if projection is None:
+        response.headers.update(headers)
+        return rows
+    return _sparse_response(rows, projection, headers)
+
+
+@router.get("/stats", response_model=RequestStatsOut)
+def request_stats(
+    response: Response,
+    resource: str | None = Query(default=None, max_length=255),
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> dict:
+    res = policy.can_access_pending_queue(claims.get("role"))
+    if not res.allowed:
+        raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
 
-    return q.order_by(AccessRequest.created_at.desc()).all()
+    response.headers["Cache-Control"] = f"private, max-age={int(stats_max_age_seconds())}"
+    return stats_service.snapshot(db, tenant_id=tenant_of(claims), resource=resource)
 
 
 @router.get("/pending", response_model=list[AccessRequestOut])
 def list_pending_requests(
+    fields: str | None = FieldsQuery,
     db: Session = Depends(get_db),
     claims: dict = Depends(get_current_claims),
 ) -> list[AccessRequest]:
@@ -59,17 +231,78 @@ def list_pending_requests(
     if not res.allowed:
         raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
 
-    return (
+    query = (
         db.query(AccessRequest)
-        .filter(AccessRequest.status == RequestStatus.PENDING)
+        .filter(AccessRequest.tenant_id == tenant_of(claims), AccessRequest.status == RequestStatus.PENDING)
         .order_by(AccessRequest.created_at.desc())
-        .all()
     )
+    projection = _parse_fields(fields)
+    if projection is None:
+        return query.all()
+    return _sparse_response(_project(query, projection).all(), projection)
+
+
+@router.get("/queue", response_model=list[AccessRequestOut])
+def my_queue(
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> list[AccessRequest]:
+    """Pending requests routed to the caller's approver groups, oldest first."""
+    res = policy.can_access_pending_queue(claims.get("role"))
+    if not res.allowed:
+        raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
+
+    try:
+        rows, next_cursor = routing_service.my_queue(db, user_id=uuid.UUID(str(claims["sub"])), limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+
+@router.post("/queue/claim", response_model=list[AccessRequestOut])
+def claim_from_queue(
+    limit: int = Query(default=1, ge=1, le=50),
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> list[AccessRequestOut]:
+    """Lease the oldest unclaimed requests in the caller's queue for CLAIM_LEASE_SECONDS."""
+    res = policy.can_access_pending_queue(claims.get("role"))
+    if not res.allowed:
+        raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
+
+    rows = routing_service.claim(
+        db, user_id=uuid.UUID(str(claims["sub"])), limit=limit, lease_seconds=claim_lease_seconds()
+    )
+    out = [AccessRequestOut.model_validate(r) for r in rows]
+    db.commit()
+    return out
+
+
+@router.delete("/{request_id}/claim", status_code=status.HTTP_204_NO_CONTENT)
+def release_claim(
+    request_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> Response:
+    routing_service.release(db, request_id=request_id, user_id=uuid.UUID(str(claims["sub"])))
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-def _get_request(db: Session, request_id: uuid.UUID) -> AccessRequest:
-    req = db.get(AccessRequest, request_id)
-    if not req:
+def _get_request(db: Session, request_id: uuid.UUID, claims: dict) -> AccessRequest:
+    """
+    Load a request to decide on, row-locked until the transaction ends: a
+    concurrent decision waits here and then sees the new status, so only one
+    of them passes the policy check and records stats, audit and grants.
+    """
+    # Another tenant's request is indistinguishable from a missing one.
+    req = db.get(AccessRequest, request_id, with_for_update=True, populate_existing=True)
+    if not req or req.tenant_id != tenant_of(claims):
         raise HTTPException(status_code=404, detail="Request not found")
     return req
 
@@ -79,8 +312,13 @@ def approve_request(
     request_id: uuid.UUID,
     db: Session = Depends(get_db),
     claims: dict = Depends(get_current_claims),
+    idempotency_key: str | None = IdempotencyKeyHeader,
 ) -> AccessRequest:
-    req = _get_request(db, request_id)
+    idem = _claim_idempotency(db, idempotency_key, claims, "PATCH /requests/{id}/approve", {"request_id": str(request_id)})
+    if idem is not None and idem.status_code is not None:
+        return _replay(idem)
+
+    req = _get_request(db, request_id, claims)
 
     actor_id = str(claims["sub"])
     requester_id = str(req.requester_id)
@@ -91,6 +329,8 @@ def approve_request(
         actor_id=actor_id,
         requester_id=requester_id,
         current_status=current_status,
+        expired=req.expires_at is not None and as_utc(req.expires_at) <= utcnow(),
+        claimed_by_other=routing_service.claimed_by_other(db, request_id=req.id, user_id=uuid.UUID(actor_id)),
     )
     if not res.allowed:
         raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
@@ -99,8 +339,19 @@ def approve_request(
     req.decided_by = uuid.UUID(actor_id)
     req.decided_at = datetime.now(timezone.utc)
 
+    stats_service.record_transition(
+        db,
+        tenant_id=req.tenant_id,
+        resource=req.resource,
+        from_status="PENDING",
+        to_status="APPROVED",
+        created_at=req.created_at,
+        decided_at=req.decided_at,
+    )
+
     audit_service.emit(
         db,
+        tenant_id=req.tenant_id,
         actor_id=req.decided_by,
         action="access_request.approved",
         entity_type="access_request",
@@ -111,9 +362,14 @@ def approve_request(
             "action": req.action,
             "previous_status": "PENDING",
             "new_status": "APPROVED",
+            # Policy replay evaluates the role the decider held then, not whatever it is now.
+            "actor_role": claims.get("role"),
         },
     )
+    grants_service.add(db, req)
+    routing_service.close(db, [req.id], RequestStatus.APPROVED.value)
 
+    _complete_idempotency(db, idem, status.HTTP_200_OK, req)
     db.commit()
     db.refresh(req)
     return req
@@ -124,8 +380,13 @@ def reject_request(
     request_id: uuid.UUID,
     db: Session = Depends(get_db),
     claims: dict = Depends(get_current_claims),
+    idempotency_key: str | None = IdempotencyKeyHeader,
 ) -> AccessRequest:
-    req = _get_request(db, request_id)
+    idem = _claim_idempotency(db, idempotency_key, claims, "PATCH /requests/{id}/reject", {"request_id": str(request_id)})
+    if idem is not None and idem.status_code is not None:
+        return _replay(idem)
+
+    req = _get_request(db, request_id, claims)
 
     actor_id = str(claims["sub"])
     requester_id = str(req.requester_id)
@@ -136,6 +397,8 @@ def reject_request(
         actor_id=actor_id,
         requester_id=requester_id,
         current_status=current_status,
+        expired=req.expires_at is not None and as_utc(req.expires_at) <= utcnow(),
+        claimed_by_other=routing_service.claimed_by_other(db, request_id=req.id, user_id=uuid.UUID(actor_id)),
     )
     if not res.allowed:
         raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
@@ -144,8 +407,19 @@ def reject_request(
     req.decided_by = uuid.UUID(actor_id)
     req.decided_at = datetime.now(timezone.utc)
 
+    stats_service.record_transition(
+        db,
+        tenant_id=req.tenant_id,
+        resource=req.resource,
+        from_status="PENDING",
+        to_status="REJECTED",
+        created_at=req.created_at,
+        decided_at=req.decided_at,
+    )
+
     audit_service.emit(
         db,
+        tenant_id=req.tenant_id,
         actor_id=req.decided_by,
         action="access_request.rejected",
         entity_type="access_request",
@@ -156,9 +430,65 @@ def reject_request(
             "action": req.action,
             "previous_status": "PENDING",
             "new_status": "REJECTED",
+            # Policy replay evaluates the role the decider held then, not whatever it is now.
+            "actor_role": claims.get("role"),
+        },
+    )
+    routing_service.close(db, [req.id], RequestStatus.REJECTED.value)
+
+    _complete_idempotency(db, idem, status.HTTP_200_OK, req)
+    db.commit()
+    db.refresh(req)
+    return req
+
+@router.patch("/{request_id}/revoke", response_model=AccessRequestOut)
+def revoke_request(
+    request_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+    idempotency_key: str | None = IdempotencyKeyHeader,
+) -> AccessRequest | AccessRequestArchive:
+    idem = _claim_idempotency(db, idempotency_key, claims, "PATCH /requests/{id}/revoke", {"request_id": str(request_id)})
+    if idem is not None and idem.status_code is not None:
+        return _replay(idem)
+
+    # A permanent grant outlives its request's move to the archive, so revocation looks there too.
+    found = retention_service.find_request(db, request_id, tenant_id=tenant_of(claims), for_update=True)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    req, archived = found
+
+    current_status = req.status.value if hasattr(req.status, "value") else str(req.status)
+    res = policy.can_revoke_grant(actor_role=claims.get("role"), current_status=current_status)
+    if not res.allowed:
+        raise HTTPException(status_code=res.status_code or 403, detail=res.detail or "Forbidden")
+
+    # decided_by/decided_at keep recording the approval; the revocation is in the audit trail.
+    # The archive row changes too, or `grants rebuild` would bring the grant back.
+    req.status = RequestStatus.REVOKED.value if archived else RequestStatus.REVOKED
+
+    stats_service.record_transition(
+        db, tenant_id=req.tenant_id, resource=req.resource, from_status="APPROVED", to_status="REVOKED"
+    )
+    grants_service.remove(db, [req.id])
+
+    audit_service.emit(
+        db,
+        tenant_id=req.tenant_id,
+        actor_id=uuid.UUID(str(claims["sub"])),
+        action="access_request.revoked",
+        entity_type="access_request",
+        entity_id=req.id,
+        details={
+            "requester_id": str(req.requester_id),
+            "resource": req.resource,
+            "action": req.action,
+            "previous_status": "APPROVED",
+            "new_status": "REVOKED",
         },
     )
 
+    _complete_idempotency(db, idem, status.HTTP_200_OK, req)
     db.commit()
     db.refresh(req)
-    return req
\ No newline at end of file
+    return req
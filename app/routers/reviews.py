@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.rbac import get_current_claims, require_role
+from app.core.tenancy import tenant_of
+from app.db.deps import get_db
+from app.models.review import ReviewCampaign
+from app.schemas.review import (
+    RejectedItem,
+    ReviewCampaignCreate,
+    ReviewCampaignOut,
+    ReviewDecisionsIn,
+    ReviewDecisionsOut,
+    ReviewItemOut,
+)
+from app.services import review_service
+
+router = APIRouter(prefix="/reviews", tags=["reviews"])
+
+LimitQuery = Query(default=100, ge=1, le=1000)
+
+
+@router.post("/campaigns", response_model=ReviewCampaignOut, status_code=status.HTTP_201_CREATED)
+def create_campaign(
+    payload: ReviewCampaignCreate,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> ReviewCampaign:
+    campaign = review_service.create_campaign(
+        db,
+        tenant_id=tenant_of(claims),
+        name=payload.name,
+        created_by=uuid.UUID(str(claims["sub"])),
+        due_at=payload.due_at,
+    )
+    db.commit()
+    db.refresh(campaign)
+    return campaign
+
+
+@router.get("/campaigns", response_model=list[ReviewCampaignOut])
+def list_campaigns(
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("APPROVER", "ADMIN")),
+) -> list[ReviewCampaign]:
+    return review_service.list_campaigns(db, tenant_id=tenant_of(claims))
+
+
+@router.get("/campaigns/{campaign_id}", response_model=ReviewCampaignOut)
+def campaign_progress(
+    campaign_id: int,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("APPROVER", "ADMIN")),
+) -> ReviewCampaign:
+    try:
+        return review_service.get_campaign(db, tenant_id=tenant_of(claims), campaign_id=campaign_id)
+    except review_service.UnknownCampaign as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/campaigns/{campaign_id}/items", response_model=list[ReviewItemOut])
+def list_items(
+    campaign_id: int,
+    response: Response,
+    pending: bool = False,
+    limit: int = LimitQuery,
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("APPROVER", "ADMIN")),
+):
+    try:
+        rows, next_cursor = review_service.list_items(
+            db, tenant_id=tenant_of(claims), campaign_id=campaign_id, pending_only=pending, limit=limit, cursor=cursor
+        )
+    except review_service.UnknownCampaign as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+
+@router.post("/campaigns/{campaign_id}/decisions", response_model=ReviewDecisionsOut)
+def decide_items(
+    campaign_id: int,
+    payload: ReviewDecisionsIn,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(get_current_claims),
+) -> ReviewDecisionsOut:
+    try:
+        result = review_service.decide(
+            db,
+            tenant_id=tenant_of(claims),
+            campaign_id=campaign_id,
+            request_ids=payload.request_ids,
+            decision=payload.decision,
+            actor_id=uuid.UUID(str(claims["sub"])),
+            actor_role=claims.get("role"),
+            comment=payload.comment,
+        )
+    except review_service.UnknownCampaign as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except review_service.CampaignNotOpen as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    db.commit()
+    return ReviewDecisionsOut(
+        decided=result.decided,
+        rejected=[RejectedItem(request_id=rid, status_code=code, detail=detail) for rid, code, detail in result.rejected],
+    )
+
+
+@router.post("/campaigns/{campaign_id}/close", response_model=ReviewCampaignOut)
+def close_campaign(
+    campaign_id: int,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> ReviewCampaign:
+    try:
+        campaign = review_service.close_campaign(db, tenant_id=tenant_of(claims), campaign_id=campaign_id)
+    except review_service.UnknownCampaign as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    db.commit()
+    db.refresh(campaign)
+    return campaign
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from app.core.rbac import require_role
+from app.core.tenancy import tenant_of
+from app.db.deps import get_db
+from app.models.routing import ApproverGroup, RoutingRule
+from app.schemas.routing import ApproverGroupCreate, ApproverGroupOut, RoutingRuleCreate, RoutingRuleOut
+from app.services import routing_service
+
+router = APIRouter(prefix="/routing", tags=["routing"])
+
+
+@router.post("/groups", response_model=ApproverGroupOut, status_code=status.HTTP_201_CREATED)
+def create_group(
+    payload: ApproverGroupCreate,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> ApproverGroup:
+    try:
+        group = routing_service.create_group(db, tenant_id=tenant_of(claims), name=payload.name)
+    except routing_service.RoutingConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    db.commit()
+    db.refresh(group)
+    return group
+
+
+@router.put("/groups/{group_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def add_group_member(
+    group_id: int,
+    user_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> Response:
+    try:
+        routing_service.add_member(db, tenant_id=tenant_of(claims), group_id=group_id, user_id=user_id)
+    except (routing_service.UnknownGroup, routing_service.UnknownUser) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.delete("/groups/{group_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_group_member(
+    group_id: int,
+    user_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> Response:
+    try:
+        routing_service.remove_member(db, tenant_id=tenant_of(claims), group_id=group_id, user_id=user_id)
+    except routing_service.UnknownGroup as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post("/rules", response_model=RoutingRuleOut, status_code=status.HTTP_201_CREATED)
+def create_rule(
+    payload: RoutingRuleCreate,
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> RoutingRule:
+    try:
+        rule = routing_service.create_rule(
+            db, tenant_id=tenant_of(claims), resource_prefix=payload.resource_prefix, group_id=payload.group_id
+        )
+    except routing_service.UnknownGroup as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except routing_service.RoutingConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    db.commit()
+    db.refresh(rule)
+    return rule
+
+
+@router.get("/rules", response_model=list[RoutingRuleOut])
+def list_rules(
+    db: Session = Depends(get_db),
+    claims: dict = Depends(require_role("ADMIN")),
+) -> list[RoutingRule]:
+    return routing_service.list_rules(db, tenant_id=tenant_of(claims))
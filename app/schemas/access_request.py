@@ -4,7 +4,9 @@ import uuid
 from datetime import datetime
 from typing import Optional
 from pydantic import ConfigDict
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
+
+from app.core.clock import as_utc, utcnow
 
 from app.models.access_request import RequestStatus
 
@@ -13,6 +15,17 @@ class AccessRequestCreate(BaseModel):
     resource: str = Field(min_length=1, max_length=255)
     action: str = Field(min_length=1, max_length=64)
     justification: Optional[str] = None
+    expires_at: Optional[datetime] = None
+
+    @field_validator("expires_at")
+    @classmethod
+    def _expires_in_future(cls, v: Optional[datetime]) -> Optional[datetime]:
+        if v is None:
+            return v
+        v = as_utc(v)
+        if v <= utcnow():
+            raise ValueError("expires_at must be in the future")
+        return v
 
 
 class AccessRequestOut(BaseModel):
@@ -24,7 +37,20 @@ class AccessRequestOut(BaseModel):
     status: RequestStatus
     decided_by: Optional[uuid.UUID]
     decided_at: Optional[datetime]
+    expires_at: Optional[datetime] = None
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
-    
\ No newline at end of file
+
+
+class ResourceStatsOut(BaseModel):
+    resource: str
+    counts: dict[str, int]
+    median_decision_seconds: Optional[float]
+
+
+class RequestStatsOut(BaseModel):
+    as_of: datetime
+    counts: dict[str, int]
+    median_decision_seconds: Optional[float]
+    resources: list[ResourceStatsOut]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.access_request import AccessRequestOut
+
+
+class AuditEventOut(BaseModel):
+    id: uuid.UUID
+    actor_id: Optional[uuid.UUID]
+    action: str
+    entity_type: str
+    entity_id: uuid.UUID
+    details: dict[str, Any]
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ComplianceRecordOut(BaseModel):
+    request: AccessRequestOut
+    archived: bool
+    audit_events: list[AuditEventOut]
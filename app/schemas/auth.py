@@ -1,22 +1,27 @@
 from pydantic import BaseModel, EmailStr, Field
 
+from app.core.tenancy import DEFAULT_TENANT, TENANT_PATTERN
+
 
 class RegisterIn(BaseModel):
     email: EmailStr
     password: str = Field(min_length=8)
     display_name: str | None = None
     role: str = "REQUESTER"
+    tenant_id: str = Field(default=DEFAULT_TENANT, pattern=TENANT_PATTERN)
 
 
 class RegisterOut(BaseModel):
     id: str
     email: EmailStr
     role: str
+    tenant_id: str
 
 
 class LoginIn(BaseModel):
     email: EmailStr
     password: str
+    tenant_id: str = Field(default=DEFAULT_TENANT, pattern=TENANT_PATTERN)
 
 
 class TokenOut(BaseModel):
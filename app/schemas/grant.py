@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class GrantOut(BaseModel):
+    request_id: uuid.UUID
+    user_id: uuid.UUID
+    resource: str
+    action: str
+    granted_by: Optional[uuid.UUID] = None
+    granted_at: datetime
+    expires_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
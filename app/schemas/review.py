@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ReviewCampaignCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=128)
+    due_at: Optional[datetime] = None
+
+
+class ReviewCampaignOut(BaseModel):
+    id: int
+    name: str
+    status: str
+    created_by: Optional[uuid.UUID] = None
+    created_at: datetime
+    due_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+    item_count: int
+    certified_count: int
+    revoked_count: int
+    pending_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewItemOut(BaseModel):
+    request_id: uuid.UUID
+    user_id: uuid.UUID
+    resource: str
+    action: str
+    granted_at: datetime
+    decision: Optional[str] = None
+    decided_by: Optional[uuid.UUID] = None
+    decided_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReviewDecisionsIn(BaseModel):
+    request_ids: list[uuid.UUID] = Field(min_length=1, max_length=1000)
+    decision: Literal["CERTIFY", "REVOKE"]
+    comment: Optional[str] = Field(default=None, max_length=2000)
+
+
+class RejectedItem(BaseModel):
+    request_id: uuid.UUID
+    status_code: int
+    detail: str
+
+
+class ReviewDecisionsOut(BaseModel):
+    decided: list[uuid.UUID]
+    rejected: list[RejectedItem]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ApproverGroupCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=128)
+
+
+class ApproverGroupOut(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RoutingRuleCreate(BaseModel):
+    resource_prefix: str = Field(min_length=1, max_length=255)
+    group_id: int
+
+
+class RoutingRuleOut(BaseModel):
+    id: int
+    resource_prefix: str
+    group_id: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import json
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import func, select, union_all, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import merkle
+from app.core.clock import as_utc
+from app.core.tenancy import DEFAULT_TENANT
+from app.models.archive import AuditEventArchive
+from app.models.audit import AuditChainHead, AuditCheckpoint, AuditEvent
+
+HEAD_ID = 1
+_EVENT_COLUMNS = (
+    "id",
+    "tenant_id",
+    "actor_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "details",
+    "created_at",
+    "seq",
+    "prev_hash",
+    "hash",
+)
+
+
+def canonical(event) -> bytes:
+    """The bytes an event's chain hash commits to; stable across dialects and the archive."""
+    content = {
+        "id": str(event.id),
+        "actor_id": str(event.actor_id) if event.actor_id is not None else None,
+        "action": event.action,
+        "entity_type": event.entity_type,
+        "entity_id": str(event.entity_id),
+        "details": event.details,
+        "created_at": as_utc(event.created_at).isoformat(timespec="microseconds"),
+    }
+    # Left out for the default tenant, so events sealed before tenancy keep their hashes.
+    if event.tenant_id != DEFAULT_TENANT:
+        content["tenant_id"] = event.tenant_id
+    return json.dumps(content, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _head(db: Session) -> AuditChainHead:
+    head = db.get(AuditChainHead, HEAD_ID, with_for_update=True)
+    if head is None:
+        head = AuditChainHead(id=HEAD_ID, last_seq=0, last_hash=merkle.GENESIS)
+        db.add(head)
+        db.flush()
+    return head
+
+
+def seal_batch(db: Session, *, batch_size: int = 1000) -> int:
+    """
+    Chain up to `batch_size` unsealed events onto the head and commit.
+
+    Writers only insert; the chain is extended here, in batches, by whoever
+    holds the head row lock, so request transactions never wait on each other
+    for the hash. Events are sealed in (created_at, id) order as they become
+    visible, so `seq` is the sealing order.
+    """
+    head = _head(db)
+    rows = db.execute(
+        select(AuditEvent)
+        .where(AuditEvent.seq.is_(None))
+        .order_by(AuditEvent.created_at, AuditEvent.id)
+        .limit(batch_size)
+    ).scalars().all()
+    if not rows:
+        db.commit()
+        return 0
+
+    seq, prev = head.last_seq, head.last_hash
+    changes = []
+    for event in rows:
+        seq += 1
+        h = merkle.chain(prev, canonical(event))
+        changes.append({"id": event.id, "seq": seq, "prev_hash": prev, "hash": h})
+        prev = h
+    db.execute(update(AuditEvent), changes)
+
+    head.last_seq, head.last_hash = seq, prev
+    db.commit()
+    return len(rows)
+
+
+def _chain_rows(db: Session, first_seq: int, last_seq: int, columns=_EVENT_COLUMNS):
+    """Sealed events first_seq..last_seq from the live and archive tables, in seq order."""
+    live = select(*(AuditEvent.__table__.c[c] for c in columns)).where(AuditEvent.seq.between(first_seq, last_seq))
+    archived = select(*(AuditEventArchive.__table__.c[c] for c in columns)).where(
+        AuditEventArchive.seq.between(first_seq, last_seq)
+    )
+    both = union_all(live, archived).subquery()
+    return db.execute(select(both).order_by(both.c.seq)).all()
+
+
+def build_checkpoints(db: Session, *, size: int) -> int:
+    """Write a Merkle checkpoint for every complete run of `size` sealed events; commits."""
+    head_seq = db.scalar(select(AuditChainHead.last_seq).where(AuditChainHead.id == HEAD_ID)) or 0
+    last = db.scalar(select(func.max(AuditCheckpoint.last_seq))) or 0
+    written = 0
+    while head_seq - last >= size:
+        rows = _chain_rows(db, last + 1, last + size, ("seq", "hash"))
+        db.add(
+            AuditCheckpoint(
+                first_seq=last + 1,
+                last_seq=last + size,
+                root=merkle.root([r.hash for r in rows]),
+                last_hash=rows[-1].hash,
+            )
+        )
+        db.commit()
+        last += size
+        written += 1
+    return written
+
+
+def seal(db: Session, *, batch_size: int = 1000, checkpoint_size: int = 1024) -> tuple[int, int]:
+    """Seal everything visible now, then checkpoint; returns (events sealed, checkpoints written)."""
+    sealed = 0
+    while True:
+        n = seal_batch(db, batch_size=batch_size)
+        sealed += n
+        if n < batch_size:
+            break
+    return sealed, build_checkpoints(db, size=checkpoint_size)
+
+
+@dataclass(frozen=True)
+class _Range:
+    first_seq: int
+    last_seq: int
+    prev_hash: str
+    root: str | None = None
+    last_hash: str | None = None
+
+
+def verify_range(db: Session, r: _Range) -> tuple[int, list[str]]:
+    """Recompute the chain (and root, for checkpointed ranges) of one partition."""
+    rows = _chain_rows(db, r.first_seq, r.last_seq)
+    problems: list[str] = []
+
+    expected_seq, prev = r.first_seq, r.prev_hash
+    for row in rows:
+        if row.seq != expected_seq:
+            problems.append(f"seq {expected_seq}..{row.seq - 1}: missing events")
+            expected_seq = row.seq
+        if row.prev_hash != prev:
+            problems.append(f"seq {row.seq}: chain broken (event {row.id})")
+        if merkle.chain(row.prev_hash, canonical(row)) != row.hash:
+            problems.append(f"seq {row.seq}: content does not match hash (event {row.id})")
+        prev = row.hash
+        expected_seq += 1
+    if expected_seq <= r.last_seq:
+        problems.append(f"seq {expected_seq}..{r.last_seq}: missing events")
+
+    if r.root is not None and merkle.root([row.hash for row in rows]) != r.root:
+        problems.append(f"checkpoint {r.first_seq}..{r.last_seq}: Merkle root mismatch")
+    if r.last_hash is not None and prev != r.last_hash:
+        problems.append(f"checkpoint {r.first_seq}..{r.last_seq}: last hash mismatch")
+    return len(rows), problems
+
+
+@dataclass
+class VerifyReport:
+    events: int = 0
+    partitions: int = 0
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def _partitions(db: Session, since: datetime | None) -> list[_Range]:
+    checkpoints = db.execute(
+        select(AuditCheckpoint.first_seq, AuditCheckpoint.last_seq, AuditCheckpoint.root, AuditCheckpoint.last_hash)
+        .order_by(AuditCheckpoint.last_seq)
+    ).all()
+    head = db.get(AuditChainHead, HEAD_ID)
+
+    ranges: list[_Range] = []
+    prev = merkle.GENESIS
+    for cp in checkpoints:
+        ranges.append(_Range(cp.first_seq, cp.last_seq, prev, cp.root, cp.last_hash))
+        prev = cp.last_hash
+    covered = checkpoints[-1].last_seq if checkpoints else 0
+    if head is not None and head.last_seq > covered:
+        # Sealed but not yet checkpointed: chain check only, ending at the head.
+        ranges.append(_Range(covered + 1, head.last_seq, prev, None, head.last_hash))
+
+    if since is not None:
+        start = _first_seq_since(db, since)
+        ranges = [r for r in ranges if start is not None and r.last_seq >= start]
+    return ranges
+
+
+def _first_seq_since(db: Session, since: datetime) -> int | None:
+    live = db.scalar(select(func.min(AuditEvent.seq)).where(AuditEvent.created_at >= since))
+    archived = db.scalar(select(func.min(AuditEventArchive.seq)).where(AuditEventArchive.created_at >= since))
+    found = [s for s in (live, archived) if s is not None]
+    return min(found) if found else None
+
+
+_worker_sessions: sessionmaker | None = None
+
+
+def _init_worker(tenant_id: str | None) -> None:
+    global _worker_sessions
+    from app.db.session import dispose_engine, sessions_for
+
+    # Connections inherited over fork belong to the parent.
+    dispose_engine(close=False)
+    _worker_sessions = sessions_for(tenant_id)
+
+
+def _verify_in_worker(r: _Range) -> tuple[int, list[str]]:
+    with _worker_sessions() as db:
+        return verify_range(db, r)
+
+
+def verify(
+    session_factory: sessionmaker,
+    *,
+    workers: int = 1,
+    since: datetime | None = None,
+    tenant_id: str | None = None,
+) -> VerifyReport:
+    """
+    Verify the sealed log one partition (checkpoint range) at a time. Each
+    partition is checked independently against the stored root and the
+    previous checkpoint's last hash, so partitions run in parallel processes.
+    Worker processes open sessions routed like `tenant_id` (see
+    session.sessions_for), which should match `session_factory`.
+    """
+    with session_factory() as db:
+        ranges = _partitions(db, since)
+
+    report = VerifyReport(partitions=len(ranges))
+    if workers <= 1 or len(ranges) <= 1:
+        with session_factory() as db:
+            results = [verify_range(db, r) for r in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tenant_id,)) as pool:
+            results = list(pool.map(_verify_in_worker, ranges, chunksize=max(1, len(ranges) // (workers * 4))))
+
+    for events, problems in results:
+        report.events += events
+        report.problems.extend(problems)
+    return report
+
+
+def inclusion_proof(db: Session, event_id: uuid.UUID) -> dict | None:
+    """
+    Everything needed to check one event against its checkpoint root with
+    O(log n) hashes: the event's chain fields, the sibling path and the root.
+    Returns None for events not yet sealed into a checkpoint. If events of the
+    checkpoint's range are missing no proof can be built; the result then
+    carries a `problem` instead of `hash` and `proof`.
+    """
+    seq = db.scalar(select(AuditEvent.seq).where(AuditEvent.id == event_id))
+    if seq is None:
+        seq = db.scalar(select(AuditEventArchive.seq).where(AuditEventArchive.id == event_id))
+    if seq is None:
+        return None
+    cp = db.scalars(
+        select(AuditCheckpoint).where(AuditCheckpoint.first_seq <= seq, AuditCheckpoint.last_seq >= seq)
+    ).first()
+    if cp is None:
+        return None
+
+    rows = _chain_rows(db, cp.first_seq, cp.last_seq, ("seq", "hash"))
+    result = {
+        "event_id": str(event_id),
+        "seq": seq,
+        "checkpoint": {"first_seq": cp.first_seq, "last_seq": cp.last_seq, "root": cp.root},
+    }
+    expected = cp.last_seq - cp.first_seq + 1
+    if [r.seq for r in rows] != list(range(cp.first_seq, cp.last_seq + 1)):
+        result["problem"] = f"checkpoint {cp.first_seq}..{cp.last_seq}: range incomplete ({len(rows)} of {expected} events)"
+        return result
+    hashes = [r.hash for r in rows]
+    index = seq - cp.first_seq
+    return {**result, "hash": hashes[index], "proof": merkle.proof(hashes, index)}
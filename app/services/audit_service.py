@@ -1,36 +1,35 @@
 from __future__ import annotations
 
-import json
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import text
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.models.audit import AuditEvent
+
 
 def emit(
     db: Session,
     *,
+    tenant_id: str,
     actor_id,
     action: str,
     entity_type: str,
     entity_id,
     details: dict | None = None,
 ) -> None:
+    # Core insert so the JSON column is bound per dialect (JSONB on Postgres,
+    # text on SQLite) instead of a hard-coded `CAST(... AS jsonb)`.
     db.execute(
-        text(
-            """
-            insert into audit_events (id, actor_id, action, entity_type, entity_id, details, created_at)
-            values (:id, :actor_id, :action, :entity_type, :entity_id, CAST(:details AS jsonb), :created_at)
-            """
-        ),
-        {
-            "id": str(uuid.uuid4()),
-            "actor_id": str(actor_id) if actor_id is not None else None,
-            "action": action,
-            "entity_type": entity_type,
-            "entity_id": str(entity_id),
-            "details": json.dumps(details or {}),
-            "created_at": datetime.now(timezone.utc),
-        },
+        insert(AuditEvent.__table__).values(
+            id=uuid.uuid4(),
+            tenant_id=tenant_id,
+            actor_id=uuid.UUID(str(actor_id)) if actor_id is not None else None,
+            action=action,
+            entity_type=entity_type,
+            entity_id=uuid.UUID(str(entity_id)),
+            details=details or {},
+            created_at=datetime.now(timezone.utc),
+        )
     )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import Engine, event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.catalog import CatalogAction, CatalogResource
+
+_CACHE_MAX_ENTRIES = 100_000
+
+# name -> id per (engine, catalog table): a tenant routed to its own database
+# has its own ids. Entries are immutable, so a hit never goes stale.
+_cache: dict[tuple[Engine, type], dict[str, int]] = {}
+_cache_lock = threading.Lock()
+
+_PENDING = "catalog_pending"
+
+
+def _remember(key: tuple[Engine, type], name: str, id_: int) -> None:
+    with _cache_lock:
+        names = _cache.setdefault(key, {})
+        if len(names) >= _CACHE_MAX_ENTRIES:
+            names.clear()
+        names[name] = id_
+
+
+def _upsert(db: Session, model: type, name: str) -> int:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise RuntimeError(f"Unsupported dialect for catalog insert: {dialect}")
+    stmt = insert(model).values(name=name)
+    # A no-op DO UPDATE rather than DO NOTHING, so RETURNING also yields an existing row's id.
+    stmt = stmt.on_conflict_do_update(index_elements=["name"], set_={"name": stmt.excluded.name}).returning(model.id)
+    return db.scalar(stmt)
+
+
+def lookup(db: Session, model: type, name: str) -> int | None:
+    """Id for `name`, or None if it was never interned. Read-only."""
+    key = (db.get_bind(), model)
+    id_ = _cache.get(key, {}).get(name)
+    if id_ is not None:
+        return id_
+    id_ = db.scalar(select(model.id).where(model.name == name))
+    if id_ is not None and name not in db.info.get(_PENDING, {}).get(key, {}):
+        _remember(key, name, id_)
+    return id_
+
+
+def intern(db: Session, model: type, name: str) -> int:
+    """
+    Id for `name`, inserting it in the caller's transaction if needed: a
+    cache hit, or else one INSERT ... ON CONFLICT ... RETURNING. Ids found
+    here are cached only once that transaction commits.
+    """
+    key = (db.get_bind(), model)
+    id_ = _cache.get(key, {}).get(name)
+    if id_ is not None:
+        return id_
+    id_ = _upsert(db, model, name)
+    db.info.setdefault(_PENDING, {}).setdefault(key, {})[name] = id_
+    return id_
+
+
+def resource_id(db: Session, name: str) -> int:
+    return intern(db, CatalogResource, name)
+
+
+def action_id(db: Session, name: str) -> int:
+    return intern(db, CatalogAction, name)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    for key, names in session.info.pop(_PENDING, {}).items():
+        for name, id_ in names.items():
+            _remember(key, name, id_)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import heapq
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.clock import as_utc, utcnow
+from app.core.lifecycle import EXPIRY_TRANSITIONS, RequestStatus
+from app.models.access_request import AccessRequest
+from app.services import audit_service, grants_service, routing_service, stats_service
+
+OPEN_STATUSES = tuple(EXPIRY_TRANSITIONS)
+
+
+def _due_query(now: datetime):
+    # Matches the partial index ix_access_requests_expires_at_open.
+    return select(AccessRequest).where(
+        AccessRequest.status.in_(OPEN_STATUSES),
+        AccessRequest.expires_at.is_not(None),
+        AccessRequest.expires_at <= now,
+    )
+
+
+def expire_batch(
+    db: Session,
+    *,
+    now: datetime | None = None,
+    ids: list[uuid.UUID] | None = None,
+    limit: int = 500,
+) -> int:
+    """
+    End up to `limit` requests whose `expires_at` has passed: PENDING becomes
+    CANCELLED, APPROVED becomes EXPIRED. Writes one audit event per request,
+    drops the grants of expired approvals and commits the batch. Rows locked by another scheduler are skipped.
+    """
+    now = now or utcnow()
+    q = _due_query(now)
+    if ids is not None:
+        q = q.where(AccessRequest.id.in_(ids))
+    q = q.order_by(AccessRequest.expires_at).limit(limit).with_for_update(skip_locked=True)
+
+    rows = db.scalars(q).all()
+    if not rows:
+        db.commit()
+        return 0
+
+    moved: Counter[tuple[str, str, str, str]] = Counter()
+    ended_grants: list[uuid.UUID] = []
+    cancelled: list[uuid.UUID] = []
+    for req in rows:
+        previous = req.status
+        req.status = EXPIRY_TRANSITIONS[previous]
+        if req.decided_at is None:
+            req.decided_at = now
+        moved[(req.tenant_id, req.resource, previous.value, req.status.value)] += 1
+        if previous == RequestStatus.APPROVED:
+            ended_grants.append(req.id)
+        else:
+            cancelled.append(req.id)
+
+        audit_service.emit(
+            db,
+            tenant_id=req.tenant_id,
+            actor_id=None,
+            action=f"access_request.{req.status.value.lower()}",
+            entity_type="access_request",
+            entity_id=req.id,
+            details={
+                "requester_id": str(req.requester_id),
+                "resource": req.resource,
+                "action": req.action,
+                "previous_status": previous.value,
+                "new_status": req.status.value,
+                "expires_at": as_utc(req.expires_at).isoformat(),
+            },
+        )
+
+    for (tenant_id, resource, from_status, to_status), count in moved.items():
+        stats_service.record_transition(
+            db, tenant_id=tenant_id, resource=resource, from_status=from_status, to_status=to_status, count=count
+        )
+    grants_service.remove(db, ended_grants)
+    routing_service.close(db, cancelled, RequestStatus.CANCELLED.value)
+
+    db.commit()
+    return len(rows)
+
+
+def upcoming(db: Session, *, until: datetime, limit: int) -> list[tuple[datetime, uuid.UUID]]:
+    q = (
+        select(AccessRequest.expires_at, AccessRequest.id)
+        .where(
+            AccessRequest.status.in_(OPEN_STATUSES),
+            AccessRequest.expires_at.is_not(None),
+            AccessRequest.expires_at <= until,
+        )
+        .order_by(AccessRequest.expires_at)
+        .limit(limit)
+    )
+    return [(as_utc(ts), rid) for ts, rid in db.execute(q)]
+
+
+@dataclass
+class ExpiryScheduler:
+    """
+    Keeps the next deadlines in a min-heap so it can sleep until the earliest
+    one instead of polling. The heap is refilled from the partial index over a
+    sliding horizon; anything added after a refill with an earlier deadline is
+    caught by the indexed catch-up sweep that runs on every tick.
+    """
+
+    session_factory: sessionmaker
+    batch_size: int = 500
+    horizon: timedelta = timedelta(minutes=10)
+    heap_limit: int = 50_000
+    max_sleep: float = 30.0
+
+    _heap: list[tuple[datetime, uuid.UUID]] = field(default_factory=list)
+    _loaded_until: datetime | None = None
+
+    def refill(self, now: datetime) -> None:
+        until = now + self.horizon
+        with self.session_factory() as db:
+            entries = upcoming(db, until=until, limit=self.heap_limit)
+        self._heap = entries
+        heapq.heapify(self._heap)
+        # A truncated load only covers deadlines up to the last one fetched.
+        self._loaded_until = entries[-1][0] if len(entries) >= self.heap_limit else until
+
+    def tick(self, now: datetime | None = None) -> int:
+        """Process everything due now; returns how many requests were ended."""
+        now = now or utcnow()
+        if self._loaded_until is None or now >= self._loaded_until:
+            self.refill(now)
+
+        processed = 0
+        while self._heap and self._heap[0][0] <= now:
+            due: list[uuid.UUID] = []
+            while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+                due.append(heapq.heappop(self._heap)[1])
+            with self.session_factory() as db:
+                processed += expire_batch(db, now=now, ids=due, limit=self.batch_size)
+
+        # Catch-up: deadlines written after the last refill, or skipped while locked.
+        while True:
+            with self.session_factory() as db:
+                n = expire_batch(db, now=now, limit=self.batch_size)
+            processed += n
+            if n < self.batch_size:
+                break
+        return processed
+
+    def seconds_until_next(self, now: datetime | None = None) -> float:
+        now = now or utcnow()
+        if not self._heap:
+            return self.max_sleep
+        return max(0.0, min((self._heap[0][0] - now).total_seconds(), self.max_sleep))
+
+    def run_forever(self) -> None:
+        while True:
+            self.tick()
+            time.sleep(self.seconds_until_next())
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import Integer, String, Uuid, cast, delete, literal, or_, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from app.core.clock import as_utc, utcnow
+from app.core.lifecycle import RequestStatus
+from app.models.access_request import AccessRequest
+from app.models.archive import AccessRequestArchive
+from app.models.catalog import CatalogAction, CatalogResource
+from app.models.grant import Grant
+from app.models.user import User
+from app.services import catalog_service
+
+_SAMPLE_LIMIT = 20
+
+
+def add(db: Session, req: AccessRequest) -> None:
+    """Record the grant for a request that just became APPROVED."""
+    db.add(
+        Grant(
+            request_id=req.id,
+            tenant_id=req.tenant_id,
+            user_id=req.requester_id,
+            resource_id=req.resource_id,
+            action_id=req.action_id,
+            granted_by=req.decided_by,
+            granted_at=req.decided_at,
+            expires_at=req.expires_at,
+        )
+    )
+
+
+def remove(db: Session, request_ids: list[uuid.UUID]) -> None:
+    """Drop the grants of requests that were expired or revoked."""
+    if request_ids:
+        db.execute(delete(Grant).where(Grant.request_id.in_(request_ids)).execution_options(synchronize_session=False))
+
+
+def encode_cursor(values: list[str]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, size: int) -> list[str]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _parse_key(column, value: str):
+    if isinstance(column.type, Uuid):
+        return uuid.UUID(value)
+    if isinstance(column.type, Integer):
+        return int(value)
+    return value
+
+
+def _page(db: Session, q, keys: list, cursor: str | None, limit: int) -> tuple[list[Grant], str | None]:
+    # `keys` must match a prefix-extended ordering of one of the grants indexes.
+    if cursor is not None:
+        values: list = decode_cursor(cursor, len(keys))
+        try:
+            values = [_parse_key(k, v) for k, v in zip(keys, values)]
+        except ValueError as e:
+            raise ValueError("Invalid cursor") from e
+        q = q.where(tuple_(*keys) > tuple_(*(literal(v, k.type) for k, v in zip(keys, values))))
+    rows = db.scalars(q.order_by(*keys).limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = rows[:limit]
+    last = rows[-1]
+    return list(rows), encode_cursor([str(getattr(last, k.key)) for k in keys])
+
+
+def _unexpired(now: datetime | None):
+    # The expiry scheduler removes lapsed grants in batches; until it gets to them they must not count.
+    return or_(Grant.expires_at.is_(None), Grant.expires_at > (now or utcnow()))
+
+
+def who_has_access(
+    db: Session,
+    *,
+    tenant_id: str,
+    resource: str,
+    action: str | None = None,
+    limit: int,
+    cursor: str | None = None,
+    now: datetime | None = None,
+) -> tuple[list[Grant], str | None]:
+    """A tenant's unexpired grants on `resource`, ordered by (action, user); returns the page and the next cursor."""
+    rid = catalog_service.lookup(db, CatalogResource, resource)
+    aid = catalog_service.lookup(db, CatalogAction, action) if action is not None else None
+    if rid is None or (action is not None and aid is None):
+        return [], None
+
+    q = select(Grant).where(Grant.tenant_id == tenant_id, Grant.resource_id == rid, _unexpired(now))
+    if aid is not None:
+        q = q.where(Grant.action_id == aid)
+        keys = [Grant.user_id, Grant.request_id]
+    else:
+        keys = [Grant.action_id, Grant.user_id, Grant.request_id]
+    return _page(db, q, keys, cursor, limit)
+
+
+def user_access(
+    db: Session,
+    *,
+    tenant_id: str,
+    user_id: uuid.UUID,
+    limit: int,
+    cursor: str | None = None,
+    now: datetime | None = None,
+) -> tuple[list[Grant], str | None]:
+    """Unexpired grants held by `user_id`, ordered by catalog (resource, action) id."""
+    q = select(Grant).where(Grant.tenant_id == tenant_id, Grant.user_id == user_id, _unexpired(now))
+    return _page(db, q, [Grant.resource_id, Grant.action_id, Grant.request_id], cursor, limit)
+
+
+@dataclass
+class RebuildReport:
+    scanned: int = 0
+    missing: int = 0
+    stale: int = 0
+    changed: int = 0
+    samples: list[tuple[str, uuid.UUID]] = field(default_factory=list)
+
+    @property
+    def differences(self) -> int:
+        return self.missing + self.stale + self.changed
+
+    def _note(self, kind: str, request_id: uuid.UUID) -> None:
+        if len(self.samples) < _SAMPLE_LIMIT:
+            self.samples.append((kind, request_id))
+
+
+_COMPARED = ("tenant_id", "user_id", "resource_id", "action_id", "expires_at")
+
+
+def _expected_source():
+    """APPROVED requests, live or archived, whose requester still exists."""
+    live = select(
+        AccessRequest.id.label("request_id"),
+        AccessRequest.tenant_id,
+        AccessRequest.requester_id.label("user_id"),
+        AccessRequest.resource_id,
+        AccessRequest.action_id,
+        AccessRequest.decided_by.label("granted_by"),
+        AccessRequest.decided_at.label("granted_at"),
+        AccessRequest.expires_at,
+    ).where(cast(AccessRequest.status, String(16)) == RequestStatus.APPROVED.value)
+    # The archive keeps names so it stands alone; map them back to catalog ids.
+    archived = (
+        select(
+            AccessRequestArchive.id,
+            AccessRequestArchive.tenant_id,
+            AccessRequestArchive.requester_id,
+            CatalogResource.id,
+            CatalogAction.id,
+            AccessRequestArchive.decided_by,
+            AccessRequestArchive.decided_at,
+            AccessRequestArchive.expires_at,
+        )
+        .join(CatalogResource, CatalogResource.name == AccessRequestArchive.resource)
+        .join(CatalogAction, CatalogAction.name == AccessRequestArchive.action)
+        .where(AccessRequestArchive.status == RequestStatus.APPROVED.value)
+    )
+    src = union_all(live, archived).subquery("expected")
+    return src, select(src).where(src.c.user_id.in_(select(User.id)))
+
+
+def _same(grant: Grant, row) -> bool:
+    for name in _COMPARED:
+        a, b = getattr(grant, name), getattr(row, name)
+        if name == "expires_at":
+            a, b = (as_utc(a) if a else None), (as_utc(b) if b else None)
+        if a != b:
+            return False
+    return True
+
+
+def rebuild(db: Session, *, batch_size: int = 1000, dry_run: bool = False) -> RebuildReport:
+    """
+    Recompute `grants` from the requests in request_id order, one batch at a
+    time: each batch of expected rows is compared with the stored grants in
+    the same id range, and differences are repaired (unless `dry_run`) and
+    committed before the next batch is read.
+    """
+    report = RebuildReport()
+    src, expected_q = _expected_source()
+    last: uuid.UUID | None = None
+
+    while True:
+        q = expected_q
+        if last is not None:
+            q = q.where(src.c.request_id > last)
+        expected = db.execute(q.order_by(src.c.request_id).limit(batch_size)).all()
+        if not expected:
+            break
+        upper = expected[-1].request_id
+
+        stored_q = select(Grant).where(Grant.request_id <= upper)
+        if last is not None:
+            stored_q = stored_q.where(Grant.request_id > last)
+        stored = {g.request_id: g for g in db.scalars(stored_q)}
+
+        report.scanned += len(expected)
+        for row in expected:
+            grant = stored.pop(row.request_id, None)
+            if grant is None:
+                report.missing += 1
+                report._note("missing", row.request_id)
+                if not dry_run:
+                    db.add(Grant(**row._asdict()))
+            elif not _same(grant, row):
+                report.changed += 1
+                report._note("changed", row.request_id)
+                if not dry_run:
+                    for name in _COMPARED:
+                        setattr(grant, name, getattr(row, name))
+
+        # Whatever is left in the range has no APPROVED request behind it.
+        _stale(db, report, list(stored), dry_run)
+        db.commit()
+        last = upper
+        if len(expected) < batch_size:
+            break
+
+    # Grants past the last expected id are all stale.
+    while True:
+        q = select(Grant.request_id).order_by(Grant.request_id).limit(batch_size)
+        if last is not None:
+            q = q.where(Grant.request_id > last)
+        tail = list(db.scalars(q))
+        if not tail:
+            return report
+        _stale(db, report, tail, dry_run)
+        db.commit()
+        last = tail[-1]
+
+
+def _stale(db: Session, report: RebuildReport, request_ids: list[uuid.UUID], dry_run: bool) -> None:
+    for request_id in request_ids:
+        report.stale += 1
+        report._note("stale", request_id)
+    if not dry_run:
+        remove(db, request_ids)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.clock import as_utc, utcnow
+from app.core.config import idempotency_ttl_hours
+from app.models.idempotency import IdempotencyKey
+
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used for a different request."""
+
+
+def _fingerprint(scope: str, payload: dict) -> str:
+    canonical = json.dumps({"scope": scope, "payload": payload}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _lookup(db: Session, actor_id: uuid.UUID, key: str) -> IdempotencyKey | None:
+    return db.scalars(
+        select(IdempotencyKey).where(IdempotencyKey.actor_id == actor_id, IdempotencyKey.key == key)
+    ).first()
+
+
+def _check(record: IdempotencyKey, request_hash: str) -> IdempotencyKey:
+    if record.request_hash != request_hash:
+        raise IdempotencyKeyReused("Idempotency-Key reused with a different request")
+    return record
+
+
+def claim(
+    db: Session,
+    *,
+    key: str | None,
+    actor_id: uuid.UUID,
+    scope: str,
+    payload: dict,
+) -> IdempotencyKey | None:
+    """
+    Reserve `key` for this request inside the caller's transaction.
+
+    Returns None when no key was supplied. Otherwise returns the key record:
+    a fresh one (status_code is None) that the caller must pass to `complete`
+    before committing, or a previously completed one whose stored response
+    should be replayed as-is.
+
+    On Postgres a concurrent duplicate blocks on the unique index until the
+    first transaction commits (and then replays it) or rolls back (and then
+    proceeds as the new owner of the key).
+    """
+    if not key:
+        return None
+
+    request_hash = _fingerprint(scope, payload)
+    now = utcnow()
+
+    existing = _lookup(db, actor_id, key)
+    if existing is not None:
+        if as_utc(existing.expires_at) > now:
+            return _check(existing, request_hash)
+        db.delete(existing)
+        db.flush()
+
+    record = IdempotencyKey(
+        actor_id=actor_id,
+        key=key,
+        request_hash=request_hash,
+        expires_at=now + timedelta(hours=idempotency_ttl_hours()),
+    )
+    db.add(record)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        existing = _lookup(db, actor_id, key)
+        if existing is None or existing.status_code is None:
+            raise
+        return _check(existing, request_hash)
+    return record
+
+
+def complete(db: Session, record: IdempotencyKey | None, *, status_code: int, body: dict) -> None:
+    """Store the response for replay. Must run before the handler commits."""
+    if record is None:
+        return
+    record.status_code = status_code
+    record.response_body = body
+    db.flush()
+
+
+def purge_expired(db: Session, *, now: datetime | None = None) -> int:
+    cutoff = now or utcnow()
+    res = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= cutoff))
+    return res.rowcount or 0
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import inspect
+import json
+import sys
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.clock import as_utc
+from app.models.access_request import AccessRequest
+from app.models.archive import AccessRequestArchive, AuditEventArchive
+from app.models.audit import AuditEvent
+from app.models.user import User
+
+DECISION_ACTIONS = ("access_request.approved", "access_request.rejected")
+
+# One replayed decision per position; batches are dicts of equally long columns.
+COLUMNS = ("request_id", "actor_id", "actor_role", "requester_id", "action", "decided_at", "expires_at")
+Batch = dict[str, list]
+
+
+def load_policy(spec: str) -> ModuleType:
+    """A policy module by dotted name (app.core.policy) or by path (/tmp/policy_old.py)."""
+    if spec.endswith(".py"):
+        path = Path(spec)
+        module_spec = importlib.util.spec_from_file_location(f"_replay_policy_{path.stem}", path)
+        if module_spec is None or module_spec.loader is None:
+            raise ValueError(f"Cannot load policy from {spec}")
+        module = importlib.util.module_from_spec(module_spec)
+        sys.modules[module_spec.name] = module
+        module_spec.loader.exec_module(module)
+        return module
+    return importlib.import_module(spec)
+
+
+def _decisions_query():
+    requests = union_all(
+        select(AccessRequest.id, AccessRequest.requester_id, AccessRequest.expires_at),
+        select(AccessRequestArchive.id, AccessRequestArchive.requester_id, AccessRequestArchive.expires_at),
+    ).subquery()
+    events = union_all(
+        *(
+            select(
+                t.entity_id,
+                t.actor_id,
+                t.details["actor_role"].as_string().label("actor_role"),
+                t.action,
+                t.created_at,
+            ).where(t.entity_type == "access_request", t.action.in_(DECISION_ACTIONS))
+            for t in (AuditEvent, AuditEventArchive)
+        )
+    ).subquery()
+    return (
+        select(
+            events.c.entity_id,
+            events.c.actor_id,
+            # The role recorded with the decision; events written before it was recorded fall back to today's.
+            func.coalesce(events.c.actor_role, User.role),
+            requests.c.requester_id,
+            events.c.action,
+            events.c.created_at,
+            requests.c.expires_at,
+        )
+        .select_from(events)
+        .join(requests, requests.c.id == events.c.entity_id)
+        .outerjoin(User, User.id == events.c.actor_id)
+    )
+
+
+def db_batches(db: Session, *, chunk_size: int) -> Iterator[Batch]:
+    """
+    Every recorded approve/reject decision, live and archived, streamed with a
+    server-side cursor and transposed into columns. No ORM objects are built.
+    """
+    result = db.execute(_decisions_query(), execution_options={"yield_per": chunk_size})
+    for rows in result.partitions(chunk_size):
+        yield dict(zip(COLUMNS, map(list, zip(*rows))))
+
+
+def file_batches(path: str, *, chunk_size: int) -> Iterator[Batch]:
+    """The same columns from NDJSON, one decision object per line; missing keys are None."""
+    with open(path, encoding="utf-8") as fh:
+        batch: Batch = {c: [] for c in COLUMNS}
+        size = 0
+        for line in fh:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            for c in COLUMNS:
+                batch[c].append(record.get(c))
+            size += 1
+            if size == chunk_size:
+                yield batch
+                batch, size = {c: [] for c in COLUMNS}, 0
+        if size:
+            yield batch
+
+
+def _ts(value) -> datetime | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return as_utc(value)
+
+
+def _outcome(result) -> str:
+    return "allow" if result.allowed else f"{result.status_code} {result.detail}"
+
+
+@dataclass
+class ChunkResult:
+    rows: int
+    transitions: Counter
+    deltas: list[dict]
+
+
+def _accepts(fn: Callable) -> Callable[[dict], dict]:
+    """Narrow keyword arguments to those `fn` takes, so older policy versions without later flags still load."""
+    params = inspect.signature(fn).parameters
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return lambda kwargs: kwargs
+    return lambda kwargs: {k: v for k, v in kwargs.items() if k in params}
+
+
+def evaluate(batch: Batch, baseline: ModuleType, candidate: ModuleType) -> ChunkResult:
+    """Run both policies' can_decide_request over one columnar batch."""
+    transitions: Counter = Counter()
+    deltas: list[dict] = []
+    old_decide, new_decide = baseline.can_decide_request, candidate.can_decide_request
+    old_args, new_args = _accepts(old_decide), _accepts(new_decide)
+    for request_id, actor_id, role, requester_id, action, decided_at, expires_at in zip(*(batch[c] for c in COLUMNS)):
+        decided, expires = _ts(decided_at), _ts(expires_at)
+        kwargs = {
+            "actor_role": role,
+            "actor_id": str(actor_id),
+            "requester_id": str(requester_id),
+            # Decisions are only taken on pending requests.
+            "current_status": "PENDING",
+            "expired": expires is not None and decided is not None and expires <= decided,
+        }
+        old, new = _outcome(old_decide(**old_args(kwargs))), _outcome(new_decide(**new_args(kwargs)))
+        transitions[(old, new)] += 1
+        if old != new:
+            deltas.append(
+                {
+                    "request_id": str(request_id),
+                    "decision": action.rsplit(".", 1)[-1].upper() if action else None,
+                    "baseline": old,
+                    "candidate": new,
+                }
+            )
+    return ChunkResult(len(batch[COLUMNS[0]]), transitions, deltas)
+
+
+@dataclass
+class ReplayReport:
+    rows: int = 0
+    transitions: Counter = field(default_factory=Counter)
+
+    @property
+    def changed(self) -> int:
+        return sum(n for (old, new), n in self.transitions.items() if old != new)
+
+    def add(self, chunk: ChunkResult) -> None:
+        self.rows += chunk.rows
+        self.transitions.update(chunk.transitions)
+
+
+_worker_policies: tuple[ModuleType, ModuleType] | None = None
+
+
+def _init_worker(baseline: str, candidate: str) -> None:
+    global _worker_policies
+    _worker_policies = (load_policy(baseline), load_policy(candidate))
+
+
+def _evaluate_in_worker(batch: Batch) -> ChunkResult:
+    return evaluate(batch, *_worker_policies)
+
+
+def replay(
+    batches: Iterable[Batch],
+    *,
+    baseline: str,
+    candidate: str,
+    workers: int = 1,
+    on_delta: Callable[[dict], None] | None = None,
+) -> ReplayReport:
+    """
+    Evaluate both policy versions over every batch. With several workers the
+    batches are fanned out to a process pool, keeping only a few in flight so
+    memory stays flat however long the history is.
+    """
+    report = ReplayReport()
+
+    def _collect(chunk: ChunkResult) -> None:
+        report.add(chunk)
+        if on_delta is not None:
+            for delta in chunk.deltas:
+                on_delta(delta)
+
+    if workers <= 1:
+        policies = (load_policy(baseline), load_policy(candidate))
+        for batch in batches:
+            _collect(evaluate(batch, *policies))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(baseline, candidate)) as pool:
+        in_flight: deque = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(_evaluate_in_worker, batch))
+            if len(in_flight) >= workers * 2:
+                _collect(in_flight.popleft().result())
+        while in_flight:
+            _collect(in_flight.popleft().result())
+    return report
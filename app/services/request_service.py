@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Row, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.lifecycle import RequestStatus
+from app.models.access_request import AccessRequest
+
+
+def create_pending(
+    db: Session,
+    *,
+    tenant_id: str,
+    requester_id: uuid.UUID,
+    resource_id: int,
+    action_id: int,
+    justification: str | None,
+    expires_at: datetime | None,
+) -> tuple[Row, bool]:
+    """
+    Insert a PENDING request, or coalesce into the requester's open request for
+    the same resource and action. One statement either way: the conflict target
+    is the partial unique index on PENDING rows, and RETURNING yields whichever
+    row now stands. Returns (row, created).
+
+    A coalesced request keeps its own fields; only a missing justification is
+    filled in from the re-submission.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise RuntimeError(f"Unsupported dialect for request upsert: {dialect}")
+
+    table = AccessRequest.__table__
+    new_id = uuid.uuid4()
+    stmt = insert(table).values(
+        id=new_id,
+        tenant_id=tenant_id,
+        requester_id=requester_id,
+        resource_id=resource_id,
+        action_id=action_id,
+        justification=justification,
+        status=RequestStatus.PENDING,
+        expires_at=expires_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.tenant_id, table.c.requester_id, table.c.resource_id, table.c.action_id],
+        index_where=table.c.status == RequestStatus.PENDING,
+        # Always an UPDATE, even when nothing changes, so RETURNING sees the existing row.
+        set_={"justification": func.coalesce(table.c.justification, stmt.excluded.justification)},
+    ).returning(*table.c)
+
+    row = db.execute(stmt).one()
+    return row, row.id == new_id
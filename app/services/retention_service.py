@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import String, and_, cast, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.clock import as_utc
+from app.db import keyset
+from app.core.lifecycle import TERMINAL_STATUSES, RequestStatus
+from app.models.access_request import AccessRequest
+from app.models.archive import AccessRequestArchive, AuditEventArchive, RetentionCheckpoint
+from app.models.audit import AuditEvent
+from app.models.catalog import CatalogAction, CatalogResource
+
+REQUESTS_JOB = "access_requests"
+AUDIT_JOB = "audit_events"
+
+TERMINAL = tuple(sorted(TERMINAL_STATUSES))
+
+
+@dataclass(frozen=True)
+class RetentionResult:
+    job: str
+    rows_moved: int
+    batches: int
+    done: bool
+
+
+def _checkpoint(db: Session, job: str) -> RetentionCheckpoint:
+    ckpt = db.get(RetentionCheckpoint, job)
+    if ckpt is None:
+        ckpt = RetentionCheckpoint(job=job, rows_moved=0)
+        db.add(ckpt)
+        db.flush()
+    return ckpt
+
+
+def reset_checkpoint(db: Session, job: str) -> None:
+    ckpt = db.get(RetentionCheckpoint, job)
+    if ckpt is not None:
+        ckpt.last_ts = None
+        ckpt.last_id = None
+        db.commit()
+
+
+def _advance(ckpt: RetentionCheckpoint, rows: list, barrier) -> None:
+    """
+    Move the checkpoint to the last archived row that sorts before `barrier`,
+    the oldest row in range that may not be archived yet (a live time-bound
+    grant, an unsealed event). Rows past the barrier are archived all the
+    same; the checkpoint just waits there so the barrier row is seen again
+    once it becomes archivable.
+    """
+    if barrier is not None:
+        limit = (as_utc(barrier[1]), str(barrier[0]))
+        rows = [r for r in rows if (as_utc(r[1]), str(r[0])) < limit]
+    if rows:
+        ckpt.last_ts, ckpt.last_id = rows[-1][1], rows[-1][0]
+
+
+def archive_requests_batch(db: Session, *, cutoff: datetime, batch_size: int) -> int:
+    """Move one batch of requests decided before `cutoff` into the archive; commits."""
+    dialect = db.get_bind().dialect.name
+    ckpt = _checkpoint(db, REQUESTS_JOB)
+
+    # Time-bound grants stay live until the expiry scheduler has ended them.
+    archivable = or_(
+        AccessRequest.status.in_(TERMINAL),
+        and_(AccessRequest.status == RequestStatus.APPROVED, AccessRequest.expires_at.is_(None)),
+    )
+    q = select(AccessRequest.id, AccessRequest.decided_at).where(
+        AccessRequest.decided_at.is_not(None),
+        AccessRequest.decided_at < cutoff,
+    )
+    if ckpt.last_ts is not None and ckpt.last_id is not None:
+        q = q.where(keyset.after(AccessRequest.decided_at, AccessRequest.id, ckpt.last_ts, ckpt.last_id, dialect))
+    order = (AccessRequest.decided_at, AccessRequest.id)
+    barrier = db.execute(q.where(~archivable).order_by(*order).limit(1)).first()
+    rows = db.execute(q.where(archivable).order_by(*order).limit(batch_size)).all()
+    if not rows:
+        db.commit()
+        return 0
+
+    ids = [r.id for r in rows]
+    db.execute(
+        insert(AccessRequestArchive).from_select(
+            [
+                "id",
+                "tenant_id",
+                "requester_id",
+                "resource",
+                "action",
+                "justification",
+                "status",
+                "decided_by",
+                "decided_at",
+                "expires_at",
+                "created_at",
+            ],
+            select(
+                AccessRequest.id,
+                AccessRequest.tenant_id,
+                AccessRequest.requester_id,
+                CatalogResource.name,
+                CatalogAction.name,
+                AccessRequest.justification,
+                cast(AccessRequest.status, String(16)),
+                AccessRequest.decided_by,
+                AccessRequest.decided_at,
+                AccessRequest.expires_at,
+                AccessRequest.created_at,
+            )
+            .join(CatalogResource, CatalogResource.id == AccessRequest.resource_id)
+            .join(CatalogAction, CatalogAction.id == AccessRequest.action_id)
+            .where(AccessRequest.id.in_(ids)),
+        )
+    )
+    db.execute(delete(AccessRequest).where(AccessRequest.id.in_(ids)).execution_options(synchronize_session=False))
+
+    _advance(ckpt, rows, barrier)
+    ckpt.rows_moved += len(ids)
+    db.commit()
+    return len(ids)
+
+
+def archive_audit_batch(db: Session, *, cutoff: datetime, batch_size: int) -> int:
+    """Move one batch of audit events created before `cutoff` into the archive; commits."""
+    dialect = db.get_bind().dialect.name
+    ckpt = _checkpoint(db, AUDIT_JOB)
+
+    q = select(AuditEvent.id, AuditEvent.created_at).where(AuditEvent.created_at < cutoff)
+    if ckpt.last_ts is not None and ckpt.last_id is not None:
+        q = q.where(keyset.after(AuditEvent.created_at, AuditEvent.id, ckpt.last_ts, ckpt.last_id, dialect))
+    order = (AuditEvent.created_at, AuditEvent.id)
+    # Unsealed events stay until the sealer has chained them.
+    barrier = db.execute(q.where(AuditEvent.seq.is_(None)).order_by(*order).limit(1)).first()
+    rows = db.execute(q.where(AuditEvent.seq.is_not(None)).order_by(*order).limit(batch_size)).all()
+    if not rows:
+        db.commit()
+        return 0
+
+    ids = [r.id for r in rows]
+    columns = [
+        "id",
+        "tenant_id",
+        "actor_id",
+        "action",
+        "entity_type",
+        "entity_id",
+        "details",
+        "created_at",
+        "seq",
+        "prev_hash",
+        "hash",
+    ]
+    db.execute(
+        insert(AuditEventArchive).from_select(
+            columns,
+            select(*(AuditEvent.__table__.c[name] for name in columns)).where(AuditEvent.id.in_(ids)),
+        )
+    )
+    db.execute(delete(AuditEvent).where(AuditEvent.id.in_(ids)).execution_options(synchronize_session=False))
+
+    _advance(ckpt, rows, barrier)
+    ckpt.rows_moved += len(ids)
+    db.commit()
+    return len(ids)
+
+
+def run_job(
+    db: Session,
+    job: str,
+    *,
+    cutoff: datetime,
+    batch_size: int,
+    max_batches: int | None = None,
+    pause_seconds: float = 0.0,
+) -> RetentionResult:
+    """
+    Drain one job in short transactions. Each batch commits its rows together
+    with the checkpoint, so an interrupted run resumes where it stopped.
+    """
+    step = archive_requests_batch if job == REQUESTS_JOB else archive_audit_batch
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        n = step(db, cutoff=cutoff, batch_size=batch_size)
+        if n == 0:
+            return RetentionResult(job, moved, batches, True)
+        moved += n
+        batches += 1
+        if n < batch_size:
+            return RetentionResult(job, moved, batches, True)
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return RetentionResult(job, moved, batches, False)
+
+
+def find_request(
+    db: Session, request_id: uuid.UUID, *, tenant_id: str, for_update: bool = False
+) -> tuple[AccessRequest | AccessRequestArchive, bool] | None:
+    """
+    Look a tenant's request up in the live table first, then the archive. Returns (row, archived).
+
+    With `for_update` the row is locked and re-read, so a caller about to change its status sees
+    the committed one and concurrent callers take turns.
+    """
+    lock = {"with_for_update": True, "populate_existing": True} if for_update else {}
+    live = db.get(AccessRequest, request_id, **lock)
+    if live is not None:
+        return (live, False) if live.tenant_id == tenant_id else None
+    archived = db.get(AccessRequestArchive, request_id, **lock)
+    if archived is not None and archived.tenant_id == tenant_id:
+        return archived, True
+    return None
+
+
+def audit_trail(
+    db: Session, *, tenant_id: str, entity_type: str, entity_id: uuid.UUID
+) -> list[AuditEvent | AuditEventArchive]:
+    live = db.scalars(
+        select(AuditEvent).where(
+            AuditEvent.tenant_id == tenant_id, AuditEvent.entity_type == entity_type, AuditEvent.entity_id == entity_id
+        )
+    ).all()
+    archived = db.scalars(
+        select(AuditEventArchive).where(
+            AuditEventArchive.tenant_id == tenant_id,
+            AuditEventArchive.entity_type == entity_type,
+            AuditEventArchive.entity_id == entity_id,
+        )
+    ).all()
+    events: list[AuditEvent | AuditEventArchive] = [*archived, *live]
+    return sorted(events, key=lambda e: (as_utc(e.created_at), str(e.id)))
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import and_, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core import policy
+from app.core.clock import as_utc, utcnow
+from app.core.lifecycle import RequestStatus
+from app.models.access_request import AccessRequest
+from app.models.archive import AccessRequestArchive
+from app.models.catalog import CatalogAction, CatalogResource
+from app.models.grant import Grant
+from app.models.review import ReviewCampaign, ReviewDecision, ReviewItem
+from app.services import audit_service, grants_service, stats_service
+
+GENERATING = "GENERATING"
+OPEN = "OPEN"
+CLOSED = "CLOSED"
+
+CERTIFY = "CERTIFY"
+REVOKE = "REVOKE"
+
+_ITEM_COLUMNS = ["campaign_id", "request_id", "user_id", "resource_id", "action_id", "granted_at"]
+
+
+class UnknownCampaign(ValueError):
+    """No review campaign with that id in the caller's tenant."""
+
+
+class CampaignNotOpen(ValueError):
+    """The campaign is still being generated."""
+
+
+@dataclass
+class DecisionResult:
+    decided: list[uuid.UUID] = field(default_factory=list)
+    # (request_id, status_code, detail) for every item the policy or a concurrent reviewer refused.
+    rejected: list[tuple[uuid.UUID, int, str]] = field(default_factory=list)
+
+
+def create_campaign(
+    db: Session, *, tenant_id: str, name: str, created_by: uuid.UUID | None, due_at: datetime | None = None
+) -> ReviewCampaign:
+    """A new campaign; its items are filled in by `generate` (python -m app.cli reviews generate)."""
+    campaign = ReviewCampaign(tenant_id=tenant_id, name=name, status=GENERATING, created_by=created_by, due_at=due_at)
+    db.add(campaign)
+    db.flush()
+    return campaign
+
+
+def get_campaign(db: Session, *, tenant_id: str, campaign_id: int) -> ReviewCampaign:
+    campaign = db.get(ReviewCampaign, campaign_id)
+    if campaign is None or campaign.tenant_id != tenant_id:
+        raise UnknownCampaign(f"Review campaign {campaign_id} not found")
+    return campaign
+
+
+def list_campaigns(db: Session, *, tenant_id: str) -> list[ReviewCampaign]:
+    q = (
+        select(ReviewCampaign)
+        .where(ReviewCampaign.tenant_id == tenant_id)
+        .order_by(ReviewCampaign.created_at.desc(), ReviewCampaign.id.desc())
+    )
+    return list(db.scalars(q))
+
+
+def pending_generation(db: Session) -> list[int]:
+    return list(db.scalars(select(ReviewCampaign.id).where(ReviewCampaign.status == GENERATING).order_by(ReviewCampaign.id)))
+
+
+def generate_chunk(db: Session, campaign: ReviewCampaign, *, chunk_size: int) -> int:
+    """
+    Copy the next `chunk_size` grants, in request_id order, into review items
+    with a single INSERT ... SELECT, and commit them together with the
+    campaign's resume point and item count. Opens the campaign after the last chunk.
+    """
+    grants = select(Grant.request_id).where(Grant.tenant_id == campaign.tenant_id)
+    if campaign.generated_through is not None:
+        grants = grants.where(Grant.request_id > campaign.generated_through)
+    # The chunk's last key, found on the primary key index; None means the rest fits in this chunk.
+    upper = db.scalar(grants.order_by(Grant.request_id).offset(chunk_size - 1).limit(1))
+
+    source = select(
+        literal(campaign.id, ReviewItem.campaign_id.type),
+        Grant.request_id,
+        Grant.user_id,
+        Grant.resource_id,
+        Grant.action_id,
+        Grant.granted_at,
+    ).where(Grant.tenant_id == campaign.tenant_id)
+    if campaign.generated_through is not None:
+        source = source.where(Grant.request_id > campaign.generated_through)
+    if upper is not None:
+        source = source.where(Grant.request_id <= upper)
+    added = db.execute(ReviewItem.__table__.insert().from_select(_ITEM_COLUMNS, source)).rowcount
+
+    campaign.item_count += added
+    if upper is None:
+        campaign.status = OPEN
+    else:
+        campaign.generated_through = upper
+    db.commit()
+    return added
+
+
+def generate(db: Session, campaign_id: int, *, chunk_size: int, max_chunks: int | None = None) -> int:
+    """
+    Fill a GENERATING campaign chunk by chunk. Each chunk is its own short
+    transaction holding the campaign row lock, so an interrupted run resumes
+    where it stopped and two generators never copy the same chunk.
+    """
+    added = chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        campaign = db.get(ReviewCampaign, campaign_id, with_for_update=True, populate_existing=True)
+        if campaign is None or campaign.status != GENERATING:
+            db.commit()
+            break
+        added += generate_chunk(db, campaign, chunk_size=chunk_size)
+        chunks += 1
+    return added
+
+
+def list_items(
+    db: Session,
+    *,
+    tenant_id: str,
+    campaign_id: int,
+    pending_only: bool,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list, str | None]:
+    """A page of a campaign's items with their decisions, in request_id order."""
+    get_campaign(db, tenant_id=tenant_id, campaign_id=campaign_id)
+    q = (
+        select(
+            ReviewItem.request_id,
+            ReviewItem.user_id,
+            CatalogResource.name.label("resource"),
+            CatalogAction.name.label("action"),
+            ReviewItem.granted_at,
+            ReviewDecision.decision,
+            ReviewDecision.decided_by,
+            ReviewDecision.decided_at,
+        )
+        .outerjoin(
+            ReviewDecision,
+            and_(
+                ReviewDecision.campaign_id == ReviewItem.campaign_id,
+                ReviewDecision.request_id == ReviewItem.request_id,
+            ),
+        )
+        .join(CatalogResource, CatalogResource.id == ReviewItem.resource_id)
+        .join(CatalogAction, CatalogAction.id == ReviewItem.action_id)
+        .where(ReviewItem.campaign_id == campaign_id)
+    )
+    if pending_only:
+        q = q.where(ReviewDecision.request_id.is_(None))
+    if cursor:
+        (after,) = grants_service.decode_cursor(cursor, 1)
+        q = q.where(ReviewItem.request_id > uuid.UUID(after))
+    rows = db.execute(q.order_by(ReviewItem.request_id).limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, grants_service.encode_cursor([str(rows[-1].request_id)])
+
+
+def _insert_decisions(db: Session, rows: list[dict]) -> set[uuid.UUID]:
+    """Insert decisions, skipping items decided concurrently; returns the request ids actually inserted."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise RuntimeError(f"Unsupported dialect for review decisions: {dialect}")
+
+    table = ReviewDecision.__table__
+    stmt = (
+        insert(table)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["campaign_id", "request_id"])
+        .returning(table.c.request_id)
+    )
+    return set(db.scalars(stmt))
+
+
+def _revoke(db: Session, campaign: ReviewCampaign, request_ids: list[uuid.UUID], actor_id: uuid.UUID) -> None:
+    """End the grants behind REVOKE decisions, the way PATCH /requests/{id}/revoke does."""
+    live = db.execute(
+        select(
+            AccessRequest.id,
+            AccessRequest.requester_id,
+            CatalogResource.name.label("resource"),
+            CatalogAction.name.label("action"),
+        )
+        .join(CatalogResource, CatalogResource.id == AccessRequest.resource_id)
+        .join(CatalogAction, CatalogAction.id == AccessRequest.action_id)
+        .where(
+            AccessRequest.id.in_(request_ids),
+            AccessRequest.tenant_id == campaign.tenant_id,
+            AccessRequest.status == RequestStatus.APPROVED,
+        )
+    ).all()
+    # A permanent grant outlives its request's move to the archive; its archive row is revoked as well,
+    # or `grants rebuild` would bring the grant back.
+    archived = db.execute(
+        select(
+            AccessRequestArchive.id,
+            AccessRequestArchive.requester_id,
+            AccessRequestArchive.resource,
+            AccessRequestArchive.action,
+        ).where(
+            AccessRequestArchive.id.in_(request_ids),
+            AccessRequestArchive.tenant_id == campaign.tenant_id,
+            AccessRequestArchive.status == RequestStatus.APPROVED.value,
+        )
+    ).all()
+    if live:
+        db.execute(
+            update(AccessRequest)
+            .where(AccessRequest.id.in_([r.id for r in live]), AccessRequest.status == RequestStatus.APPROVED)
+            .values(status=RequestStatus.REVOKED)
+            .execution_options(synchronize_session=False)
+        )
+    if archived:
+        db.execute(
+            update(AccessRequestArchive)
+            .where(
+                AccessRequestArchive.id.in_([r.id for r in archived]),
+                AccessRequestArchive.status == RequestStatus.APPROVED.value,
+            )
+            .values(status=RequestStatus.REVOKED.value)
+            .execution_options(synchronize_session=False)
+        )
+    ended = [*live, *archived]
+    for resource, count in Counter(r.resource for r in ended).items():
+        stats_service.record_transition(
+            db,
+            tenant_id=campaign.tenant_id,
+            resource=resource,
+            from_status="APPROVED",
+            to_status="REVOKED",
+            count=count,
+        )
+    grants_service.remove(db, request_ids)
+
+    for r in ended:
+        audit_service.emit(
+            db,
+            tenant_id=campaign.tenant_id,
+            actor_id=actor_id,
+            action="access_request.revoked",
+            entity_type="access_request",
+            entity_id=r.id,
+            details={
+                "requester_id": str(r.requester_id),
+                "resource": r.resource,
+                "action": r.action,
+                "previous_status": "APPROVED",
+                "new_status": "REVOKED",
+                "review_campaign_id": campaign.id,
+            },
+        )
+
+
+def decide(
+    db: Session,
+    *,
+    tenant_id: str,
+    campaign_id: int,
+    request_ids: list[uuid.UUID],
+    decision: str,
+    actor_id: uuid.UUID,
+    actor_role: str | None,
+    comment: str | None = None,
+    now: datetime | None = None,
+) -> DecisionResult:
+    """
+    Record one reviewer's decision on many items. Each item goes through
+    `policy.can_decide_request`: the reviewer must be an approver or admin,
+    the item undecided, the campaign neither closed nor past due, and nobody
+    reviews their own access. REVOKE also revokes the underlying grant.
+    The caller commits.
+    """
+    now = now or utcnow()
+    campaign = get_campaign(db, tenant_id=tenant_id, campaign_id=campaign_id)
+    if campaign.status == GENERATING:
+        raise CampaignNotOpen(f"Review campaign {campaign_id} is still being generated")
+    expired = campaign.status == CLOSED or (campaign.due_at is not None and as_utc(campaign.due_at) <= now)
+
+    wanted = list(dict.fromkeys(request_ids))
+    found = {
+        r.request_id: r
+        for r in db.execute(
+            select(ReviewItem.request_id, ReviewItem.user_id, ReviewDecision.decision)
+            .outerjoin(
+                ReviewDecision,
+                and_(
+                    ReviewDecision.campaign_id == ReviewItem.campaign_id,
+                    ReviewDecision.request_id == ReviewItem.request_id,
+                ),
+            )
+            .where(ReviewItem.campaign_id == campaign_id, ReviewItem.request_id.in_(wanted))
+        )
+    }
+
+    result = DecisionResult()
+    allowed: list[uuid.UUID] = []
+    for rid in wanted:
+        item = found.get(rid)
+        if item is None:
+            result.rejected.append((rid, 404, "Review item not found"))
+            continue
+        res = policy.can_decide_request(
+            actor_role=actor_role,
+            actor_id=str(actor_id),
+            requester_id=str(item.user_id),
+            current_status="PENDING" if item.decision is None else item.decision,
+            expired=expired,
+        )
+        if res.allowed:
+            allowed.append(rid)
+        else:
+            result.rejected.append((rid, res.status_code or 403, res.detail or "Forbidden"))
+    if not allowed:
+        return result
+
+    inserted = _insert_decisions(
+        db,
+        [
+            {
+                "campaign_id": campaign_id,
+                "request_id": rid,
+                "decision": decision,
+                "decided_by": actor_id,
+                "decided_at": now,
+                "comment": comment,
+            }
+            for rid in allowed
+        ],
+    )
+    for rid in allowed:
+        if rid in inserted:
+            result.decided.append(rid)
+        else:
+            result.rejected.append((rid, 400, "Request not pending"))
+    if not result.decided:
+        return result
+
+    counter = ReviewCampaign.certified_count if decision == CERTIFY else ReviewCampaign.revoked_count
+    db.execute(
+        update(ReviewCampaign)
+        .where(ReviewCampaign.id == campaign_id)
+        .values({counter: counter + len(result.decided)})
+        .execution_options(synchronize_session=False)
+    )
+    if decision == REVOKE:
+        _revoke(db, campaign, result.decided, actor_id)
+    return result
+
+
+def close_campaign(db: Session, *, tenant_id: str, campaign_id: int, now: datetime | None = None) -> ReviewCampaign:
+    """Stop accepting decisions; closing a campaign that is still generating also stops generation."""
+    campaign = get_campaign(db, tenant_id=tenant_id, campaign_id=campaign_id)
+    if campaign.status != CLOSED:
+        campaign.status = CLOSED
+        campaign.closed_at = now or utcnow()
+    return campaign
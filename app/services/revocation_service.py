@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import revocation
+from app.core.clock import as_utc, utcnow
+from app.core.config import jwt_expires_minutes
+from app.models.revocation import RevokedToken
+
+log = logging.getLogger(__name__)
+
+# Full rebuilds drop revocations whose tokens can no longer be valid.
+COMPACT_EVERY_SECONDS = 3600.0
+
+
+# Sequence ids can commit out of order; each sync also re-reads this window.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def _to_revocation(row: RevokedToken) -> revocation.Revocation:
+    # subject_id on a single-token row is informational only.
+    whole_subject = row.jti is None and row.subject_id is not None
+    return revocation.Revocation(
+        version=row.id,
+        jti=row.jti,
+        subject_id=str(row.subject_id) if whole_subject else None,
+        revoked_at=int(as_utc(row.revoked_at).timestamp()),
+    )
+
+
+def revoke_token(
+    db: Session,
+    *,
+    jti: str,
+    subject_id: uuid.UUID | None,
+    expires_at: datetime,
+    reason: str | None = None,
+) -> RevokedToken:
+    row = RevokedToken(jti=jti, subject_id=subject_id, reason=reason, revoked_at=utcnow(), expires_at=expires_at)
+    db.add(row)
+    db.flush()
+    return row
+
+
+def revoke_subject(db: Session, *, subject_id: uuid.UUID, reason: str | None = None) -> RevokedToken:
+    """Revoke every token issued to `subject_id` up to now."""
+    now = utcnow()
+    row = RevokedToken(
+        jti=None,
+        subject_id=subject_id,
+        reason=reason,
+        revoked_at=now,
+        expires_at=now + timedelta(minutes=jwt_expires_minutes()),
+    )
+    db.add(row)
+    db.flush()
+    return row
+
+
+def publish_local(row: RevokedToken) -> None:
+    """Make a revocation this process just committed effective here immediately."""
+    revocation.index.apply([_to_revocation(row)], advance_version=False)
+
+
+def load_all(db: Session) -> None:
+    rows = db.scalars(select(RevokedToken).where(RevokedToken.expires_at > utcnow()).order_by(RevokedToken.id)).all()
+    revocation.index.replace([_to_revocation(r) for r in rows])
+
+
+def sync(db: Session) -> int:
+    """Apply rows written (by any worker) since the last applied version."""
+    rows = db.scalars(
+        select(RevokedToken)
+        .where(or_(RevokedToken.id > revocation.index.version, RevokedToken.revoked_at >= utcnow() - SYNC_OVERLAP))
+        .order_by(RevokedToken.id)
+    ).all()
+    if rows:
+        revocation.index.apply([_to_revocation(r) for r in rows])
+    return len(rows)
+
+
+def purge_expired(db: Session, *, now: datetime | None = None) -> int:
+    res = db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= (now or utcnow())))
+    return res.rowcount or 0
+
+
+class RevocationSync:
+    """Background poller keeping this worker's index current; one per process."""
+
+    def __init__(self, session_factory: sessionmaker, interval: float) -> None:
+        self._session_factory = session_factory
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        with self._session_factory() as db:
+            load_all(db)
+        self._thread = threading.Thread(target=self._loop, name="revocation-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._interval + 1)
+
+    def _loop(self) -> None:
+        last_compaction = time.monotonic()
+        while not self._stop.wait(self._interval):
+            try:
+                with self._session_factory() as db:
+                    if time.monotonic() - last_compaction >= COMPACT_EVERY_SECONDS:
+                        load_all(db)
+                        last_compaction = time.monotonic()
+                    else:
+                        sync(db)
+            except Exception:  # keep serving with the last known index
+                log.exception("revocation sync failed")
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, func, insert, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.clock import as_utc, utcnow
+from app.core.lifecycle import RequestStatus
+from app.db import keyset
+from app.models.access_request import AccessRequest
+from app.models.routing import ApproverGroup, ApproverGroupMember, RequestAssignment, RoutingRule
+from app.models.user import User
+from app.services import search_service
+
+OPEN = RequestStatus.PENDING.value
+
+
+class RoutingConflict(ValueError):
+    """A group or rule with that name or prefix already exists."""
+
+
+class UnknownGroup(ValueError):
+    """No approver group with that id in the caller's tenant."""
+
+
+class UnknownUser(ValueError):
+    """No user with that id in the caller's tenant."""
+
+
+def create_group(db: Session, *, tenant_id: str, name: str) -> ApproverGroup:
+    group = ApproverGroup(tenant_id=tenant_id, name=name)
+    db.add(group)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise RoutingConflict(f"Approver group {name!r} already exists") from e
+    return group
+
+
+def _group(db: Session, tenant_id: str, group_id: int) -> ApproverGroup:
+    group = db.get(ApproverGroup, group_id)
+    if group is None or group.tenant_id != tenant_id:
+        raise UnknownGroup(f"Approver group {group_id} not found")
+    return group
+
+
+def add_member(db: Session, *, tenant_id: str, group_id: int, user_id: uuid.UUID) -> None:
+    _group(db, tenant_id, group_id)
+    # Groups never span tenants, so a queue built from memberships is tenant-scoped too.
+    user = db.get(User, user_id)
+    if user is None or user.tenant_id != tenant_id:
+        raise UnknownUser(f"User {user_id} not found")
+    if db.get(ApproverGroupMember, (group_id, user_id)) is None:
+        db.add(ApproverGroupMember(group_id=group_id, user_id=user_id))
+
+
+def remove_member(db: Session, *, tenant_id: str, group_id: int, user_id: uuid.UUID) -> None:
+    _group(db, tenant_id, group_id)
+    member = db.get(ApproverGroupMember, (group_id, user_id))
+    if member is not None:
+        db.delete(member)
+
+
+def create_rule(db: Session, *, tenant_id: str, resource_prefix: str, group_id: int) -> RoutingRule:
+    _group(db, tenant_id, group_id)
+    rule = RoutingRule(tenant_id=tenant_id, resource_prefix=resource_prefix, group_id=group_id)
+    db.add(rule)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise RoutingConflict(f"A rule for prefix {resource_prefix!r} already exists") from e
+    return rule
+
+
+def list_rules(db: Session, *, tenant_id: str) -> list[RoutingRule]:
+    q = select(RoutingRule).where(RoutingRule.tenant_id == tenant_id).order_by(RoutingRule.resource_prefix)
+    return list(db.scalars(q))
+
+
+def assign(db: Session, *, tenant_id: str, request_id: uuid.UUID, resource: str, created_at: datetime) -> None:
+    """
+    Route a new request to the group owning the longest matching resource
+    prefix among its tenant's rules. A single INSERT ... SELECT, so routing costs no extra round trip;
+    a request no rule matches stays in the pending queue only.
+    """
+    resource_param = bindparam("resource", resource, type_=RoutingRule.resource_prefix.type)
+    owner = (
+        select(
+            literal(request_id, AccessRequest.id.type),
+            RoutingRule.group_id,
+            literal(OPEN),
+            literal(created_at, RequestAssignment.created_at.type),
+        )
+        .where(
+            RoutingRule.tenant_id == tenant_id,
+            func.substr(resource_param, 1, func.length(RoutingRule.resource_prefix)) == RoutingRule.resource_prefix,
+        )
+        .order_by(func.length(RoutingRule.resource_prefix).desc())
+        .limit(1)
+    )
+    db.execute(insert(RequestAssignment).from_select(["request_id", "group_id", "status", "created_at"], owner))
+
+
+def close(db: Session, request_ids: list[uuid.UUID], status: str) -> None:
+    """Take decided or expired requests out of their group's open queue."""
+    if not request_ids:
+        return
+    db.execute(
+        update(RequestAssignment)
+        .where(RequestAssignment.request_id.in_(request_ids))
+        .values(status=status, claimed_by=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _open_for(user_id: uuid.UUID, now: datetime):
+    """Open assignments in the caller's groups that nobody else holds a live lease on."""
+    my_groups = select(ApproverGroupMember.group_id).where(ApproverGroupMember.user_id == user_id)
+    return select(RequestAssignment).where(
+        RequestAssignment.group_id.in_(my_groups),
+        RequestAssignment.status == OPEN,
+        or_(
+            RequestAssignment.claimed_by.is_(None),
+            RequestAssignment.claimed_by == user_id,
+            RequestAssignment.lease_expires_at <= now,
+        ),
+    )
+
+
+def my_queue(
+    db: Session,
+    *,
+    user_id: uuid.UUID,
+    limit: int,
+    cursor: str | None = None,
+    now: datetime | None = None,
+) -> tuple[list[AccessRequest], str | None]:
+    """The caller's slice of the pending queue, oldest first."""
+    now = now or utcnow()
+    dialect = db.get_bind().dialect.name
+    open_ = _open_for(user_id, now).subquery()
+    q = select(AccessRequest).join(open_, open_.c.request_id == AccessRequest.id)
+    if cursor:
+        ts, rid = search_service.decode_cursor(cursor)
+        q = q.where(keyset.after(open_.c.created_at, open_.c.request_id, ts, rid, dialect))
+    rows = list(db.scalars(q.order_by(open_.c.created_at, open_.c.request_id).limit(limit + 1)))
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, search_service.encode_cursor(rows[-1])
+
+
+def claim(
+    db: Session,
+    *,
+    user_id: uuid.UUID,
+    limit: int,
+    lease_seconds: int,
+    now: datetime | None = None,
+) -> list[AccessRequest]:
+    """
+    Lease up to `limit` unclaimed requests from the caller's groups, oldest
+    first. Rows another approver is claiming at the same moment are skipped
+    (FOR UPDATE SKIP LOCKED), so concurrent claims never return the same item.
+    """
+    now = now or utcnow()
+    q = (
+        _open_for(user_id, now)
+        .where(or_(RequestAssignment.claimed_by.is_(None), RequestAssignment.lease_expires_at <= now))
+        .order_by(RequestAssignment.created_at, RequestAssignment.request_id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    assignments = list(db.scalars(q))
+    if not assignments:
+        return []
+
+    lease_until = now + timedelta(seconds=lease_seconds)
+    for a in assignments:
+        a.claimed_by = user_id
+        a.lease_expires_at = lease_until
+    db.flush()
+
+    ids = [a.request_id for a in assignments]
+    by_id = {r.id: r for r in db.scalars(select(AccessRequest).where(AccessRequest.id.in_(ids)))}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def release(db: Session, *, request_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    db.execute(
+        update(RequestAssignment)
+        .where(RequestAssignment.request_id == request_id, RequestAssignment.claimed_by == user_id)
+        .values(claimed_by=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claimed_by_other(db: Session, *, request_id: uuid.UUID, user_id: uuid.UUID, now: datetime | None = None) -> bool:
+    a = db.get(RequestAssignment, request_id)
+    if a is None or a.claimed_by is None or a.claimed_by == user_id:
+        return False
+    return as_utc(a.lease_expires_at) > (now or utcnow())
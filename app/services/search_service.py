@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import re
+import uuid
+from datetime import datetime
+
+from sqlalchemy import column, func, literal_column, or_, select, text
+from sqlalchemy.orm import Query
+
+from app.db import keyset
+from app.models.access_request import AccessRequest
+from app.models.catalog import CatalogAction, CatalogResource
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_LIKE_SPECIALS = re.compile(r"([\\%_])")
+
+
+def _tokens(q: str) -> list[str]:
+    return [t.lower() for t in _TOKEN.findall(q)][:16]
+
+
+def apply_text_search(query: Query, dialect: str, q: str | None) -> Query:
+    """
+    Match every term of `q` as a prefix against resource, action and justification.
+
+    Postgres uses the trigger-maintained `search_vector` column (GIN); SQLite uses the
+    FTS5 shadow table kept in sync by triggers.
+    """
+    terms = _tokens(q or "")
+    if not terms:
+        return query
+
+    if dialect == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in terms)
+        return query.filter(
+            literal_column("access_requests.search_vector").op("@@")(func.to_tsquery(literal_column("'simple'::regconfig"), tsquery))
+        )
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{t}"*' for t in terms)
+        return query.filter(
+            literal_column("access_requests.rowid").in_(
+                text("SELECT rowid FROM access_requests_fts WHERE access_requests_fts MATCH :fts_match")
+                .bindparams(fts_match=match)
+                .columns(column("rowid"))
+            )
+        )
+
+    # Unindexed fallback for any other backend.
+    query = query.join(CatalogResource, CatalogResource.id == AccessRequest.resource_id).join(
+        CatalogAction, CatalogAction.id == AccessRequest.action_id
+    )
+    for t in terms:
+        pattern = f"%{t}%"
+        query = query.filter(
+            or_(
+                CatalogResource.name.ilike(pattern),
+                CatalogAction.name.ilike(pattern),
+                AccessRequest.justification.ilike(pattern),
+            )
+        )
+    return query
+
+
+def apply_resource_prefix(query: Query, prefix: str | None) -> Query:
+    # Matches names in the (small) catalog, then filters requests by id. On
+    # Postgres the ILIKE is served by the pg_trgm GIN index on catalog_resources.
+    if not prefix:
+        return query
+    escaped = _LIKE_SPECIALS.sub(r"\\\1", prefix)
+    matching = select(CatalogResource.id).where(CatalogResource.name.ilike(f"{escaped}%", escape="\\"))
+    return query.filter(AccessRequest.resource_id.in_(matching))
+
+
+def encode_cursor(req: AccessRequest) -> str:
+    raw = f"{req.created_at.isoformat()}|{req.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, req_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(req_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def apply_keyset(query: Query, dialect: str, cursor: str | None) -> Query:
+    """Order newest first and, given a cursor, resume strictly after it."""
+    created_at = AccessRequest.created_at
+    query = query.order_by(created_at.desc(), AccessRequest.id.desc())
+    if not cursor:
+        return query
+
+    after_created_at, after_id = decode_cursor(cursor)
+    return query.filter(keyset.before(created_at, AccessRequest.id, after_created_at, after_id, dialect))
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO
+
+from sqlalchemy import Connection, Engine, Table, inspect
+
+from app import models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.clock import utcnow
+from app.db.base import Base
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+CHUNK_BYTES = 64 << 20
+
+_BLOCK = 1 << 16
+_INSERT_BATCH = 1000
+
+# Row encoding per dialect. Postgres rows are COPY CSV exactly as the server
+# writes them; SQLite has no COPY, so rows are JSON arrays of the stored values.
+_ENCODINGS = {"postgresql": "csv", "sqlite": "jsonl"}
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+@dataclass
+class LoadReport:
+    tables: int = 0
+    rows: int = 0
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+
+def tables() -> list[Table]:
+    """Every table, parents before children."""
+    return list(Base.metadata.sorted_tables)
+
+
+def load_levels(ordered: list[Table]) -> list[list[Table]]:
+    """
+    Group tables so that each one only references tables in earlier groups;
+    the tables within a group can be loaded concurrently.
+    """
+    depth: dict[str, int] = {}
+    levels: list[list[Table]] = []
+    for table in ordered:
+        parents = {fk.column.table.name for fk in table.foreign_keys} - {table.name}
+        d = 1 + max((depth[p] for p in parents if p in depth), default=-1)
+        depth[table.name] = d
+        if d == len(levels):
+            levels.append([])
+        levels[d].append(table)
+    return levels
+
+
+def _encoding(engine: Engine) -> str:
+    encoding = _ENCODINGS.get(engine.dialect.name)
+    if encoding is None:
+        raise SnapshotError(f"Unsupported dialect for snapshots: {engine.dialect.name}")
+    return encoding
+
+
+def _quote(conn: Connection, name: str) -> str:
+    return conn.dialect.identifier_preparer.quote(name)
+
+
+def _select_sql(conn: Connection, table: Table, columns: list[str]) -> str:
+    cols = ", ".join(_quote(conn, c) for c in columns)
+    order = ", ".join(_quote(conn, c.name) for c in table.primary_key.columns)
+    return f"SELECT {cols} FROM {_quote(conn, table.name)} ORDER BY {order}"
+
+
+def _pg_session(conn: Connection) -> None:
+    # Same text for the same values on dump and on verify, whatever the server defaults.
+    conn.exec_driver_sql("SET TIME ZONE 'UTC'")
+    conn.exec_driver_sql("SET DateStyle = 'ISO, YMD'")
+
+
+def _export(conn: Connection, table: Table, columns: list[str]) -> Iterator[bytes]:
+    """One encoded row at a time, in primary-key order."""
+    sql = _select_sql(conn, table, columns)
+    if conn.dialect.name == "postgresql":
+        cur = conn.connection.cursor()
+        # The server sends one COPY message per row.
+        with cur.copy(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)") as copy:
+            for row in copy:
+                yield bytes(row)
+        return
+    result = conn.exec_driver_sql(sql)
+    for row in result:
+        yield json.dumps(list(row), separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def _import(conn: Connection, table: Table, columns: list[str], src: IO[bytes]) -> None:
+    cols = ", ".join(_quote(conn, c) for c in columns)
+    if conn.dialect.name == "postgresql":
+        cur = conn.connection.cursor()
+        with cur.copy(f"COPY {_quote(conn, table.name)} ({cols}) FROM STDIN WITH (FORMAT csv)") as copy:
+            while block := src.read(_BLOCK):
+                copy.write(block)
+        return
+    sql = f"INSERT INTO {_quote(conn, table.name)} ({cols}) VALUES ({', '.join('?' for _ in columns)})"
+    batch: list[tuple] = []
+    for line in src:
+        batch.append(tuple(json.loads(line)))
+        if len(batch) >= _INSERT_BATCH:
+            conn.exec_driver_sql(sql, batch)
+            batch = []
+    if batch:
+        conn.exec_driver_sql(sql, batch)
+
+
+def _alembic_revision(conn: Connection) -> str | None:
+    if not inspect(conn).has_table("alembic_version"):
+        return None
+    return conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+
+
+def _dump_table(conn: Connection, zf: zipfile.ZipFile, table: Table, encoding: str, chunk_bytes: int) -> dict:
+    columns = [c.name for c in table.columns]
+    digest = hashlib.sha256()
+    rows = size = 0
+    chunks: list[str] = []
+    out: IO[bytes] | None = None
+    try:
+        for line in _export(conn, table, columns):
+            if out is None or size >= chunk_bytes:
+                if out is not None:
+                    out.close()
+                name = f"data/{table.name}/{len(chunks):05d}.{encoding}"
+                chunks.append(name)
+                out = zf.open(name, "w", force_zip64=True)
+                size = 0
+            out.write(line)
+            digest.update(line)
+            size += len(line)
+            rows += 1
+    finally:
+        if out is not None:
+            out.close()
+    return {"name": table.name, "columns": columns, "rows": rows, "sha256": digest.hexdigest(), "chunks": chunks}
+
+
+def dump(engine: Engine, path: str, *, chunk_bytes: int = CHUNK_BYTES, compresslevel: int = 1) -> dict:
+    """
+    Stream every table into a zip of compressed chunks of at most about
+    `chunk_bytes` each, plus a manifest with row counts and checksums.
+    All tables are read in one REPEATABLE READ transaction, so the snapshot
+    is consistent while the application keeps writing.
+    """
+    encoding = _encoding(engine)
+    isolation = "REPEATABLE READ" if engine.dialect.name == "postgresql" else "SERIALIZABLE"
+    with (
+        engine.connect().execution_options(isolation_level=isolation) as conn,
+        zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf,
+    ):
+        if conn.dialect.name == "postgresql":
+            _pg_session(conn)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "dialect": engine.dialect.name,
+            "encoding": encoding,
+            "created_at": utcnow().isoformat(),
+            "alembic_revision": _alembic_revision(conn),
+            "tables": [_dump_table(conn, zf, table, encoding, chunk_bytes) for table in tables()],
+        }
+        zf.writestr(MANIFEST, json.dumps(manifest, indent=2))
+        conn.rollback()
+    return manifest
+
+
+def read_manifest(path: str) -> dict:
+    if not os.path.isfile(path):
+        raise SnapshotError(f"{path} does not exist")
+    with zipfile.ZipFile(path) as zf:
+        try:
+            manifest = json.loads(zf.read(MANIFEST))
+        except KeyError:
+            raise SnapshotError(f"{path} has no {MANIFEST}") from None
+    if manifest.get("format") != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format: {manifest.get('format')}")
+    return manifest
+
+
+def _check_target(conn: Connection, manifest: dict, *, truncate: bool) -> None:
+    if manifest["encoding"] != _ENCODINGS.get(conn.dialect.name):
+        raise SnapshotError(f"A {manifest['dialect']} snapshot cannot be loaded into {conn.dialect.name}")
+    revision = _alembic_revision(conn)
+    if manifest["alembic_revision"] and revision and manifest["alembic_revision"] != revision:
+        raise SnapshotError(
+            f"Snapshot is at schema revision {manifest['alembic_revision']}, the target at {revision}"
+        )
+
+    insp = inspect(conn)
+    for entry in manifest["tables"]:
+        if not insp.has_table(entry["name"]):
+            raise SnapshotError(f"Target has no table {entry['name']}")
+        missing = set(entry["columns"]) - {c["name"] for c in insp.get_columns(entry["name"])}
+        if missing:
+            raise SnapshotError(f"Target table {entry['name']} lacks columns {sorted(missing)}")
+
+    names = [entry["name"] for entry in manifest["tables"]]
+    if truncate:
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql(f"TRUNCATE {', '.join(_quote(conn, n) for n in names)}")
+        else:
+            for name in reversed(names):
+                conn.exec_driver_sql(f"DELETE FROM {_quote(conn, name)}")
+        return
+    for name in names:
+        if conn.exec_driver_sql(f"SELECT 1 FROM {_quote(conn, name)} LIMIT 1").first() is not None:
+            raise SnapshotError(f"Target table {name} is not empty; load with truncate to replace it")
+
+
+def _drop_indexes(conn: Connection, table: Table) -> list[str]:
+    """Drop the table's secondary indexes and return the DDL to recreate them."""
+    if conn.dialect.name == "postgresql":
+        rows = conn.exec_driver_sql(
+            """
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = to_regclass(%(table)s)
+              AND NOT x.indisprimary
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+            """,
+            {"table": table.name},
+        ).all()
+    else:
+        # Indexes backing PRIMARY KEY/UNIQUE constraints have no SQL of their own.
+        rows = conn.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table.name,),
+        ).all()
+    for name, _ in rows:
+        conn.exec_driver_sql(f"DROP INDEX {_quote(conn, name)}")
+    return [ddl for _, ddl in rows]
+
+
+def _reset_sequences(conn: Connection, table: Table) -> None:
+    column = table.autoincrement_column
+    if conn.dialect.name != "postgresql" or column is None:
+        return
+    conn.exec_driver_sql(
+        f"SELECT setval(pg_get_serial_sequence(%(table)s, %(column)s), COALESCE(MAX({_quote(conn, column.name)}), 0) + 1, false) "
+        f"FROM {_quote(conn, table.name)}",
+        {"table": table.name, "column": column.name},
+    )
+
+
+def _load_table(engine: Engine, path: str, table: Table, entry: dict) -> int:
+    # One transaction per table: a failed load leaves the table, and its indexes, as they were.
+    with engine.begin() as conn, zipfile.ZipFile(path) as zf:
+        if conn.dialect.name == "postgresql":
+            _pg_session(conn)
+        indexes = _drop_indexes(conn, table)
+        for name in entry["chunks"]:
+            with zf.open(name) as src:
+                _import(conn, table, entry["columns"], src)
+        for ddl in indexes:
+            conn.exec_driver_sql(ddl)
+        _reset_sequences(conn, table)
+    return entry["rows"]
+
+
+def _verify_table(engine: Engine, entry: dict) -> list[str]:
+    table = Base.metadata.tables[entry["name"]]
+    digest = hashlib.sha256()
+    rows = 0
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            _pg_session(conn)
+        for line in _export(conn, table, entry["columns"]):
+            digest.update(line)
+            rows += 1
+        conn.rollback()
+    problems = []
+    if rows != entry["rows"]:
+        problems.append(f"{entry['name']}: {rows} rows, snapshot has {entry['rows']}")
+    elif digest.hexdigest() != entry["sha256"]:
+        problems.append(f"{entry['name']}: checksum does not match the snapshot")
+    return problems
+
+
+def verify(engine: Engine, manifest: dict, *, workers: int = 4) -> list[str]:
+    """Re-export every table from `engine` and compare row counts and checksums with the manifest."""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return [p for problems in pool.map(lambda e: _verify_table(engine, e), manifest["tables"]) for p in problems]
+
+
+def load(engine: Engine, path: str, *, workers: int = 4, truncate: bool = False, check: bool = True) -> LoadReport:
+    """
+    Restore a snapshot into an existing schema at the same revision. Tables
+    are bulk-loaded with their secondary indexes dropped and rebuilt
+    afterwards; tables whose parents are already loaded are loaded
+    concurrently (SQLite has a single writer, so it loads one at a time).
+    Chunks are streamed from the archive, so memory use does not grow with
+    the snapshot size.
+    """
+    manifest = read_manifest(path)
+    with engine.begin() as conn:
+        _check_target(conn, manifest, truncate=truncate)
+
+    if engine.dialect.name == "sqlite":
+        workers = 1
+    entries = {entry["name"]: entry for entry in manifest["tables"]}
+    report = LoadReport()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for level in load_levels(tables()):
+            todo = [table for table in level if table.name in entries]
+            for rows in pool.map(lambda t: _load_table(engine, path, t, entries[t.name]), todo):
+                report.tables += 1
+                report.rows += rows
+
+    if check:
+        report.problems = verify(engine, manifest, workers=workers)
+    return report
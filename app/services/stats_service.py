@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.clock import as_utc, utcnow
+from app.core.config import stats_max_age_seconds
+from app.models.request_stats import RequestDecisionLatency, RequestStat
+
+_CACHE_MAX_ENTRIES = 1024
+
+_cache: dict[tuple[str, str | None], tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def latency_bucket(seconds: float) -> int:
+    """Bucket 0 is [0, 1s); bucket b >= 1 is [2**((b-1)/2), 2**(b/2)) seconds."""
+    if seconds < 1:
+        return 0
+    return int(math.floor(2 * math.log2(seconds))) + 1
+
+
+def bucket_midpoint(bucket: int) -> float:
+    if bucket <= 0:
+        return 0.5
+    return 2 ** ((2 * bucket - 1) / 4)
+
+
+def _upsert_increment(db: Session, model, keys: dict, delta: int) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        insert = postgresql.insert
+    elif dialect == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise RuntimeError(f"Unsupported dialect for stats upsert: {dialect}")
+
+    table = model.__table__
+    stmt = insert(table).values(**keys, total=delta)
+    stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_={"total": table.c.total + delta})
+    db.execute(stmt)
+
+
+def record_created(db: Session, *, tenant_id: str, resource: str) -> None:
+    _upsert_increment(db, RequestStat, {"tenant_id": tenant_id, "resource": resource, "status": "PENDING"}, 1)
+
+
+def record_transition(
+    db: Session,
+    *,
+    tenant_id: str,
+    resource: str,
+    from_status: str,
+    to_status: str,
+    created_at: datetime | None = None,
+    decided_at: datetime | None = None,
+    count: int = 1,
+) -> None:
+    """Move `count` requests between status counters; call in the transaction that changes their status."""
+    _upsert_increment(db, RequestStat, {"tenant_id": tenant_id, "resource": resource, "status": from_status}, -count)
+    _upsert_increment(db, RequestStat, {"tenant_id": tenant_id, "resource": resource, "status": to_status}, count)
+
+    if created_at is not None and decided_at is not None:
+        seconds = max((as_utc(decided_at) - as_utc(created_at)).total_seconds(), 0.0)
+        keys = {"tenant_id": tenant_id, "resource": resource, "bucket": latency_bucket(seconds)}
+        _upsert_increment(db, RequestDecisionLatency, keys, 1)
+
+
+def _median(histogram: dict[int, int]) -> float | None:
+    n = sum(histogram.values())
+    if n <= 0:
+        return None
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen * 2 >= n:
+            return bucket_midpoint(bucket)
+    return None
+
+
+def _compute(db: Session, tenant_id: str, resource: str | None) -> dict:
+    counts_q = select(RequestStat.resource, RequestStat.status, RequestStat.total).where(
+        RequestStat.tenant_id == tenant_id
+    )
+    latency_q = select(
+        RequestDecisionLatency.resource, RequestDecisionLatency.bucket, RequestDecisionLatency.total
+    ).where(RequestDecisionLatency.tenant_id == tenant_id)
+    if resource is not None:
+        counts_q = counts_q.where(RequestStat.resource == resource)
+        latency_q = latency_q.where(RequestDecisionLatency.resource == resource)
+
+    per_resource: dict[str, dict] = {}
+    totals: dict[str, int] = {}
+    for res, st, total in db.execute(counts_q):
+        row = per_resource.setdefault(res, {"resource": res, "counts": {}, "histogram": {}})
+        row["counts"][st] = row["counts"].get(st, 0) + total
+        totals[st] = totals.get(st, 0) + total
+
+    overall: dict[int, int] = {}
+    for res, bucket, total in db.execute(latency_q):
+        row = per_resource.setdefault(res, {"resource": res, "counts": {}, "histogram": {}})
+        row["histogram"][bucket] = total
+        overall[bucket] = overall.get(bucket, 0) + total
+
+    resources = [
+        {
+            "resource": row["resource"],
+            "counts": row["counts"],
+            "median_decision_seconds": _median(row["histogram"]),
+        }
+        for row in sorted(per_resource.values(), key=lambda r: r["resource"])
+    ]
+    return {
+        "as_of": utcnow(),
+        "counts": totals,
+        "median_decision_seconds": _median(overall),
+        "resources": resources,
+    }
+
+
+def snapshot(db: Session, *, tenant_id: str, resource: str | None = None) -> dict:
+    """
+    One tenant's dashboard aggregates, read from the summary tables only, so
+    the cost depends on the number of resources, not the number of requests.
+    Results are reused for up to STATS_MAX_AGE_SECONDS.
+    """
+    max_age = stats_max_age_seconds()
+    now = time.monotonic()
+    if max_age > 0:
+        with _cache_lock:
+            hit = _cache.get((tenant_id, resource))
+        if hit is not None and now - hit[0] < max_age:
+            return hit[1]
+
+    result = _compute(db, tenant_id, resource)
+    if max_age > 0:
+        with _cache_lock:
+            if len(_cache) >= _CACHE_MAX_ENTRIES:
+                _cache.clear()
+            _cache[(tenant_id, resource)] = (now, result)
+    return result
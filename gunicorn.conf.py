@@ -0,0 +1,44 @@
+"""
+Production server settings: `gunicorn -c gunicorn.conf.py app.main:app`.
+
+The app's modules (routers, models, schemas) are imported once in the master
+and shared copy-on-write with the workers. The crypt context and the database
+engine are built lazily, on first use inside each worker. Each worker still
+drops any inherited connection pool right after fork so no socket is shared
+across processes.
+"""
+
+import multiprocessing
+import os
+
+
+def _int_env(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw else default
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = _int_env("WEB_CONCURRENCY", multiprocessing.cpu_count())
+
+preload_app = True
+
+# Recycle workers to bound slow leaks; jitter keeps them from restarting together.
+max_requests = _int_env("MAX_REQUESTS", 10000)
+max_requests_jitter = _int_env("MAX_REQUESTS_JITTER", max(max_requests // 10, 1) if max_requests else 0)
+
+# In-flight requests get this long to finish on recycle or SIGTERM.
+graceful_timeout = _int_env("GRACEFUL_TIMEOUT", 30)
+timeout = _int_env("WORKER_TIMEOUT", 60)
+keepalive = _int_env("KEEPALIVE", 5)
+
+accesslog = "-" if os.getenv("ACCESS_LOG", "").strip() == "1" else None
+
+
+def post_fork(server, worker):
+    from app.db.session import dispose_engine
+
+    # The engine is normally built per worker in the lifespan hook; this only
+    # matters if something in the master touched the database before forking.
+    # close=False: leave the parent's connections alone, just forget them here.
+    dispose_engine(close=False)
@@ -2,9 +2,19 @@ from __future__ import annotations
 
 import os
 import pytest
+from fastapi.testclient import TestClient
 
+from app import models  # noqa: F401
 from app.db.base import Base
 from app.db.session import engine
+from app.main import app
+
+PASSWORD = "StrongPass123"
+
+# Catalog ids are cached in-process and rows are never deleted by the app, so they survive between tests.
+KEPT_TABLES = frozenset({"catalog_resources", "catalog_actions"})
+
+_client = TestClient(app)
 
 
 @pytest.fixture( autouse=True)
@@ -18,3 +28,57 @@ def _schema() -> None:
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+
+
+def wipe_tables() -> None:
+    # Children first, so foreign keys never see a dangling row.
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in KEPT_TABLES:
+                conn.execute(table.delete())
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables() -> None:
+    wipe_tables()
+
+
+@pytest.fixture()
+def wipe():
+    """For tests that need a clean database again part-way through."""
+    return wipe_tables
+
+
+@pytest.fixture()
+def register():
+    def _register(
+        email: str,
+        role: str = "REQUESTER",
+        *,
+        tenant: str | None = None,
+        password: str = PASSWORD,
+        headers: dict[str, str] | None = None,
+    ) -> str:
+        body = {"email": email, "password": password, "role": role}
+        if tenant is not None:
+            body["tenant_id"] = tenant
+        r = _client.post("/auth/register", json=body, headers=headers)
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+
+    return _register
+
+
+@pytest.fixture()
+def login():
+    """Log in and return the Authorization header."""
+
+    def _login(email: str, *, tenant: str | None = None, password: str = PASSWORD) -> dict[str, str]:
+        body = {"email": email, "password": password}
+        if tenant is not None:
+            body["tenant_id"] = tenant
+        r = _client.post("/auth/login", json=body)
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    return _login
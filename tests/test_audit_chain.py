@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from app.core import merkle
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.audit import AuditEvent
+from app.services import audit_chain_service, retention_service
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def decided_requests(register, login):
+    def _decided(n: int) -> None:
+        register("chain-req@example.com", "REQUESTER")
+        register("chain-app@example.com", "APPROVER")
+        req_headers = login("chain-req@example.com")
+        app_headers = login("chain-app@example.com")
+        for i in range(n):
+            r = client.post(
+                "/requests",
+                headers=req_headers,
+                json={"resource": f"chain-{i}", "action": "READ"},
+            )
+            assert r.status_code == 201, r.text
+            a = client.patch(f"/requests/{r.json()['id']}/approve", headers=app_headers)
+            assert a.status_code == 200, a.text
+
+    return _decided
+
+
+def test_merkle_proofs_round_trip():
+    leaves = [merkle.chain(merkle.GENESIS, str(i).encode()) for i in range(7)]
+    root = merkle.root(leaves)
+    for i, leaf in enumerate(leaves):
+        assert merkle.verify_proof(leaf, merkle.proof(leaves, i), root)
+    assert not merkle.verify_proof(leaves[0], merkle.proof(leaves, 1), root)
+
+
+def test_seal_checkpoint_and_verify(decided_requests):
+    decided_requests(5)
+
+    with SessionLocal() as db:
+        sealed, checkpoints = audit_chain_service.seal(db, batch_size=2, checkpoint_size=2)
+    assert sealed == 5
+    assert checkpoints == 2
+
+    report = audit_chain_service.verify(SessionLocal)
+    assert report.ok, report.problems
+    assert (report.events, report.partitions) == (5, 3)
+
+    with SessionLocal() as db:
+        proof = audit_chain_service.inclusion_proof(db, db.scalar(select(AuditEvent.id).where(AuditEvent.seq == 3)))
+        pending = audit_chain_service.inclusion_proof(db, db.scalar(select(AuditEvent.id).where(AuditEvent.seq == 5)))
+    assert pending is None
+    assert proof["checkpoint"]["first_seq"] == 3
+    assert merkle.verify_proof(proof["hash"], proof["proof"], proof["checkpoint"]["root"])
+
+
+def test_verify_spans_the_archive(decided_requests):
+    decided_requests(3)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE audit_events SET created_at = '2000-01-01 00:00:00' "
+                "WHERE id IN (SELECT id FROM audit_events ORDER BY created_at, id LIMIT 2)"
+            )
+        )
+    with SessionLocal() as db:
+        audit_chain_service.seal(db, checkpoint_size=2)
+        moved = retention_service.run_job(
+            db, retention_service.AUDIT_JOB, cutoff=datetime(2001, 1, 1, tzinfo=timezone.utc), batch_size=10
+        )
+    assert moved.rows_moved == 2
+
+    report = audit_chain_service.verify(SessionLocal)
+    assert report.ok, report.problems
+    assert report.events == 3
+
+
+def test_tampering_and_deletion_are_detected(decided_requests):
+    decided_requests(4)
+    with SessionLocal() as db:
+        audit_chain_service.seal(db, checkpoint_size=2)
+
+    with engine.begin() as conn:
+        conn.execute(text("""UPDATE audit_events SET details = '{"resource": "forged"}' WHERE seq = 2"""))
+        conn.execute(text("DELETE FROM audit_events WHERE seq = 3"))
+
+    report = audit_chain_service.verify(SessionLocal, workers=2)
+    assert not report.ok
+    assert any("seq 2: content does not match hash" in p for p in report.problems)
+    assert any("seq 3..3: missing events" in p for p in report.problems)
+
+    with SessionLocal() as db:
+        proof = audit_chain_service.inclusion_proof(db, db.scalar(select(AuditEvent.id).where(AuditEvent.seq == 4)))
+    assert "proof" not in proof
+    assert proof["problem"] == "checkpoint 3..4: range incomplete (1 of 2 events)"
+
+
+def test_deleting_a_user_leaves_sealed_events_intact(decided_requests):
+    decided_requests(2)
+    with SessionLocal() as db:
+        audit_chain_service.seal(db, checkpoint_size=2)
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM users WHERE email = 'chain-app@example.com'"))
+
+    report = audit_chain_service.verify(SessionLocal)
+    assert report.ok, report.problems
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event, func, select
+
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.catalog import CatalogResource
+from app.services import catalog_service
+
+client = TestClient(app)
+
+
+def test_requests_share_catalog_rows_and_return_names(register, login) -> None:
+    register("cat-req@example.com", "REQUESTER")
+    headers = login("cat-req@example.com")
+
+    for action, justification in (("READ", "first"), ("WRITE", "second")):
+        r = client.post("/requests", headers=headers, json={"resource": "catalog-db", "action": action, "justification": justification})
+        assert r.status_code == 201, r.text
+        assert (r.json()["resource"], r.json()["action"]) == ("catalog-db", action)
+
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count()).where(CatalogResource.name == "catalog-db")) == 1
+
+    r = client.get("/requests", params={"resource_prefix": "catalog-", "q": "second"}, headers=headers)
+    assert [(x["resource"], x["justification"]) for x in r.json()] == [("catalog-db", "second")]
+
+
+def test_intern_is_cached_after_commit_only() -> None:
+    catalog_service.clear_cache()
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    with SessionLocal() as db:
+        rid = catalog_service.resource_id(db, "rolled-back-resource")
+        db.rollback()
+        # Never committed, so it must not be served from the cache.
+        assert catalog_service.lookup(db, CatalogResource, "rolled-back-resource") is None
+
+        rid = catalog_service.resource_id(db, "interned-resource")
+        db.commit()
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            assert catalog_service.resource_id(db, "interned-resource") == rid
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+    assert statements == []
+
+
+def test_listing_loads_names_per_page_not_per_row(register, login) -> None:
+    register("cat-list@example.com", "REQUESTER")
+    headers = login("cat-list@example.com")
+    for i in range(12):
+        r = client.post("/requests", headers=headers, json={"resource": f"list-db-{i}", "action": "READ"})
+        assert r.status_code == 201, r.text
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        r = client.get("/requests", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    assert sorted(x["resource"] for x in r.json()) == sorted(f"list-db-{i}" for i in range(12))
+    # One IN query per catalog table, however many rows the page has.
+    catalog = [s for s in statements if "catalog_" in s]
+    assert len(catalog) == 2 and not any("access_requests" in s for s in catalog)
+
+    r = client.get("/requests", headers=headers, params={"fields": "id,resource,action", "limit": 3})
+    assert r.status_code == 200, r.text
+    assert all(set(x) == {"id", "resource", "action"} and x["action"] == "READ" for x in r.json())
+
+
+def test_intern_miss_is_a_single_statement() -> None:
+    with SessionLocal() as db:
+        rid = catalog_service.resource_id(db, "single-statement-resource")
+        db.commit()
+    catalog_service.clear_cache()
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args) -> None:
+        if "catalog_resources" in statement:
+            statements.append(statement)
+
+    # Every engine: on a SQLite file the insert goes through the writer's own engine.
+    event.listen(Engine, "before_cursor_execute", _count)
+    try:
+        with SessionLocal() as db:
+            assert catalog_service.resource_id(db, "single-statement-resource") == rid
+    finally:
+        event.remove(Engine, "before_cursor_execute", _count)
+    assert len(statements) == 1 and statements[0].lstrip().upper().startswith("INSERT")
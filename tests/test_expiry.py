@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.clock import utcnow
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services import expiry_service
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def users(register, login) -> tuple[dict[str, str], dict[str, str]]:
+    register("exp-req@example.com", "REQUESTER")
+    register("exp-app@example.com", "APPROVER")
+    return login("exp-req@example.com"), login("exp-app@example.com")
+
+
+def _create(headers: dict[str, str], resource: str, expires_in: timedelta | None) -> str:
+    body: dict = {"resource": resource, "action": "READ"}
+    if expires_in is not None:
+        body["expires_at"] = (utcnow() + expires_in).isoformat()
+    r = client.post("/requests", headers=headers, json=body)
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def _statuses(headers: dict[str, str]) -> dict[str, str]:
+    r = client.get("/requests", headers=headers)
+    return {x["resource"]: x["status"] for x in r.json()}
+
+
+def test_expires_at_must_be_in_future(users) -> None:
+    req_headers, _ = users
+
+    r = client.post(
+        "/requests",
+        headers=req_headers,
+        json={"resource": "jira", "action": "READ", "expires_at": (utcnow() - timedelta(minutes=1)).isoformat()},
+    )
+    assert r.status_code == 422, r.text
+
+
+def test_scheduler_expires_grants_and_cancels_stale_pending(users) -> None:
+    req_headers, app_headers = users
+
+    granted = _create(req_headers, "aws", timedelta(hours=1))
+    _create(req_headers, "jira", timedelta(hours=1))
+    _create(req_headers, "wiki", None)
+    later = _create(req_headers, "vpn", timedelta(days=3))
+    for rid in (granted, later):
+        a = client.patch(f"/requests/{rid}/approve", headers=app_headers)
+        assert a.status_code == 200, a.text
+
+    scheduler = expiry_service.ExpiryScheduler(session_factory=SessionLocal, batch_size=1)
+    assert scheduler.tick(now=utcnow() + timedelta(hours=2)) == 2
+
+    assert _statuses(req_headers) == {"aws": "EXPIRED", "jira": "CANCELLED", "wiki": "PENDING", "vpn": "APPROVED"}
+
+    with engine.connect() as conn:
+        actions = conn.execute(text("SELECT action FROM audit_events WHERE action LIKE 'access_request.%ed'")).scalars()
+        assert sorted(actions) == ["access_request.approved", "access_request.approved", "access_request.cancelled", "access_request.expired"]
+
+    # Nothing left that is due.
+    assert scheduler.tick(now=utcnow() + timedelta(hours=2)) == 0
+    assert 0 < scheduler.seconds_until_next() <= scheduler.max_sleep
+
+
+def test_cannot_approve_after_expiry(users) -> None:
+    req_headers, app_headers = users
+
+    rid = _create(req_headers, "aws", timedelta(hours=1))
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE access_requests SET expires_at = :ts"), {"ts": utcnow() - timedelta(minutes=1)})
+
+    r = client.patch(f"/requests/{rid}/approve", headers=app_headers)
+    assert r.status_code == 400, r.text
+    assert r.json()["detail"] == "Request expired"
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, text
+
+from app.core.clock import utcnow
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.grant import Grant
+from app.services import catalog_service, expiry_service, grants_service, retention_service
+
+client = TestClient(app)
+
+
+def _approved(
+    req_headers: dict[str, str], app_headers: dict[str, str], resource: str, action: str = "READ", expires_in: timedelta | None = None
+) -> str:
+    body: dict = {"resource": resource, "action": action}
+    if expires_in is not None:
+        body["expires_at"] = (utcnow() + expires_in).isoformat()
+    r = client.post("/requests", headers=req_headers, json=body)
+    assert r.status_code == 201, r.text
+    rid = r.json()["id"]
+    r = client.patch(f"/requests/{rid}/approve", headers=app_headers)
+    assert r.status_code == 200, r.text
+    return rid
+
+
+@pytest.fixture()
+def users(register, login) -> tuple[str, dict[str, str], dict[str, str]]:
+    user_id = register("gr-req@example.com", "REQUESTER")
+    register("gr-app@example.com", "APPROVER")
+    return user_id, login("gr-req@example.com"), login("gr-app@example.com")
+
+
+def test_approve_and_revoke_maintain_grants(users) -> None:
+    user_id, req_headers, app_headers = users
+    rid = _approved(req_headers, app_headers, "github", "WRITE")
+
+    r = client.get("/grants", params={"resource": "github"}, headers=app_headers)
+    assert r.status_code == 200, r.text
+    assert [(g["request_id"], g["user_id"], g["action"]) for g in r.json()] == [(rid, user_id, "WRITE")]
+
+    # Requesters may list their own access, but not ask who has access to a resource.
+    r = client.get(f"/grants/users/{user_id}", headers=req_headers)
+    assert r.status_code == 200, r.text
+    assert [g["resource"] for g in r.json()] == ["github"]
+    assert client.get("/grants", params={"resource": "github"}, headers=req_headers).status_code == 403
+    assert client.get(f"/grants/users/{uuid.uuid4()}", headers=req_headers).status_code == 403
+
+    assert client.patch(f"/requests/{rid}/revoke", headers=req_headers).status_code == 403
+    r = client.patch(f"/requests/{rid}/revoke", headers=app_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "REVOKED"
+    assert client.patch(f"/requests/{rid}/revoke", headers=app_headers).status_code == 400
+
+    assert client.get("/grants", params={"resource": "github"}, headers=app_headers).json() == []
+
+
+def _race(n: int, call) -> list[int]:
+    codes: list[int] = []
+    start = threading.Barrier(n)
+
+    def run() -> None:
+        start.wait()
+        codes.append(call().status_code)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(codes)
+
+
+def test_concurrent_approvals_and_revocations_apply_once(users) -> None:
+    _, req_headers, app_headers = users
+    rid = client.post("/requests", headers=req_headers, json={"resource": "race-vault", "action": "READ"}).json()["id"]
+
+    assert _race(4, lambda: client.patch(f"/requests/{rid}/approve", headers=app_headers)) == [200, 400, 400, 400]
+    assert len(client.get("/grants", params={"resource": "race-vault"}, headers=app_headers).json()) == 1
+
+    assert _race(4, lambda: client.patch(f"/requests/{rid}/revoke", headers=app_headers)) == [200, 400, 400, 400]
+    with engine.connect() as conn:
+        revoked = conn.execute(text("SELECT COUNT(*) FROM audit_events WHERE action = 'access_request.revoked'")).scalar()
+    assert revoked == 1
+
+
+def test_revoke_reaches_a_permanent_grant_whose_request_was_archived(users) -> None:
+    _, req_headers, app_headers = users
+    rid = _approved(req_headers, app_headers, "vault")
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE access_requests SET decided_at = :old"), {"old": utcnow() - timedelta(days=400)})
+    with SessionLocal() as db:
+        moved = retention_service.run_job(
+            db, retention_service.REQUESTS_JOB, cutoff=utcnow() - timedelta(days=365), batch_size=100
+        )
+    assert moved.rows_moved == 1
+    assert len(client.get("/grants", params={"resource": "vault"}, headers=app_headers).json()) == 1
+
+    r = client.patch(f"/requests/{rid}/revoke", headers=app_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "REVOKED"
+    assert client.get("/grants", params={"resource": "vault"}, headers=app_headers).json() == []
+    assert client.patch(f"/requests/{rid}/revoke", headers=app_headers).status_code == 400
+
+    # The archive records the revocation, so a rebuild does not resurrect the grant.
+    with SessionLocal() as db:
+        assert grants_service.rebuild(db, dry_run=True).missing == 0
+
+
+def test_expiry_removes_grant(users) -> None:
+    user_id, req_headers, app_headers = users
+    _approved(req_headers, app_headers, "vpn", expires_in=timedelta(minutes=5))
+    _approved(req_headers, app_headers, "wiki")
+
+    with SessionLocal() as db:
+        assert expiry_service.expire_batch(db, now=utcnow() + timedelta(minutes=10)) == 1
+
+    r = client.get(f"/grants/users/{user_id}", headers=app_headers)
+    assert [g["resource"] for g in r.json()] == ["wiki"]
+
+
+def test_lapsed_grant_is_hidden_before_the_scheduler_runs(users) -> None:
+    user_id, req_headers, app_headers = users
+    lapsed = _approved(req_headers, app_headers, "vpn", expires_in=timedelta(minutes=5))
+    _approved(req_headers, app_headers, "wiki")
+    with SessionLocal() as db:
+        db.get(Grant, uuid.UUID(lapsed)).expires_at = utcnow() - timedelta(seconds=1)
+        db.commit()
+
+    r = client.get(f"/grants/users/{user_id}", headers=app_headers)
+    assert [g["resource"] for g in r.json()] == ["wiki"]
+    assert client.get("/grants", params={"resource": "vpn"}, headers=app_headers).json() == []
+
+
+def test_grants_pages_with_cursor(users) -> None:
+    user_id, req_headers, app_headers = users
+    for resource in ("a", "b", "c"):
+        _approved(req_headers, app_headers, resource)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = client.get(f"/grants/users/{user_id}", params=params, headers=app_headers)
+        assert r.status_code == 200, r.text
+        seen += [g["resource"] for g in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == ["a", "b", "c"]
+
+    r = client.get(f"/grants/users/{user_id}", params={"cursor": "bogus"}, headers=app_headers)
+    assert r.status_code == 400
+
+
+def test_rebuild_reports_and_repairs_differences(users) -> None:
+    user_id, req_headers, app_headers = users
+    kept = _approved(req_headers, app_headers, "db")
+    lost = _approved(req_headers, app_headers, "s3")
+
+    stray = uuid.uuid4()
+    with SessionLocal() as db:
+        db.execute(delete(Grant).where(Grant.request_id == uuid.UUID(lost)))
+        db.add(
+            Grant(
+                request_id=stray,
+                user_id=uuid.UUID(user_id),
+                resource_id=catalog_service.resource_id(db, "x"),
+                action_id=catalog_service.action_id(db, "READ"),
+                granted_at=utcnow(),
+            )
+        )
+        db.get(Grant, uuid.UUID(kept)).action_id = catalog_service.action_id(db, "ADMIN")
+        db.commit()
+
+        report = grants_service.rebuild(db, batch_size=1, dry_run=True)
+        assert (report.scanned, report.missing, report.stale, report.changed) == (2, 1, 1, 1)
+
+        report = grants_service.rebuild(db, batch_size=1)
+        assert report.differences == 3
+        assert grants_service.rebuild(db, batch_size=1).differences == 0
+
+        rows = {g.request_id: g.action for g in db.query(Grant)}
+    assert rows == {uuid.UUID(kept): "READ", uuid.UUID(lost): "READ"}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_create_retry_with_same_key_replays_response(register, login) -> None:
+    register("idem1@example.com", "REQUESTER")
+    auth = login("idem1@example.com")
+    headers = {**auth, "Idempotency-Key": "create-1"}
+    body = {"resource": "jira", "action": "READ"}
+
+    r1 = client.post("/requests", headers=headers, json=body)
+    assert r1.status_code == 201, r1.text
+
+    r2 = client.post("/requests", headers=headers, json=body)
+    assert r2.status_code == 201, r2.text
+    assert r2.headers.get("Idempotent-Replayed") == "true"
+    assert r2.json() == r1.json()
+
+    listed = client.get("/requests", headers=auth)
+    assert len(listed.json()) == 1
+
+
+def test_key_reuse_with_different_payload_rejected(register, login) -> None:
+    register("idem2@example.com", "REQUESTER")
+    auth = login("idem2@example.com")
+    headers = {**auth, "Idempotency-Key": "create-2"}
+
+    r1 = client.post("/requests", headers=headers, json={"resource": "jira", "action": "READ"})
+    assert r1.status_code == 201, r1.text
+
+    r2 = client.post("/requests", headers=headers, json={"resource": "aws", "action": "ADMIN"})
+    assert r2.status_code == 422, r2.text
+
+
+def test_approve_retry_replays_instead_of_failing(register, login) -> None:
+    register("idem3@example.com", "REQUESTER")
+    register("idem-app@example.com", "APPROVER")
+    req_auth = login("idem3@example.com")
+    app_auth = login("idem-app@example.com")
+
+    r = client.post(
+        "/requests",
+        headers=req_auth,
+        json={"resource": "aws", "action": "ADMIN"},
+    )
+    req_id = r.json()["id"]
+
+    headers = {**app_auth, "Idempotency-Key": "approve-1"}
+    a1 = client.patch(f"/requests/{req_id}/approve", headers=headers)
+    assert a1.status_code == 200, a1.text
+
+    a2 = client.patch(f"/requests/{req_id}/approve", headers=headers)
+    assert a2.status_code == 200, a2.text
+    assert a2.json()["status"] == "APPROVED"
+    assert a2.json()["decided_at"] == a1.json()["decided_at"]
+
+    # Without the key the retry is a genuine second decision and is refused.
+    a3 = client.patch(f"/requests/{req_id}/approve", headers=app_auth)
+    assert a3.status_code == 400, a3.text
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import ecdsa
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from app.core import keys
+from app.core.jwt import create_access_token, decode_access_token
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def key_dir(tmp_path, monkeypatch):
+    for kid in ("2026-09", "2026-10"):
+        pem = ecdsa.SigningKey.generate(curve=ecdsa.NIST256p).to_pem()
+        (tmp_path / f"{kid}.pem").write_bytes(pem)
+    monkeypatch.setenv("JWT_KEYS_DIR", str(tmp_path))
+    monkeypatch.setenv("JWT_ALGORITHM", "ES256")
+    monkeypatch.setenv("JWT_ACTIVE_KID", "2026-10")
+    keys.reload()
+    yield tmp_path
+    keys.reload()
+
+
+def test_tokens_are_signed_with_the_active_kid(key_dir, monkeypatch) -> None:
+    token = create_access_token(sub="user-1", role="REQUESTER")
+    header = jwt.get_unverified_header(token)
+    assert (header["alg"], header["kid"]) == ("ES256", "2026-10")
+    assert decode_access_token(token)["sub"] == "user-1"
+
+    # Rotating back: tokens from the previous active key keep verifying.
+    monkeypatch.setenv("JWT_ACTIVE_KID", "2026-09")
+    assert jwt.get_unverified_header(create_access_token(sub="user-2", role="REQUESTER"))["kid"] == "2026-09"
+    assert decode_access_token(token)["sub"] == "user-1"
+
+
+def test_several_signing_keys_need_an_explicit_active_kid(key_dir, monkeypatch) -> None:
+    monkeypatch.delenv("JWT_ACTIVE_KID")
+    with pytest.raises(RuntimeError, match="JWT_ACTIVE_KID"):
+        keys.keyring()
+
+    # A lone signing key is unambiguous.
+    (key_dir / "2026-09.pem").unlink()
+    keys.reload()
+    assert keys.keyring().active_kid == "2026-10"
+
+
+def test_unknown_kid_and_shared_secret_tokens_are_rejected(key_dir, monkeypatch) -> None:
+    token = create_access_token(sub="user-1", role="REQUESTER")
+    (key_dir / "2026-10.pem").unlink()
+    monkeypatch.setenv("JWT_ACTIVE_KID", "2026-09")
+    keys.reload()
+    with pytest.raises(ValueError):
+        decode_access_token(token)
+
+    forged = jwt.encode({"sub": "user-1", "role": "ADMIN"}, "test-secret", algorithm="HS256", headers={"kid": "2026-09"})
+    with pytest.raises(ValueError):
+        decode_access_token(forged)
+
+
+def test_jwks_lets_other_services_verify_locally(key_dir) -> None:
+    token = create_access_token(sub="user-1", role="APPROVER")
+
+    r = client.get("/.well-known/jwks.json")
+    assert r.status_code == 200
+    assert r.headers["cache-control"] == "public, max-age=300"
+    jwk_set = r.json()
+    assert [k["kid"] for k in jwk_set["keys"]] == ["2026-09", "2026-10"]
+    assert all("d" not in k for k in jwk_set["keys"])
+
+    claims = jwt.decode(token, jwk_set, algorithms=["ES256"])
+    assert claims["role"] == "APPROVER"
+
+    again = client.get("/.well-known/jwks.json", headers={"If-None-Match": r.headers["etag"]})
+    assert again.status_code == 304
+    weak = client.get("/.well-known/jwks.json", headers={"If-None-Match": f"W/{r.headers['etag']}"})
+    assert weak.status_code == 304
+
+
+def test_jwks_is_empty_in_shared_secret_mode() -> None:
+    r = client.get("/.well-known/jwks.json")
+    assert r.status_code == 200
+    assert r.json() == {"keys": []}
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_choose_encoding_respects_q_values() -> None:
+    assert choose_encoding("") is None
+    assert choose_encoding("gzip") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("br;q=0, gzip;q=0.5") == "gzip"
+
+
+def test_large_list_is_gzipped_and_small_response_is_not(register, login) -> None:
+    register("payload@example.com")
+    headers = login("payload@example.com")
+    for i in range(20):
+        client.post(
+            "/requests",
+            headers=headers,
+            json={"resource": f"res-{i}", "action": "READ", "justification": "x" * 200},
+        )
+
+    r = client.get("/requests", headers={**headers, "Accept-Encoding": "gzip"})
+    assert r.status_code == 200, r.text
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert len(r.json()) == 20
+
+    raw = client.get(
+        "/requests", headers={**headers, "Accept-Encoding": "gzip"}, params={"limit": 1}
+    )
+    assert "content-encoding" not in raw.headers
+    assert "Accept-Encoding" in raw.headers["vary"]
+
+    # Clients that can't decode still get Vary, so a shared cache never mixes the two up.
+    plain = client.get("/requests", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["vary"]
+
+
+def test_compressed_body_gets_a_weak_etag() -> None:
+    etagged = FastAPI()
+
+    @etagged.get("/doc")
+    def doc() -> Response:
+        return Response(content=b'{"k": "' + b"v" * 2000 + b'"}', media_type="application/json", headers={"ETag": '"abc"'})
+
+    etagged.add_middleware(CompressionMiddleware, minimum_size=1024)
+    c = TestClient(etagged)
+    assert c.get("/doc", headers={"Accept-Encoding": "gzip"}).headers["etag"] == 'W/"abc"'
+    assert c.get("/doc", headers={"Accept-Encoding": "identity"}).headers["etag"] == '"abc"'
+
+
+def test_fields_narrows_list_output(register, login) -> None:
+    register("payload@example.com")
+    headers = login("payload@example.com")
+    client.post(
+        "/requests",
+        headers=headers,
+        json={"resource": "jira", "action": "READ", "justification": "long text"},
+    )
+    client.post("/requests", headers=headers, json={"resource": "aws", "action": "READ"})
+
+    r = client.get(
+        "/requests", headers=headers, params={"fields": "id,status,resource", "limit": 1}
+    )
+    assert r.status_code == 200, r.text
+    items = r.json()
+    assert len(items) == 1
+    assert set(items[0]) == {"id", "status", "resource"}
+    assert r.headers.get("X-Next-Cursor")
+
+    bad = client.get("/requests", headers=headers, params={"fields": "id,password"})
+    assert bad.status_code == 400
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.cli.__main__ import main
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.user import User
+from app.services import replay_service
+
+client = TestClient(app)
+
+POLICY = Path(__file__).resolve().parents[1] / "app" / "core" / "policy.py"
+
+# can_decide_request as first released, before the expired/claimed_by_other flags.
+FIRST_POLICY = """
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PolicyResult:
+    allowed: bool
+    status_code: int | None = None
+    detail: str | None = None
+
+
+def can_decide_request(*, actor_role, actor_id, requester_id, current_status):
+    if (actor_role or "").strip().upper() not in {"APPROVER", "ADMIN"}:
+        return PolicyResult(False, 403, "Forbidden")
+    if (current_status or "").strip().upper() != "PENDING":
+        return PolicyResult(False, 400, "Request not pending")
+    if actor_id == requester_id:
+        return PolicyResult(False, 403, "Self-approval is not allowed")
+    return PolicyResult(True)
+"""
+
+
+@pytest.fixture()
+def candidate(tmp_path) -> str:
+    # The change under review: admins may no longer decide requests.
+    before = 'role not in {"APPROVER", "ADMIN"}:\n        return PolicyResult(False, 403, "Forbidden")\n\n    if (current_status'
+    after = 'role != "APPROVER":\n        return PolicyResult(False, 403, "Forbidden")\n\n    if (current_status'
+    source = POLICY.read_text()
+    assert before in source
+    source = source.replace(before, after, 1)
+    path = tmp_path / "policy_candidate.py"
+    path.write_text(source)
+    return str(path)
+
+
+@pytest.fixture()
+def history(register, login) -> None:
+    register("replay-req@example.com", "REQUESTER")
+    register("replay-app@example.com", "APPROVER")
+    register("replay-admin@example.com", "ADMIN")
+    req = login("replay-req@example.com")
+    approver = login("replay-app@example.com")
+    admin = login("replay-admin@example.com")
+
+    for i, (decider, verb) in enumerate([(approver, "approve"), (admin, "approve"), (admin, "reject"), (approver, "reject")]):
+        r = client.post("/requests", headers=req, json={"resource": f"replay-{i}", "action": "READ"})
+        assert r.status_code == 201, r.text
+        d = client.patch(f"/requests/{r.json()['id']}/{verb}", headers=decider)
+        assert d.status_code == 200, d.text
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_replay_diffs_history_from_the_database(history, candidate, workers) -> None:
+    deltas: list[dict] = []
+    with SessionLocal() as db:
+        report = replay_service.replay(
+            replay_service.db_batches(db, chunk_size=3),
+            baseline="app.core.policy",
+            candidate=candidate,
+            workers=workers,
+            on_delta=deltas.append,
+        )
+
+    assert report.rows == 4
+    assert report.changed == 2
+    assert report.transitions[("allow", "403 Forbidden")] == 2
+    assert sorted(d["decision"] for d in deltas) == ["APPROVED", "REJECTED"]
+
+
+def test_replay_against_a_policy_without_newer_flags(history, tmp_path) -> None:
+    first = tmp_path / "policy_first.py"
+    first.write_text(FIRST_POLICY)
+
+    with SessionLocal() as db:
+        report = replay_service.replay(
+            replay_service.db_batches(db, chunk_size=3), baseline=str(first), candidate="app.core.policy"
+        )
+
+    assert (report.rows, report.changed) == (4, 0)
+
+
+def test_replay_uses_the_role_held_at_decision_time(history, candidate) -> None:
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.email == "replay-admin@example.com").values(role="REQUESTER"))
+        db.commit()
+        report = replay_service.replay(
+            replay_service.db_batches(db, chunk_size=3), baseline="app.core.policy", candidate=candidate
+        )
+
+    # Both admin decisions are still judged as an admin's, which the candidate forbids.
+    assert report.transitions[("allow", "403 Forbidden")] == 2
+
+
+def test_replay_cli_reads_ndjson(candidate, tmp_path, capsys) -> None:
+    source = tmp_path / "decisions.jsonl"
+    rows = [
+        {"request_id": "r1", "actor_id": "a", "actor_role": "ADMIN", "requester_id": "u", "action": "access_request.approved"},
+        {"request_id": "r2", "actor_id": "b", "actor_role": "APPROVER", "requester_id": "u", "action": "access_request.approved"},
+        {
+            "request_id": "r3",
+            "actor_id": "b",
+            "actor_role": "APPROVER",
+            "requester_id": "u",
+            "action": "access_request.rejected",
+            "decided_at": "2026-01-02T00:00:00+00:00",
+            "expires_at": "2026-01-01T00:00:00+00:00",
+        },
+    ]
+    source.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    deltas = tmp_path / "deltas.jsonl"
+
+    code = main(
+        ["policy", "replay", "--candidate", candidate, "--source", str(source), "--workers", "1", "--deltas", str(deltas)]
+    )
+
+    assert code == 0
+    assert "3 decisions" in capsys.readouterr().out
+    assert [json.loads(line) for line in deltas.read_text().splitlines()] == [
+        {"request_id": "r1", "decision": "APPROVED", "baseline": "allow", "candidate": "403 Forbidden"}
+    ]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import column, insert, table, text
+
+from app.core import profiling
+from app.db import session as db_session
+from app.db.session import engine
+from app.main import app
+
+client = TestClient(app)
+profiled = TestClient(profiling.ProfilingMiddleware(app, token="let-me-see"))
+
+
+@pytest.fixture()
+def instrumented():
+    profiling.instrument(engine, slow_ms=0)
+    yield
+    profiling.uninstrument(engine)
+
+
+@pytest.fixture()
+def logged(monkeypatch, caplog):
+    # Alembic's fileConfig (test_migrations) disables loggers that already exist.
+    monkeypatch.setattr(profiling.log, "disabled", False)
+    return caplog
+
+
+def _timings(header: str) -> dict[str, str]:
+    parts = [p.strip().split(";") for p in header.split(",")]
+    return {p[0]: p[1].removeprefix("dur=") for p in parts}
+
+
+def test_privileged_header_returns_a_breakdown(instrumented) -> None:
+    r = profiled.post(
+        "/auth/register",
+        json={"email": "prof@example.com", "password": "StrongPass123", "role": "REQUESTER"},
+    )
+    assert r.status_code == 201
+    assert "server-timing" not in r.headers
+
+    r = profiled.post(
+        "/auth/login",
+        json={"email": "prof@example.com", "password": "StrongPass123"},
+        headers={"X-Profile": "let-me-see"},
+    )
+    assert r.status_code == 200
+    timings = _timings(r.headers["server-timing"])
+    assert {"sql", "bcrypt", "jwt", "other", "total"} <= set(timings)
+    assert float(timings["bcrypt"]) > 0
+    assert float(timings["total"]) >= float(timings["bcrypt"])
+
+    wrong = profiled.get("/health", headers={"X-Profile": "guess"})
+    assert "server-timing" not in wrong.headers
+
+
+def test_sampled_requests_are_logged(instrumented, logged) -> None:
+    sampled = TestClient(profiling.ProfilingMiddleware(app, sample_rate=1.0))
+    with logged.at_level(logging.INFO, logger="app.core.profiling"):
+        r = sampled.get("/health")
+    assert "server-timing" not in r.headers
+    assert any("profile sample GET /health" in rec.getMessage() for rec in logged.records)
+
+
+def test_slow_queries_are_logged_with_parameters(logged) -> None:
+    profiling.instrument(engine, slow_ms=0.000001)
+    try:
+        with logged.at_level(logging.WARNING, logger="app.core.profiling"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT :marker"), {"marker": "needle-42"})
+    finally:
+        profiling.uninstrument(engine)
+    assert any("slow query" in rec.getMessage() and "needle-42" in rec.getMessage() for rec in logged.records)
+
+
+def test_sqlite_writes_are_instrumented_on_the_writer_engine(tmp_path, monkeypatch, logged) -> None:
+    monkeypatch.setenv("SLOW_QUERY_MS", "0.000001")
+    built = db_session._build(f"sqlite:///{tmp_path / 'edge.db'}")
+    writer = db_session._writers.pop(built)
+    try:
+        assert profiling.is_instrumented(built) and profiling.is_instrumented(writer.engine)
+        with built.begin() as conn:
+            conn.execute(text("CREATE TABLE marks (v TEXT)"))
+        db_session._writers[built] = writer
+        with logged.at_level(logging.WARNING, logger="app.core.profiling"):
+            with db_session.TenantSession(bind=built) as db:
+                db.execute(insert(table("marks", column("v"))).values(v="needle-43"))
+                db.commit()
+    finally:
+        db_session._writers.pop(built, None)
+        profiling.uninstrument(built)
+        profiling.uninstrument(writer.engine)
+        writer.dispose()
+        built.dispose()
+    writes = [rec.getMessage() for rec in logged.records if "INSERT INTO marks" in rec.getMessage()]
+    assert writes and "needle-43" in writes[0]
+
+
+def test_disabled_profiling_installs_nothing() -> None:
+    assert not profiling.profiling_enabled()
+    assert not profiling.is_instrumented(engine)
+    assert profiling.span("jwt") is profiling.span("bcrypt")
+    assert not any(m.cls is profiling.ProfilingMiddleware for m in app.user_middleware)
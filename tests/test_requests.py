@@ -1,46 +1,24 @@
 from __future__ import annotations
 
 from fastapi.testclient import TestClient
-from sqlalchemy import text
 
-from app.db.session import engine
 from app.main import app
 
 client = TestClient(app)
 
 
-def _wipe_tables() -> None:
-    # Delete child rows first to avoid FK violations, even if cascade changes later.
-    with engine.begin() as conn:
-        conn.execute(text("DELETE FROM access_requests"))
-        conn.execute(text("DELETE FROM users"))
-
-
-def _register(email: str, password: str, role: str) -> None:
-    r = client.post("/auth/register", json={"email": email, "password": password, "role": role})
-    assert r.status_code in (201, 409), r.text
-
-
-def _login(email: str, password: str) -> str:
-    r = client.post("/auth/login", json={"email": email, "password": password})
-    assert r.status_code == 200, r.text
-    return r.json()["access_token"]
-
-
-def test_requester_can_create_and_list_own_requests() -> None:
-    _wipe_tables()
-
-    _register("req1@example.com", "StrongPass123", "REQUESTER")
-    token = _login("req1@example.com", "StrongPass123")
+def test_requester_can_create_and_list_own_requests(register, login) -> None:
+    register("req1@example.com", "REQUESTER")
+    headers = login("req1@example.com")
 
     r = client.post(
         "/requests",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=headers,
         json={"resource": "jira", "action": "READ", "justification": "Ticket triage"},
     )
     assert r.status_code == 201, r.text
 
-    r2 = client.get("/requests", headers={"Authorization": f"Bearer {token}"})
+    r2 = client.get("/requests", headers=headers)
     assert r2.status_code == 200, r2.text
     items = r2.json()
     assert len(items) == 1
@@ -48,15 +26,13 @@ def test_requester_can_create_and_list_own_requests() -> None:
     assert items[0]["status"] == "PENDING"
 
 
-def test_requester_cannot_approve() -> None:
-    _wipe_tables()
-
-    _register("req2@example.com", "StrongPass123", "REQUESTER")
-    token = _login("req2@example.com", "StrongPass123")
+def test_requester_cannot_approve(register, login) -> None:
+    register("req2@example.com", "REQUESTER")
+    headers = login("req2@example.com")
 
     r = client.post(
         "/requests",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=headers,
         json={"resource": "confluence", "action": "WRITE"},
     )
     assert r.status_code == 201, r.text
@@ -64,23 +40,21 @@ def test_requester_cannot_approve() -> None:
 
     r2 = client.patch(
         f"/requests/{req_id}/approve",
-        headers={"Authorization": f"Bearer {token}"},
+        headers=headers,
     )
     assert r2.status_code == 403, r2.text
 
 
-def test_approver_can_approve_and_list_all() -> None:
-    _wipe_tables()
-
-    _register("req3@example.com", "StrongPass123", "REQUESTER")
-    _register("app1@example.com", "StrongPass123", "APPROVER")
+def test_approver_can_approve_and_list_all(register, login) -> None:
+    register("req3@example.com", "REQUESTER")
+    register("app1@example.com", "APPROVER")
 
-    req_token = _login("req3@example.com", "StrongPass123")
-    appr_token = _login("app1@example.com", "StrongPass123")
+    req_headers = login("req3@example.com")
+    appr_headers = login("app1@example.com")
 
     r = client.post(
         "/requests",
-        headers={"Authorization": f"Bearer {req_token}"},
+        headers=req_headers,
         json={"resource": "aws", "action": "ADMIN"},
     )
     assert r.status_code == 201, r.text
@@ -88,12 +62,37 @@ def test_approver_can_approve_and_list_all() -> None:
 
     r2 = client.patch(
         f"/requests/{req_id}/approve",
-        headers={"Authorization": f"Bearer {appr_token}"},
+        headers=appr_headers,
     )
     assert r2.status_code == 200, r2.text
     assert r2.json()["status"] == "APPROVED"
 
-    r3 = client.get("/requests", headers={"Authorization": f"Bearer {appr_token}"})
+    r3 = client.get("/requests", headers=appr_headers)
     assert r3.status_code == 200, r3.text
     assert any(x["id"] == req_id for x in r3.json())
 
+
+
+def test_resubmitting_pending_request_returns_existing(register, login) -> None:
+    register("dup1@example.com", "REQUESTER")
+    register("dup-appr@example.com", "APPROVER")
+    headers = login("dup1@example.com")
+    appr_headers = login("dup-appr@example.com")
+
+    r = client.post("/requests", headers=headers, json={"resource": "vault", "action": "READ"})
+    assert r.status_code == 201, r.text
+    first = r.json()
+
+    r = client.post("/requests", headers=headers, json={"resource": "vault", "action": "READ", "justification": "Rotation"})
+    assert r.status_code == 200, r.text
+    assert r.json()["id"] == first["id"]
+    assert r.json()["justification"] == "Rotation"  # filled in, since the first had none
+
+    r = client.get("/requests/pending", headers=appr_headers)
+    assert [x["id"] for x in r.json()] == [first["id"]]
+
+    # Once decided, the same request can be made again.
+    client.patch(f"/requests/{first['id']}/reject", headers=appr_headers)
+    r = client.post("/requests", headers=headers, json={"resource": "vault", "action": "READ"})
+    assert r.status_code == 201, r.text
+    assert r.json()["id"] != first["id"]
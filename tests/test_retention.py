@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.clock import utcnow
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services import expiry_service, retention_service
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def decided_requests(register, login):
+    def _decided(n: int) -> tuple[list[str], dict[str, str]]:
+        register("ret-req@example.com", "REQUESTER")
+        register("ret-app@example.com", "APPROVER")
+        register("ret-admin@example.com", "ADMIN")
+        req_headers = login("ret-req@example.com")
+        app_headers = login("ret-app@example.com")
+
+        ids = []
+        for i in range(n):
+            r = client.post("/requests", headers=req_headers, json={"resource": f"res-{i}", "action": "READ"})
+            ids.append(r.json()["id"])
+            a = client.patch(f"/requests/{ids[-1]}/approve", headers=app_headers)
+            assert a.status_code == 200, a.text
+
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE access_requests SET decided_at = :old"), {"old": utcnow() - timedelta(days=400)})
+        return ids, login("ret-admin@example.com")
+
+    return _decided
+
+
+def test_archived_request_still_reachable_for_compliance(decided_requests) -> None:
+    ids, admin_headers = decided_requests(1)
+
+    with SessionLocal() as db:
+        res = retention_service.run_job(
+            db, retention_service.REQUESTS_JOB, cutoff=utcnow() - timedelta(days=365), batch_size=100
+        )
+    assert res.rows_moved == 1 and res.done
+
+    listed = client.get("/requests", headers=admin_headers)
+    assert listed.json() == []
+
+    r = client.get(f"/archive/requests/{ids[0]}", headers=admin_headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["archived"] is True
+    assert body["request"]["status"] == "APPROVED"
+    assert [e["action"] for e in body["audit_events"]] == ["access_request.approved"]
+    assert body["audit_events"][0]["details"]["resource"] == "res-0"
+
+
+def test_batches_resume_from_checkpoint(decided_requests) -> None:
+    decided_requests(3)
+    cutoff = utcnow() - timedelta(days=365)
+
+    with SessionLocal() as db:
+        first = retention_service.run_job(
+            db, retention_service.REQUESTS_JOB, cutoff=cutoff, batch_size=1, max_batches=2
+        )
+        assert (first.rows_moved, first.done) == (2, False)
+
+        rest = retention_service.run_job(db, retention_service.REQUESTS_JOB, cutoff=cutoff, batch_size=1)
+        assert rest.rows_moved == 1 and rest.done
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM access_requests")).scalar() == 0
+        assert conn.execute(text("SELECT COUNT(*) FROM access_requests_archive")).scalar() == 3
+        moved = conn.execute(text("SELECT rows_moved FROM retention_checkpoints WHERE job = 'access_requests'"))
+        assert moved.scalar() == 3
+
+
+def test_time_bound_grant_is_archived_once_it_expires_behind_the_checkpoint(decided_requests) -> None:
+    (bound, permanent), _ = decided_requests(2)
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE access_requests SET decided_at = :older, expires_at = :soon WHERE id = :id"),
+            {"older": utcnow() - timedelta(days=401), "soon": utcnow() + timedelta(days=1), "id": bound.replace("-", "")},
+        )
+    cutoff = utcnow() - timedelta(days=365)
+
+    with SessionLocal() as db:
+        first = retention_service.run_job(db, retention_service.REQUESTS_JOB, cutoff=cutoff, batch_size=100)
+        assert first.rows_moved == 1
+        assert expiry_service.expire_batch(db, now=utcnow() + timedelta(days=2)) == 1
+        second = retention_service.run_job(db, retention_service.REQUESTS_JOB, cutoff=cutoff, batch_size=100)
+        assert second.rows_moved == 1
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM access_requests")).scalar() == 0
+        statuses = conn.execute(text("SELECT status FROM access_requests_archive ORDER BY status")).scalars().all()
+    assert statuses == ["APPROVED", "EXPIRED"]
+
+
+def test_archive_lookup_requires_admin(decided_requests, login) -> None:
+    ids, _ = decided_requests(1)
+    r = client.get(f"/archive/requests/{ids[0]}", headers=login("ret-app@example.com"))
+    assert r.status_code == 403
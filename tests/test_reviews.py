@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.cli.__main__ import main
+from app.core.clock import utcnow
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services import grants_service, retention_service
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def setup(register, login):
+    def _setup(grants: int) -> tuple[dict, dict, dict, list[str]]:
+        """Admin, approver and requester headers, plus `grants` approved request ids (two of them the approver's own)."""
+        register("rv-admin@example.com", "ADMIN")
+        register("rv-app@example.com", "APPROVER")
+        register("rv-req@example.com", "REQUESTER")
+        admin = login("rv-admin@example.com")
+        approver = login("rv-app@example.com")
+        requester = login("rv-req@example.com")
+
+        approved = []
+        for i in range(grants):
+            owner = approver if i < 2 else requester
+            r = client.post("/requests", headers=owner, json={"resource": f"rv-db-{i}", "action": "READ"})
+            assert r.status_code == 201, r.text
+            assert client.patch(f"/requests/{r.json()['id']}/approve", headers=admin).status_code == 200
+            approved.append(r.json()["id"])
+        return admin, approver, requester, approved
+
+    return _setup
+
+
+def _campaign(admin: dict, chunk_size: int) -> int:
+    r = client.post("/reviews/campaigns", headers=admin, json={"name": "2026-Q4"})
+    assert r.status_code == 201, r.text
+    assert r.json()["status"] == "GENERATING"
+    campaign_id = r.json()["id"]
+    assert main(["reviews", "generate", "--campaign", str(campaign_id), "--chunk-size", str(chunk_size)]) == 0
+    return campaign_id
+
+
+def test_generation_copies_every_grant_in_chunks(setup, capsys) -> None:
+    admin, approver, _, approved = setup(7)
+    campaign_id = _campaign(admin, chunk_size=3)
+    assert f"review campaign {campaign_id}: added 7 items" in capsys.readouterr().out
+
+    r = client.get(f"/reviews/campaigns/{campaign_id}", headers=approver)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["status"], body["item_count"], body["pending_count"]) == ("OPEN", 7, 7)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        r = client.get(f"/reviews/campaigns/{campaign_id}/items", headers=approver, params=params)
+        assert r.status_code == 200, r.text
+        seen += [item["request_id"] for item in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(approved)
+
+    # Generating again is a no-op once the campaign is open.
+    assert main(["reviews", "generate", "--campaign", str(campaign_id)]) == 0
+    assert client.get(f"/reviews/campaigns/{campaign_id}", headers=approver).json()["item_count"] == 7
+
+
+def test_bulk_decisions_follow_the_request_policy(setup) -> None:
+    admin, approver, requester, approved = setup(5)
+    own, others = approved[:2], approved[2:]
+    r = client.post("/reviews/campaigns", headers=admin, json={"name": "not yet"})
+    pending_id = r.json()["id"]
+    decision = {"request_ids": others, "decision": "CERTIFY"}
+    assert client.post(f"/reviews/campaigns/{pending_id}/decisions", headers=approver, json=decision).status_code == 409
+    campaign_id = _campaign(admin, chunk_size=100)
+
+    r = client.post(f"/reviews/campaigns/{campaign_id}/decisions", headers=requester, json=decision)
+    assert r.json()["decided"] == []
+
+    r = client.post(
+        f"/reviews/campaigns/{campaign_id}/decisions",
+        headers=approver,
+        json={"request_ids": [*own, others[0]], "decision": "CERTIFY"},
+    )
+    assert r.status_code == 200, r.text
+    assert r.json()["decided"] == [others[0]]
+    assert {(x["request_id"], x["status_code"]) for x in r.json()["rejected"]} == {(own[0], 403), (own[1], 403)}
+
+    r = client.post(
+        f"/reviews/campaigns/{campaign_id}/decisions",
+        headers=approver,
+        json={"request_ids": others, "decision": "REVOKE"},
+    )
+    assert r.json()["decided"] == others[1:]
+    assert r.json()["rejected"] == [{"request_id": others[0], "status_code": 400, "detail": "Request not pending"}]
+
+    body = client.get(f"/reviews/campaigns/{campaign_id}", headers=approver).json()
+    assert (body["certified_count"], body["revoked_count"], body["pending_count"]) == (1, 2, 2)
+    pending = client.get(f"/reviews/campaigns/{campaign_id}/items", headers=approver, params={"pending": "true"})
+    assert sorted(item["request_id"] for item in pending.json()) == sorted(own)
+
+    # REVOKE ends the grant like a manual revocation.
+    statuses = {r["id"]: r["status"] for r in client.get("/requests", headers=requester).json()}
+    assert [statuses[i] for i in others] == ["APPROVED", "REVOKED", "REVOKED"]
+    assert client.get("/grants", headers=admin, params={"resource": "rv-db-3"}).json() == []
+    assert len(client.get("/grants", headers=admin, params={"resource": "rv-db-2"}).json()) == 1
+
+    assert client.post(f"/reviews/campaigns/{campaign_id}/close", headers=admin).json()["status"] == "CLOSED"
+    r = client.post(
+        f"/reviews/campaigns/{campaign_id}/decisions",
+        headers=admin,
+        json={"request_ids": own, "decision": "CERTIFY"},
+    )
+    assert {x["detail"] for x in r.json()["rejected"]} == {"Request expired"}
+
+
+def test_revoking_an_archived_grant_is_audited_and_sticks(setup) -> None:
+    admin, approver, _, approved = setup(3)
+    archived = approved[2]
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE access_requests SET decided_at = :old WHERE id = :id"),
+            {"old": utcnow() - timedelta(days=400), "id": archived.replace("-", "")},
+        )
+    with SessionLocal() as db:
+        moved = retention_service.run_job(
+            db, retention_service.REQUESTS_JOB, cutoff=utcnow() - timedelta(days=365), batch_size=100
+        )
+    assert moved.rows_moved == 1
+    campaign_id = _campaign(admin, chunk_size=100)
+
+    r = client.post(
+        f"/reviews/campaigns/{campaign_id}/decisions",
+        headers=approver,
+        json={"request_ids": [archived], "decision": "REVOKE"},
+    )
+    assert r.json()["decided"] == [archived], r.text
+
+    assert client.get("/grants", headers=admin, params={"resource": "rv-db-2"}).json() == []
+    with engine.connect() as conn:
+        revoked = conn.execute(
+            text("SELECT entity_id FROM audit_events WHERE action = 'access_request.revoked'")
+        ).scalars().all()
+        status = conn.execute(text("SELECT status FROM access_requests_archive")).scalar()
+    assert [uuid.UUID(str(e)) for e in revoked] == [uuid.UUID(archived)]
+    assert status == "REVOKED"
+    with SessionLocal() as db:
+        assert grants_service.rebuild(db, dry_run=True).missing == 0
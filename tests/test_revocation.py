@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.core.jwt import decode_access_token
+from app.core.revocation import BloomFilter, Revocation, RevocationIndex
+from app.db.session import SessionLocal
+from app.main import app
+from app.services import revocation_service
+
+client = TestClient(app)
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000)
+    items = [f"jti-{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 100
+
+
+def test_index_covers_single_tokens_and_whole_subjects() -> None:
+    idx = RevocationIndex(capacity=100)
+    idx.apply([Revocation(version=1, jti="abc", subject_id=None, revoked_at=0)])
+    idx.apply([Revocation(version=2, jti=None, subject_id="u1", revoked_at=1000)])
+
+    assert idx.is_revoked({"jti": "abc", "sub": "u2", "iat": 5000})
+    assert idx.is_revoked({"jti": "zzz", "sub": "u1", "iat": 999})
+    assert not idx.is_revoked({"jti": "zzz", "sub": "u1", "iat": 1001})
+    assert idx.version == 2
+
+
+def test_logout_revokes_only_that_token(register, login) -> None:
+    register("rev1@example.com", "REQUESTER")
+    t1 = login("rev1@example.com")
+    t2 = login("rev1@example.com")
+
+    r = client.post("/auth/revoke", headers=t1)
+    assert r.status_code == 204, r.text
+
+    assert client.get("/requests", headers=t1).status_code == 401
+    assert client.get("/requests", headers=t2).status_code == 200
+
+
+def test_admin_revokes_all_tokens_of_a_user(register, login) -> None:
+    user_id = register("rev2@example.com", "APPROVER")
+    register("rev-admin@example.com", "ADMIN")
+    victim = login("rev2@example.com")
+    admin = login("rev-admin@example.com")
+
+    r = client.post(f"/auth/users/{user_id}/revoke", headers=admin)
+    assert r.status_code == 204, r.text
+
+    r2 = client.get("/requests/pending", headers=victim)
+    assert r2.status_code == 401
+    assert r2.json()["detail"] == "Token revoked"
+
+    denied = client.post(f"/auth/users/{user_id}/revoke", headers=victim)
+    assert denied.status_code == 401
+
+
+def test_sync_picks_up_rows_written_elsewhere(register, login) -> None:
+    register("rev3@example.com", "REQUESTER")
+    headers = login("rev3@example.com")
+
+    # Simulate another worker: the row lands in the table but not in this index.
+    claims = decode_access_token(headers["Authorization"].removeprefix("Bearer "))
+    with SessionLocal() as db:
+        revocation_service.revoke_token(
+            db,
+            jti=claims["jti"],
+            subject_id=None,
+            expires_at=datetime.fromtimestamp(claims["exp"], tz=timezone.utc),
+        )
+        db.commit()
+        assert client.get("/requests", headers=headers).status_code == 200
+
+        assert revocation_service.sync(db) >= 1
+    assert client.get("/requests", headers=headers).status_code == 401
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.clock import utcnow
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.routing import RequestAssignment
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def users(register, login) -> tuple[dict, dict, dict, dict]:
+    """Requester, two members of the payments group and one outsider."""
+    register("rt-admin@example.com", "ADMIN")
+    register("rt-req@example.com", "REQUESTER")
+    alice = register("rt-alice@example.com", "APPROVER")
+    bob = register("rt-bob@example.com", "APPROVER")
+    register("rt-carol@example.com", "APPROVER")
+    admin = login("rt-admin@example.com")
+
+    r = client.post("/routing/groups", headers=admin, json={"name": "payments"})
+    assert r.status_code == 201, r.text
+    group_id = r.json()["id"]
+    for user_id in (alice, bob):
+        assert client.put(f"/routing/groups/{group_id}/members/{user_id}", headers=admin).status_code == 204
+    r = client.post("/routing/rules", headers=admin, json={"resource_prefix": "payments-", "group_id": group_id})
+    assert r.status_code == 201, r.text
+    assert client.post("/routing/rules", headers=admin, json={"resource_prefix": "payments-", "group_id": group_id}).status_code == 409
+
+    return (
+        login("rt-req@example.com"),
+        login("rt-alice@example.com"),
+        login("rt-bob@example.com"),
+        login("rt-carol@example.com"),
+    )
+
+
+def _create(headers: dict, resource: str) -> str:
+    r = client.post("/requests", headers=headers, json={"resource": resource, "action": "READ"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def test_requests_are_routed_to_owning_group_queue(users) -> None:
+    requester, alice, _, carol = users
+    first = _create(requester, "payments-db")
+    second = _create(requester, "payments-api")
+    _create(requester, "wiki")
+
+    r = client.get("/requests/queue", headers=alice)
+    assert r.status_code == 200, r.text
+    assert {x["id"] for x in r.json()} == {first, second}
+
+    # SQLite timestamps have one-second resolution, so only the paging is checked, not the order.
+    r = client.get("/requests/queue", params={"limit": 1}, headers=alice)
+    page = [x["id"] for x in r.json()]
+    r = client.get("/requests/queue", params={"cursor": r.headers["X-Next-Cursor"]}, headers=alice)
+    assert "X-Next-Cursor" not in r.headers
+    assert sorted(page + [x["id"] for x in r.json()]) == sorted([first, second])
+
+    assert client.get("/requests/queue", headers=carol).json() == []
+    assert client.get("/requests/queue", headers=requester).status_code == 403
+
+    assert client.patch(f"/requests/{first}/approve", headers=alice).status_code == 200
+    assert [x["id"] for x in client.get("/requests/queue", headers=alice).json()] == [second]
+
+
+def test_claims_are_exclusive_until_the_lease_runs_out(users) -> None:
+    requester, alice, bob, _ = users
+    rid = _create(requester, "payments-db")
+
+    r = client.post("/requests/queue/claim", headers=alice)
+    assert [x["id"] for x in r.json()] == [rid]
+    assert client.post("/requests/queue/claim", headers=bob).json() == []
+    assert client.get("/requests/queue", headers=bob).json() == []
+
+    r = client.patch(f"/requests/{rid}/approve", headers=bob)
+    assert r.status_code == 409, r.text
+
+    with SessionLocal() as db:
+        db.execute(update(RequestAssignment).values(lease_expires_at=utcnow() - timedelta(seconds=1)))
+        db.commit()
+
+    assert [x["id"] for x in client.post("/requests/queue/claim", headers=bob).json()] == [rid]
+    assert client.patch(f"/requests/{rid}/approve", headers=alice).status_code == 409
+    assert client.delete(f"/requests/{rid}/claim", headers=bob).status_code == 204
+    assert client.patch(f"/requests/{rid}/approve", headers=alice).status_code == 200
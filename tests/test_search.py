@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def seeded(register, login) -> tuple[dict[str, str], dict[str, str]]:
+    register("search-req@example.com", "REQUESTER")
+    register("search-app@example.com", "APPROVER")
+    req_headers = login("search-req@example.com")
+    app_headers = login("search-app@example.com")
+
+    for resource, action, justification in [
+        ("jira-prod", "READ", "Ticket triage for the payments team"),
+        ("jira-staging", "WRITE", None),
+        ("aws-billing", "ADMIN", "Quarterly payments reconciliation"),
+        ("confluence", "READ", "Onboarding docs"),
+    ]:
+        r = client.post(
+            "/requests",
+            headers=req_headers,
+            json={"resource": resource, "action": action, "justification": justification},
+        )
+        assert r.status_code == 201, r.text
+    return req_headers, app_headers
+
+
+def test_search_matches_justification_and_status(seeded) -> None:
+    _, headers = seeded
+
+    r = client.get("/requests", headers=headers, params={"q": "payment"})
+    assert r.status_code == 200, r.text
+    assert {x["resource"] for x in r.json()} == {"jira-prod", "aws-billing"}
+
+    r2 = client.get("/requests", headers=headers, params={"q": "payment", "status": "APPROVED"})
+    assert r2.status_code == 200, r2.text
+    assert r2.json() == []
+
+
+def test_resource_prefix_filter(seeded) -> None:
+    req_headers, _ = seeded
+
+    r = client.get("/requests", headers=req_headers, params={"resource_prefix": "jira"})
+    assert r.status_code == 200, r.text
+    assert {x["resource"] for x in r.json()} == {"jira-prod", "jira-staging"}
+
+
+def test_keyset_pagination_walks_all_rows_once(seeded) -> None:
+    _, headers = seeded
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/requests", headers=headers, params=params)
+        assert r.status_code == 200, r.text
+        seen.extend(x["id"] for x in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 4
+    assert len(set(seen)) == 4
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import runpy
+from pathlib import Path
+
+from app.db import session
+
+CONF = str(Path(__file__).resolve().parents[1] / "gunicorn.conf.py")
+
+
+def test_gunicorn_conf_reads_env(monkeypatch) -> None:
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("MAX_REQUESTS", "500")
+
+    conf = runpy.run_path(CONF)
+
+    assert conf["workers"] == 3
+    assert conf["preload_app"] is True
+    assert conf["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert conf["max_requests"] == 500
+    assert 0 < conf["max_requests_jitter"] <= 500
+
+
+def test_post_fork_drops_inherited_pool(monkeypatch) -> None:
+    calls = []
+    engine = session.get_engine()
+    monkeypatch.setattr(engine, "dispose", lambda close=True: calls.append(close))
+
+    conf = runpy.run_path(CONF)
+    conf["post_fork"](server=None, worker=None)
+
+    assert calls == [False]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.cli.__main__ import main
+from app.db.base import Base
+from app.db.session import engine
+from app.main import app
+from app.services import snapshot_service
+
+client = TestClient(app)
+
+
+@pytest.fixture()
+def populated(register, login) -> None:
+    register("snap-req@example.com", "REQUESTER")
+    register("snap-app@example.com", "APPROVER")
+    requester = login("snap-req@example.com")
+    approver = login("snap-app@example.com")
+    for i in range(12):
+        r = client.post(
+            "/requests",
+            headers=requester,
+            json={"resource": f"snap-db-{i}", "action": "READ", "justification": 'line one\nline "two"'},
+        )
+        assert r.status_code == 201, r.text
+        if i % 2:
+            assert client.patch(f"/requests/{r.json()['id']}/approve", headers=approver).status_code == 200
+
+
+@pytest.fixture()
+def target(tmp_path):
+    other = create_engine(f"sqlite:///{tmp_path / 'restore.db'}")
+    Base.metadata.create_all(bind=other)
+    yield other
+    other.dispose()
+
+
+def _index_names(conn) -> set[str]:
+    return set(conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars())
+
+
+def test_dump_writes_chunks_and_manifest(populated, tmp_path, capsys) -> None:
+    path = str(tmp_path / "snap.zip")
+    assert main(["snapshot", "dump", path, "--chunk-mb", "0"]) == 0
+
+    manifest = snapshot_service.read_manifest(path)
+    by_name = {entry["name"]: entry for entry in manifest["tables"]}
+    assert manifest["encoding"] == "jsonl"
+    assert by_name["access_requests"]["rows"] == 12
+    # With a zero chunk size every row starts a new chunk.
+    assert len(by_name["access_requests"]["chunks"]) == 12
+    with zipfile.ZipFile(path) as zf:
+        assert set(zf.namelist()) == {snapshot_service.MANIFEST} | {c for e in manifest["tables"] for c in e["chunks"]}
+    assert "access_requests: 12 rows in 12 chunks" in capsys.readouterr().out
+
+
+def test_load_restores_rows_indexes_and_checksums(populated, tmp_path, target) -> None:
+    path = str(tmp_path / "snap.zip")
+    manifest = snapshot_service.dump(engine, path, chunk_bytes=512)
+    with target.connect() as conn:
+        indexes = _index_names(conn)
+
+    report = snapshot_service.load(target, path, workers=4)
+    assert report.ok, report.problems
+    assert report.rows == sum(entry["rows"] for entry in manifest["tables"])
+
+    with target.connect() as conn:
+        assert _index_names(conn) == indexes
+        assert conn.exec_driver_sql("SELECT count(*) FROM access_requests").scalar() == 12
+        assert conn.exec_driver_sql("SELECT count(*) FROM grants").scalar() == 6
+
+    with target.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE access_requests SET justification = 'edited' WHERE rowid = (SELECT min(rowid) FROM access_requests)"
+        )
+    assert snapshot_service.verify(target, manifest) == ["access_requests: checksum does not match the snapshot"]
+
+
+def test_load_refuses_a_non_empty_target_unless_truncating(populated, tmp_path, target) -> None:
+    path = str(tmp_path / "snap.zip")
+    snapshot_service.dump(engine, path)
+    assert snapshot_service.load(target, path).ok
+
+    with pytest.raises(snapshot_service.SnapshotError, match="not empty"):
+        snapshot_service.load(target, path)
+    report = snapshot_service.load(target, path, truncate=True)
+    assert report.ok, report.problems
+
+
+def test_cli_covers_routed_databases(populated, register, tmp_path, monkeypatch, capsys) -> None:
+    url = f"sqlite:///{tmp_path / 'big.db'}"
+    own = create_engine(url)
+    Base.metadata.create_all(bind=own)
+    monkeypatch.setenv("TENANT_DATABASES", f'{{"big": "{url}"}}')
+    register("snap-big@example.com", tenant="big")
+
+    path = str(tmp_path / "snap.zip")
+    assert main(["snapshot", "dump", path]) == 0
+    routed = snapshot_service.read_manifest(str(tmp_path / "snap.big.zip"))
+    assert {e["name"]: e["rows"] for e in routed["tables"]}["users"] == 1
+    assert main(["snapshot", "verify", path]) == 0
+    out = capsys.readouterr().out
+    assert "[shared] wrote" in out and "[big] wrote" in out
+    assert [line.split()[0] for line in out.splitlines() if line.endswith("tables: OK")] == ["[shared]", "[big]"]
+
+    with own.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM users")
+    assert main(["snapshot", "verify", path]) == 1
+    own.dispose()
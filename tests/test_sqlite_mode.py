@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from app.db import session as db_session
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.user import User
+
+client = TestClient(app)
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="SQLite deployment mode")
+
+
+def test_connections_use_wal_and_enforce_foreign_keys() -> None:
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+
+
+def test_concurrent_writes_share_commits_and_never_hit_a_locked_database(register, login) -> None:
+    writer = db_session._writers.get(engine)
+    if writer is None:
+        pytest.skip("single writer is off for in-memory databases or SQLITE_SINGLE_WRITER=0")
+    register("sq-req@example.com", "REQUESTER")
+    headers = login("sq-req@example.com")
+
+    errors: list[str] = []
+    groups_before = writer._group
+
+    def submit(worker: int) -> None:
+        for i in range(10):
+            r = client.post("/requests", headers=headers, json={"resource": f"sq-db-{worker}-{i}", "action": "READ"})
+            if r.status_code != 201:
+                errors.append(r.text)
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(client.get("/requests", headers=headers, params={"limit": 100}).json()) == 80
+    # Queued sessions ride on the current transaction: fewer commits than requests.
+    assert writer._group - groups_before < 80
+
+
+def test_a_rolled_back_session_keeps_the_writer_usable(register) -> None:
+    register("sq-keep@example.com", "REQUESTER")
+    promote = update(User).where(User.email == "sq-keep@example.com")
+
+    with SessionLocal() as db:
+        db.execute(promote.values(role="ADMIN"))
+        db.rollback()
+        db.execute(promote.values(role="APPROVER"))
+        db.commit()
+    with SessionLocal() as db:
+        db.execute(promote.values(role="ADMIN"))
+        # Closed without committing: only this session's savepoint is discarded.
+
+    with SessionLocal() as db:
+        assert db.scalar(select(User.role).where(User.email == "sq-keep@example.com")) == "APPROVER"
+
+
+def test_a_second_writer_on_the_same_thread_times_out(register, monkeypatch) -> None:
+    writer = db_session._writers.get(engine)
+    if writer is None:
+        pytest.skip("single writer is off for in-memory databases or SQLITE_SINGLE_WRITER=0")
+    monkeypatch.setattr(writer, "timeout", 0.2)
+    register("sq-nested@example.com", "REQUESTER")
+    promote = update(User).where(User.email == "sq-nested@example.com")
+
+    with SessionLocal() as outer:
+        outer.execute(promote.values(role="APPROVER"))
+        with SessionLocal() as inner:
+            with pytest.raises(OperationalError, match="timed out waiting for the writer"):
+                inner.execute(promote.values(role="ADMIN"))
+        outer.commit()
+
+    with SessionLocal() as db:
+        assert db.scalar(select(User.role).where(User.email == "sq-nested@example.com")) == "APPROVER"
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.main import app
+from app.services.stats_service import bucket_midpoint, latency_bucket
+
+client = TestClient(app)
+
+
+def test_latency_buckets_are_monotonic() -> None:
+    assert latency_bucket(0.2) == 0
+    assert latency_bucket(1) == 1
+    assert latency_bucket(3600) > latency_bucket(60) > latency_bucket(1)
+    for seconds in (1, 7, 60, 3600, 86400):
+        mid = bucket_midpoint(latency_bucket(seconds))
+        assert seconds / 2**0.5 <= mid <= seconds * 2**0.5
+
+
+def test_stats_follow_create_and_decisions(register, login, monkeypatch) -> None:
+    monkeypatch.setenv("STATS_MAX_AGE_SECONDS", "0")
+    register("stats-req@example.com", "REQUESTER")
+    register("stats-app@example.com", "APPROVER")
+    req_headers = login("stats-req@example.com")
+    app_headers = login("stats-app@example.com")
+
+    ids = []
+    for resource, action in (("jira", "READ"), ("jira", "WRITE"), ("aws", "READ")):
+        r = client.post(
+            "/requests",
+            headers=req_headers,
+            json={"resource": resource, "action": action},
+        )
+        ids.append(r.json()["id"])
+
+    client.patch(f"/requests/{ids[0]}/approve", headers=app_headers)
+    client.patch(f"/requests/{ids[2]}/reject", headers=app_headers)
+
+    r = client.get("/requests/stats", headers=app_headers)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["counts"] == {"PENDING": 1, "APPROVED": 1, "REJECTED": 1}
+    assert body["median_decision_seconds"] is not None
+
+    jira = next(x for x in body["resources"] if x["resource"] == "jira")
+    assert jira["counts"] == {"PENDING": 1, "APPROVED": 1}
+
+    only_aws = client.get(
+        "/requests/stats", headers=app_headers, params={"resource": "aws"}
+    ).json()
+    assert [x["resource"] for x in only_aws["resources"]] == ["aws"]
+
+
+def test_requester_cannot_read_stats(register, login) -> None:
+    register("stats-req2@example.com", "REQUESTER")
+    headers = login("stats-req2@example.com")
+
+    r = client.get("/requests/stats", headers=headers)
+    assert r.status_code == 403
+
+
+def test_concurrent_decisions_count_once(register, login, monkeypatch) -> None:
+    monkeypatch.setenv("STATS_MAX_AGE_SECONDS", "0")
+    register("race-req@example.com", "REQUESTER")
+    register("race-app@example.com", "APPROVER")
+    req_headers = login("race-req@example.com")
+    app_headers = login("race-app@example.com")
+    rid = client.post("/requests", headers=req_headers, json={"resource": "race-db", "action": "READ"}).json()["id"]
+
+    codes: list[int] = []
+    start = threading.Barrier(6)
+
+    def decide(verb: str) -> None:
+        start.wait()
+        codes.append(client.patch(f"/requests/{rid}/{verb}", headers=app_headers).status_code)
+
+    threads = [threading.Thread(target=decide, args=(v,)) for v in ("approve", "reject") * 3]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(codes) == [200, 400, 400, 400, 400, 400]
+    counts = client.get("/requests/stats", headers=app_headers).json()["counts"]
+    assert sorted(counts.values()) == [0, 1] and counts["PENDING"] == 0
+    with engine.connect() as conn:
+        decided = conn.execute(
+            text("SELECT COUNT(*) FROM audit_events WHERE action IN ('access_request.approved', 'access_request.rejected')")
+        ).scalar()
+    assert decided == 1
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine, func, select, text
+
+from app.cli.__main__ import main
+from app.core.clock import utcnow
+from app.db.base import Base
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.access_request import AccessRequest
+from app.models.audit import AuditEvent
+from app.models.review import ReviewItem
+
+client = TestClient(app)
+
+
+def _create(headers: dict, resource: str) -> str:
+    r = client.post("/requests", headers=headers, json={"resource": resource, "action": "READ"})
+    assert r.status_code == 201, r.text
+    return r.json()["id"]
+
+
+def test_same_email_registers_once_per_tenant(register, login) -> None:
+    register("tn-same@example.com", "ADMIN", tenant="acme")
+    register("tn-same@example.com", "REQUESTER", tenant="globex")
+    r = client.post(
+        "/auth/register",
+        headers=login("tn-same@example.com", tenant="acme"),
+        json={"tenant_id": "acme", "email": "tn-same@example.com", "password": "StrongPass123", "role": "REQUESTER"},
+    )
+    assert r.status_code == 400
+
+    token = login("tn-same@example.com", tenant="globex")["Authorization"].split()[1]
+    assert jwt.get_unverified_claims(token)["tenant_id"] == "globex"
+
+    r = client.post("/auth/login", json={"tenant_id": "initech", "email": "tn-same@example.com", "password": "StrongPass123"})
+    assert r.status_code == 401
+
+
+def test_only_a_tenant_admin_adds_users_to_an_existing_tenant(register, login) -> None:
+    register("tn-founder@example.com", "ADMIN", tenant="acme")
+    register("tn-other@example.com", "ADMIN", tenant="globex")
+    body = {"tenant_id": "acme", "email": "tn-intruder@example.com", "password": "StrongPass123", "role": "ADMIN"}
+
+    r = client.post("/auth/register", json=body)
+    assert r.status_code == 403, r.text
+    assert client.post("/auth/register", json=body, headers=login("tn-other@example.com", tenant="globex")).status_code == 403
+
+    r = client.post("/auth/register", json=body, headers=login("tn-founder@example.com", tenant="acme"))
+    assert r.status_code == 201, r.text
+    assert r.json()["tenant_id"] == "acme"
+
+
+def test_requests_and_stats_are_isolated_per_tenant(register, login) -> None:
+    for tenant in ("acme", "globex"):
+        register("tn-admin@example.com", "ADMIN", tenant=tenant)
+        admin = login("tn-admin@example.com", tenant=tenant)
+        register("tn-req@example.com", "REQUESTER", tenant=tenant, headers=admin)
+        register("tn-appr@example.com", "APPROVER", tenant=tenant, headers=admin)
+    acme_req, globex_req = login("tn-req@example.com", tenant="acme"), login("tn-req@example.com", tenant="globex")
+    acme_appr, globex_appr = login("tn-appr@example.com", tenant="acme"), login("tn-appr@example.com", tenant="globex")
+
+    acme_id = _create(acme_req, "tn-db")
+    _create(acme_req, "tn-api")
+    _create(globex_req, "tn-db")
+
+    assert {r["id"] for r in client.get("/requests", headers=acme_req).json()} >= {acme_id}
+    assert len(client.get("/requests", headers=acme_req).json()) == 2
+    assert len(client.get("/requests", headers=globex_req).json()) == 1
+    assert len(client.get("/requests/pending", headers=globex_appr).json()) == 1
+
+    # Another tenant's request does not exist as far as the caller can tell.
+    assert client.patch(f"/requests/{acme_id}/approve", headers=globex_appr).status_code == 404
+    assert client.patch(f"/requests/{acme_id}/approve", headers=acme_appr).status_code == 200
+
+    assert client.get("/requests/stats", headers=acme_appr).json()["counts"] == {"PENDING": 1, "APPROVED": 1}
+    assert client.get("/requests/stats", headers=globex_appr).json()["counts"] == {"PENDING": 1}
+
+    globex_admin = login("tn-admin@example.com", tenant="globex")
+    assert client.get("/grants", headers=globex_admin, params={"resource": "tn-db"}).json() == []
+    assert client.get(f"/archive/requests/{acme_id}", headers=globex_admin).status_code == 404
+
+
+def test_routing_groups_are_per_tenant(register, login) -> None:
+    register("tn-admin@example.com", "ADMIN", tenant="acme")
+    register("tn-admin@example.com", "ADMIN", tenant="globex")
+    acme_admin, globex_admin = login("tn-admin@example.com", tenant="acme"), login("tn-admin@example.com", tenant="globex")
+    globex_approver = register("tn-appr@example.com", "APPROVER", tenant="globex", headers=globex_admin)
+
+    r = client.post("/routing/groups", headers=acme_admin, json={"name": "payments"})
+    assert r.status_code == 201, r.text
+    acme_group = r.json()["id"]
+    assert client.post("/routing/groups", headers=globex_admin, json={"name": "payments"}).status_code == 201
+
+    # Neither the group nor the user is visible across the tenant boundary.
+    assert client.put(f"/routing/groups/{acme_group}/members/{globex_approver}", headers=globex_admin).status_code == 404
+    assert client.put(f"/routing/groups/{acme_group}/members/{globex_approver}", headers=acme_admin).status_code == 404
+
+    r = client.post("/routing/rules", headers=acme_admin, json={"resource_prefix": "payments-", "group_id": acme_group})
+    assert r.status_code == 201, r.text
+    assert client.get("/routing/rules", headers=globex_admin).json() == []
+
+
+def test_routed_tenant_lives_in_its_own_database(register, login, tmp_path, monkeypatch) -> None:
+    url = f"sqlite:///{tmp_path / 'big.db'}"
+    own = create_engine(url)
+    Base.metadata.create_all(bind=own)
+    monkeypatch.setenv("TENANT_DATABASES", f'{{"big": "{url}"}}')
+
+    register("tn-big@example.com", "REQUESTER", tenant="big")
+    request_id = _create(login("tn-big@example.com", tenant="big"), "tn-db")
+
+    with own.connect() as conn:
+        assert conn.execute(select(AccessRequest.id)).scalars().all() == [uuid.UUID(request_id)]
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count()).select_from(AccessRequest)) == 0
+    own.dispose()
+
+
+def test_maintenance_commands_cover_routed_databases(register, login, tmp_path, monkeypatch, capsys) -> None:
+    url = f"sqlite:///{tmp_path / 'ops.db'}"
+    own = create_engine(url)
+    Base.metadata.create_all(bind=own)
+    monkeypatch.setenv("TENANT_DATABASES", f'{{"ops": "{url}"}}')
+
+    register("tn-ops-admin@example.com", "ADMIN", tenant="ops")
+    admin = login("tn-ops-admin@example.com", tenant="ops")
+    register("tn-ops@example.com", "REQUESTER", tenant="ops", headers=admin)
+    requester = login("tn-ops@example.com", tenant="ops")
+    soon = (utcnow() + timedelta(hours=1)).isoformat()
+    r = client.post("/requests", headers=requester, json={"resource": "tn-ops-db", "action": "READ", "expires_at": soon})
+    assert r.status_code == 201, r.text
+    expiring = r.json()["id"]
+    approved = _create(requester, "tn-ops-api")
+    assert client.patch(f"/requests/{approved}/approve", headers=admin).status_code == 200
+    campaign = client.post("/reviews/campaigns", headers=admin, json={"name": "ops"}).json()["id"]
+    with own.begin() as conn:
+        conn.execute(
+            text("UPDATE access_requests SET expires_at = :past WHERE id = :id"),
+            {"past": utcnow() - timedelta(minutes=1), "id": expiring.replace("-", "")},
+        )
+
+    assert main(["expiry", "run", "--once"]) == 0
+    assert main(["audit", "seal"]) == 0
+    assert main(["reviews", "generate"]) == 0
+    out = capsys.readouterr().out
+    assert "[shared] expired or cancelled 0 requests" in out
+    assert "[ops] expired or cancelled 1 requests" in out
+    assert f"[ops] review campaign {campaign}: added 1 items" in out
+
+    with own.connect() as conn:
+        status = conn.execute(select(AccessRequest.status).where(AccessRequest.id == uuid.UUID(expiring))).scalar()
+        assert status.value == "CANCELLED"
+        assert conn.execute(select(func.count()).select_from(AuditEvent).where(AuditEvent.seq.is_(None))).scalar() == 0
+        assert conn.execute(select(ReviewItem.request_id)).scalars().all() == [uuid.UUID(approved)]
+    own.dispose()